@@ -1,5 +1,10 @@
 from PIL import Image
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from smartcent_icons.ico import verify_ico, write_ico
+from smartcent_icons.pyramid import ResolutionPyramid
 
 def convert_png_to_ico(png_path, ico_path):
     """Convert PNG to ICO format with multiple sizes"""
@@ -18,15 +23,17 @@ def convert_png_to_ico(png_path, ico_path):
         # Common Windows icon sizes
         sizes = [(16, 16), (32, 32), (48, 48), (64, 64), (128, 128), (256, 256)]
         
-        # Create resized versions
+        # Create resized versions, each from the nearest pyramid level
+        pyramid = ResolutionPyramid(img)
         resized_images = []
         for size in sizes:
-            resized = img.resize(size, Image.Resampling.LANCZOS)
+            resized = pyramid.resize(size)
             resized_images.append(resized)
             print(f"✅ Created {size[0]}x{size[1]} version")
         
-        # Save as ICO with multiple sizes
-        img.save(ico_path, format='ICO', sizes=sizes)
+        # Write exactly these frames into the ICO and check them on read-back
+        write_ico(ico_path, resized_images)
+        verify_ico(ico_path, sizes)
         print(f"🎉 Successfully created {ico_path}")
         
         # Show file size
@@ -1,7 +1,11 @@
 from PIL import Image
 import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from smartcent_icons.sink import backup_file, save_atomic
+
 print("🎯 Direct replacement of final_smartcent_icon.png")
 
 # Show current files
@@ -22,10 +26,10 @@ print("3. I'll immediately replace final_smartcent_icon.png with your choice")
 if os.path.exists('my_new_icon.png'):
     print("\n✅ Found my_new_icon.png! Processing...")
     try:
-        # Backup current icon
+        # Backup current icon; it stays in place until replaced below
         if os.path.exists('final_smartcent_icon.png'):
             backup_name = f"backup_final_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            os.rename('final_smartcent_icon.png', backup_name)
+            backup_file('final_smartcent_icon.png', backup_name)
             print(f"📦 Backed up old icon as: {backup_name}")
         
         # Replace with new icon
@@ -34,7 +38,7 @@ if os.path.exists('my_new_icon.png'):
             new_icon = new_icon.convert('RGBA')
         
         # Save as final_smartcent_icon.png
-        new_icon.save('final_smartcent_icon.png', format='PNG', optimize=True)
+        save_atomic(new_icon, 'final_smartcent_icon.png', 'PNG', optimize=True)
         print("🎉 SUCCESS! Replaced final_smartcent_icon.png with your teal icon!")
         
         new_size = os.path.getsize('final_smartcent_icon.png')
@@ -43,12 +47,18 @@ if os.path.exists('my_new_icon.png'):
     except Exception as e:
         print(f"❌ Error processing: {e}")
         
-elif input("Type filename to use (or press Enter to skip): ").strip():
-    filename = input("Type filename to use (or press Enter to skip): ").strip()
-    if os.path.exists(filename):
+else:
+    # Take the file from the command line; only prompt when run interactively
+    if len(sys.argv) > 1:
+        filename = sys.argv[1]
+    elif sys.stdin.isatty():
+        filename = input("Type filename to use (or press Enter to skip): ").strip()
+    else:
+        filename = ''
+    if filename and os.path.exists(filename):
         print(f"Using {filename} as new icon...")
         # Process the specified file
-    else:
+    elif filename:
         print(f"File {filename} not found")
         
 print("\n💡 Once you save your teal icon, run this script again!") 
\ No newline at end of file
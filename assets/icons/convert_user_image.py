@@ -4,107 +4,85 @@ Convert User's Custom Icon Image to App Icon Formats
 Takes the user's provided image and creates all necessary icon sizes
 """
 
-from PIL import Image
 import os
+import sys
 
-def convert_user_icon_to_formats(input_image_path):
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from smartcent_icons.cache import BuildCache, fingerprint, hash_file, make_key
+from smartcent_icons.export import job_key
+from smartcent_icons.manifest import execute, load_targets, plan
+from smartcent_icons.optimize import optimizer_from_env
+from smartcent_icons.pixelcache import DecodedCache
+from smartcent_icons.pyramid import ResolutionPyramid
+from smartcent_icons.sink import save_atomic
+from smartcent_icons.source import StreamingSource, load_square
+
+def convert_user_icon_to_formats(input_image_path, workers=None):
     """Convert user's icon to all required formats"""
     print(f"🖼️ Converting your custom icon: {input_image_path}")
     
     try:
-        # Open the user's image
-        original = Image.open(input_image_path)
-        print(f"📏 Original size: {original.size}")
+        # Every size and the ICO come from the shared icon target spec
+        planned = plan(load_targets('fanout', main='user_icon', android='android', ios='ios', web='web', stem='user_custom_icon'))
+        
+        master_path = "user_custom_icon_master.png"
+        
+        # Recompress each new PNG with the smallest lossless encoding only
+        # when asked for (SMARTCENT_OPTIMIZE=1): the sweep outweighs the
+        # whole fan-out
+        optimizer = optimizer_from_env(workers)
+        
+        # Outputs only change when the source image, this code or the
+        # optimizer settings change
+        cache = BuildCache()
+        base_key = make_key(hash_file(input_image_path), fingerprint(convert_user_icon_to_formats))
+        master_key = make_key(base_key, 'master', 'PNG', optimize=True)
+        target_key = make_key(base_key, optimizer.key()) if optimizer is not None else base_key
+        outputs = [(master_path, master_key)]
+        outputs += [(target.path, job_key(target_key, output.job)) for output in planned for target in output.targets]
+        if cache.all_fresh(outputs):
+            print(f"⏭️ All {len(outputs)} icon files are up to date")
+            return True
         
-        # Convert to RGBA if needed
-        if original.mode != 'RGBA':
-            original = original.convert('RGBA')
+        # Decode the image no larger than the pyramid needs for the biggest
+        # target (twice its size)
+        source = StreamingSource(input_image_path)
+        print(f"📏 Original size: {source.size}")
+        max_size = 2 * max(output.job.size for output in planned)
         
-        # Make it square if it isn't
-        width, height = original.size
+        # Make it square if it isn't, centering it on a transparent canvas
+        # (mapped from the pixel cache when this source was loaded before)
+        original = load_square(input_image_path, max_size, fit='pad', cache=DecodedCache())
+        width, height = source.size
         if width != height:
-            # Create square canvas
-            size = max(width, height)
-            square = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-            
-            # Center the image
-            x = (size - width) // 2
-            y = (size - height) // 2
-            square.paste(original, (x, y))
-            original = square
             print(f"✅ Made square: {original.size}")
         
         # Save high-quality master
-        original.save("user_custom_icon_master.png", format='PNG', optimize=True)
-        print(f"💎 Master icon saved: user_custom_icon_master.png")
-        
-        # Create all required sizes
-        sizes = {
-            # Main app icons
-            'user_icon_1024': 1024,
-            'user_icon_512': 512,
-            'user_icon_256': 256,
-            'user_icon_128': 128,
-            'user_icon_64': 64,
-            
-            # Android sizes
-            'android_mdpi': 48,
-            'android_hdpi': 72,
-            'android_xhdpi': 96,
-            'android_xxhdpi': 144,
-            'android_xxxhdpi': 192,
-            
-            # iOS sizes
-            'ios_20': 20,
-            'ios_29': 29,
-            'ios_40': 40,
-            'ios_58': 58,
-            'ios_60': 60,
-            'ios_76': 76,
-            'ios_80': 80,
-            'ios_87': 87,
-            'ios_120': 120,
-            'ios_152': 152,
-            'ios_167': 167,
-            'ios_180': 180,
-            'ios_1024': 1024,
-            
-            # Web/PWA
-            'web_16': 16,
-            'web_32': 32,
-            'web_192': 192,
-            'web_512': 512,
-        }
+        if not cache.is_fresh(master_path, master_key):
+            save_atomic(original, master_path, optimize=True)
+            cache.record(master_path, master_key)
+        print(f"💎 Master icon saved: {master_path}")
         
         created_count = 0
         
-        for name, size in sizes.items():
-            try:
-                # High-quality resize
-                resized = original.resize((size, size), Image.Resampling.LANCZOS)
-                filename = f"{name}.png"
-                resized.save(filename, format='PNG', optimize=True)
-                print(f"✅ Created {filename} ({size}x{size})")
-                created_count += 1
-            except Exception as e:
-                print(f"❌ Failed to create {name}: {e}")
+        # Downsample through a pyramid so each size filters a small level
+        pyramid = ResolutionPyramid(original)
         
-        # Create ICO file for Windows
-        try:
-            ico_sizes = [16, 32, 48, 64, 128, 256]
-            ico_images = []
-            for ico_size in ico_sizes:
-                ico_img = original.resize((ico_size, ico_size), Image.Resampling.LANCZOS)
-                ico_images.append(ico_img)
-            
-            # Save ICO file
-            ico_images[0].save("user_custom_icon.ico", format='ICO', 
-                             sizes=[(img.size[0], img.size[1]) for img in ico_images])
-            print(f"🪟 Created user_custom_icon.ico")
-            created_count += 1
-        except Exception as e:
-            print(f"❌ Failed to create ICO: {e}")
+        # Resize and encode each distinct size once, in parallel, then copy duplicates
+        results = execute(planned, source=pyramid, workers=workers, cache=cache,
+                          base_key=base_key, optimizer=optimizer)
+        for result in results:
+            if result.cached:
+                print(f"⏭️ Up to date {result.filename} ({result.size}x{result.size})")
+            elif result.ok:
+                print(f"✅ Created {result.filename} ({result.size}x{result.size})")
+                created_count += 1
+            else:
+                print(f"❌ Failed to create {result.filename}: {result.error}")
         
+        if optimizer is not None:
+            optimizer.report()
+        cache.save()
         print(f"\n🎉 Successfully created {created_count} icon files!")
         print(f"📁 All files saved in: {os.getcwd()}")
         
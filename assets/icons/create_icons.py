@@ -6,8 +6,10 @@ Generates all required icon sizes for Android and iOS from the master SVG icon.
 Usage: python create_icons.py
 
 Requirements:
-- Inkscape (for SVG to PNG conversion)
 - PIL/Pillow (for image processing)
+- Optional: CairoSVG or Inkscape for SVG to PNG conversion; the built-in
+  Pillow renderer is used when neither is available. Pick one explicitly
+  with SMARTCENT_RASTERIZER=cairosvg|pillow|inkscape
 
 Install requirements:
 pip install Pillow
@@ -16,12 +18,22 @@ pip install Pillow
 import os
 import subprocess
 import sys
-from PIL import Image, ImageDraw, ImageFilter
+
+from PIL import Image
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from smartcent_icons.adaptive import DENSITIES, adaptive_outputs, write_adaptive_icon
+from smartcent_icons.cache import BuildCache, fingerprint, hash_file, make_key
+from smartcent_icons.inkscape import inkscape_command
+from smartcent_icons.manifest import execute, load_targets, plan, plan_summary
+from smartcent_icons.optimize import PngOptimizer
+from smartcent_icons.pyramid import ResolutionPyramid
+from smartcent_icons.rasterize import get_rasterizer
 
 def check_inkscape():
     """Check if Inkscape is available in PATH"""
     try:
-        subprocess.run(['inkscape', '--version'], capture_output=True, check=True)
+        subprocess.run([inkscape_command(), '--version'], capture_output=True, check=True)
         return True
     except (subprocess.CalledProcessError, FileNotFoundError):
         print("❌ Inkscape not found. Please install Inkscape for SVG conversion.")
@@ -45,130 +57,29 @@ def create_directories():
         os.makedirs(directory, exist_ok=True)
         print(f"✅ Created directory: {directory}")
 
-def convert_svg_to_png(svg_path, output_path, size):
-    """Convert SVG to PNG using Inkscape"""
-    try:
-        cmd = [
-            'inkscape',
-            '--export-type=png',
-            f'--export-filename={output_path}',
-            f'--export-width={size}',
-            f'--export-height={size}',
-            svg_path
-        ]
-        subprocess.run(cmd, check=True, capture_output=True)
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error converting {svg_path} to {output_path}: {e}")
-        return False
-
-def create_android_icons():
-    """Create Android app icons in various densities"""
-    print("\n🤖 Creating Android Icons...")
-    
-    android_sizes = {
-        'mipmap-mdpi': 48,
-        'mipmap-hdpi': 72,
-        'mipmap-xhdpi': 96,
-        'mipmap-xxhdpi': 144,
-        'mipmap-xxxhdpi': 192
-    }
-    
-    svg_path = 'assets/icons/app_icon.svg'
-    
-    for density, size in android_sizes.items():
-        output_path = f'android/app/src/main/res/{density}/ic_launcher.png'
-        if convert_svg_to_png(svg_path, output_path, size):
-            print(f"✅ Created {density}/ic_launcher.png ({size}x{size})")
-        
-        # Also create round icon
-        round_output_path = f'android/app/src/main/res/{density}/ic_launcher_round.png'
-        if convert_svg_to_png(svg_path, round_output_path, size):
-            print(f"✅ Created {density}/ic_launcher_round.png ({size}x{size})")
-
-def create_ios_icons():
-    """Create iOS app icons in various sizes"""
-    print("\n🍎 Creating iOS Icons...")
-    
-    ios_sizes = [
-        20, 29, 40, 58, 60, 76, 80, 87, 114, 120, 152, 167, 180, 1024
-    ]
-    
-    svg_path = 'assets/icons/app_icon.svg'
-    
-    for size in ios_sizes:
-        output_path = f'ios/Runner/Assets.xcassets/AppIcon.appiconset/Icon-App-{size}x{size}@1x.png'
-        if convert_svg_to_png(svg_path, output_path, size):
-            print(f"✅ Created iOS icon {size}x{size}")
-
-def create_web_icons():
-    """Create web app icons"""
-    print("\n🌐 Creating Web Icons...")
-    
-    web_sizes = [16, 32, 48, 72, 96, 144, 192, 512]
-    svg_path = 'assets/icons/app_icon.svg'
-    
-    for size in web_sizes:
-        output_path = f'web/icons/Icon-{size}.png'
-        if convert_svg_to_png(svg_path, output_path, size):
-            print(f"✅ Created web icon {size}x{size}")
-    
-    # Create favicon
-    favicon_path = 'web/favicon.png'
-    if convert_svg_to_png(svg_path, favicon_path, 32):
-        print(f"✅ Created favicon.png")
-
-def create_flutter_assets():
-    """Create Flutter asset icons"""
-    print("\n📱 Creating Flutter Assets...")
-    
-    flutter_sizes = [36, 48, 72, 96, 144, 192, 256, 512]
-    svg_path = 'assets/icons/app_icon.svg'
-    
-    for size in flutter_sizes:
-        output_path = f'assets/icons/generated/app_icon_{size}.png'
-        if convert_svg_to_png(svg_path, output_path, size):
-            print(f"✅ Created Flutter asset {size}x{size}")
-
-def create_adaptive_icon():
-    """Create Android adaptive icon components"""
+def create_adaptive_icon(results, base_key, cache):
+    """Create Android adaptive icon layers for every density"""
     print("\n🎨 Creating Android Adaptive Icons...")
     
-    # Create foreground (main icon)
-    svg_path = 'assets/icons/app_icon.svg'
-    foreground_path = 'android/app/src/main/res/mipmap-xxxhdpi/ic_launcher_foreground.png'
-    
-    if convert_svg_to_png(svg_path, foreground_path, 432):  # 432 for xxxhdpi adaptive
-        print("✅ Created adaptive icon foreground")
-    
-    # Create simple background
-    background_path = 'android/app/src/main/res/mipmap-xxxhdpi/ic_launcher_background.png'
-    create_adaptive_background(background_path, 432)
-
-def create_adaptive_background(output_path, size):
-    """Create a simple gradient background for adaptive icon"""
-    try:
-        # Create image with gradient background
-        img = Image.new('RGB', (size, size), color='#1e3c72')
-        draw = ImageDraw.Draw(img)
-        
-        # Create a subtle radial gradient effect
-        center = size // 2
-        for i in range(center):
-            alpha = 1 - (i / center) * 0.3
-            color = (
-                int(30 + i * 0.1),   # R
-                int(60 + i * 0.15),  # G  
-                int(114 + i * 0.2)   # B
-            )
-            draw.ellipse([center-i, center-i, center+i, center+i], fill=color)
-        
-        img.save(output_path, 'PNG')
-        print("✅ Created adaptive icon background")
-        return True
-    except Exception as e:
-        print(f"❌ Error creating background: {e}")
-        return False
+    # The artwork comes from the largest PNG the batch just exported, inset
+    # into the safe zone, so no second rasterizer process is started; every
+    # density's foreground, background and monochrome layer is cut from it
+    res_dir = 'android/app/src/main/res'
+    key = make_key(base_key, 'adaptive')
+    outputs = adaptive_outputs(res_dir)
+    if cache.all_fresh((path, key) for path in outputs):
+        print("⏭️ Adaptive icon layers are up to date")
+        return
+    exported = [result for result in results if result.ok and result.filename.endswith('.png')]
+    if not exported:
+        print("❌ No exported icon to build the adaptive layers from")
+        return
+    largest = max(exported, key=lambda result: result.size)
+    with Image.open(largest.filename) as image:
+        pyramid = ResolutionPyramid(image.convert('RGBA'))
+    for path in write_adaptive_icon(pyramid.resize, res_dir):
+        cache.record(path, key)
+    print(f"✅ Created adaptive icon layers for {len(DENSITIES)} densities and mipmap-anydpi-v26 XML")
 
 def create_ios_contents_json():
     """Create Contents.json for iOS AppIcon.appiconset"""
@@ -235,13 +146,6 @@ def main():
     print("🎨 SmartCent Icon Generator")
     print("=" * 50)
     
-    # Check if Inkscape is available
-    if not check_inkscape():
-        print("\n💡 Alternative: You can manually convert the SVG using online tools:")
-        print("   - https://convertio.co/svg-png/")
-        print("   - https://cloudconvert.com/svg-to-png")
-        return
-    
     # Check if SVG exists
     if not os.path.exists('assets/icons/app_icon.svg'):
         print("❌ SVG icon not found at assets/icons/app_icon.svg")
@@ -251,11 +155,34 @@ def main():
     create_directories()
     
     print("\n🚀 Generating icons...")
-    create_android_icons()
-    create_ios_icons()
-    create_web_icons()
-    create_flutter_assets()
-    create_adaptive_icon()
+    try:
+        batch = get_rasterizer('assets/icons/app_icon.svg')
+    except (ValueError, RuntimeError) as e:
+        print(f"❌ {e}")
+        if os.environ.get('SMARTCENT_RASTERIZER') == 'inkscape':
+            check_inkscape()
+        return
+    
+    # Every Android, iOS, web and Flutter target comes from the target spec;
+    # identical sizes are rasterized once and copied
+    planned = plan(load_targets('platforms'))
+    target_count, render_count = plan_summary(planned)
+    print(f"\n🖨️ Exporting {target_count} icons from {render_count} renders with the {batch.name} backend...")
+    
+    base_key = make_key(hash_file('assets/icons/app_icon.svg'), batch.name, fingerprint())
+    optimizer = PngOptimizer()
+    with BuildCache() as cache:
+        results = execute(planned, rasterizer=batch, cache=cache, base_key=base_key, optimizer=optimizer)
+        for result in results:
+            if result.cached:
+                print(f"⏭️ Up to date {result.filename}")
+            elif result.ok:
+                print(f"✅ Created {result.filename} ({result.size}x{result.size})")
+            else:
+                print(f"❌ Error converting {result.filename}: {result.error}")
+        optimizer.report()
+        
+        create_adaptive_icon(results, base_key, cache)
     
     print("\n📝 Creating configuration files...")
     create_ios_contents_json()
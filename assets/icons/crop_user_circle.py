@@ -1,44 +1,48 @@
-from PIL import Image, ImageDraw
+from PIL import Image
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from smartcent_icons.cache import BuildCache, fingerprint, hash_file, make_key
+from smartcent_icons.masks import crop_to_shape
+from smartcent_icons.pyramid import ResolutionPyramid
+from smartcent_icons.sink import OutputSink
 
 print("🔵 Cropping your uploaded image to a perfect circle...")
 
 try:
+    # Skip everything when the source image and this script are unchanged
+    sizes = [64, 128, 256, 512, 1024]
+    cache = BuildCache()
+    base_key = make_key(hash_file('../custom_icon.png.jpg'), fingerprint(sys.modules[__name__]))
+    outputs = [('user_perfect_circle.png', make_key(base_key, 'master'))]
+    outputs += [(f'user_circle_{s}.png', make_key(base_key, s)) for s in sizes]
+    if cache.all_fresh(outputs):
+        print("⏭️ Circle icons are up to date")
+        sys.exit(0)
+
     # Open your uploaded image
     img = Image.open('../custom_icon.png.jpg')
     print(f"📏 Original size: {img.size}")
 
-    # Convert to RGBA if needed
-    if img.mode != 'RGBA':
-        img = img.convert('RGBA')
-
-    # Make it square by cropping from center
-    width, height = img.size
-    size = min(width, height)
-    left = (width - size) // 2
-    top = (height - size) // 2
-    square = img.crop((left, top, left + size, top + size))
-
-    # Create circular mask
-    mask = Image.new('L', (size, size), 0)
-    draw = ImageDraw.Draw(mask)
-    draw.ellipse((0, 0, size, size), fill=255)
-
-    # Apply mask to create perfect circle
-    result = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    result.paste(square, (0, 0))
-    result.putalpha(mask)
-
-    # Save the main circle icon
-    result.save('user_perfect_circle.png', format='PNG', optimize=True)
-    print(f"✅ Perfect circle icon created: user_perfect_circle.png")
+    # Crop to the center square and cut it to an antialiased circle
+    result = crop_to_shape(img, 'circle')
 
-    # Create app icon sizes
-    sizes = [64, 128, 256, 512, 1024]
+    # Save the main circle icon and every size as one batch: a crash leaves
+    # the previous files intact instead of a truncated icon
+    pyramid = ResolutionPyramid(result)
+    with OutputSink() as sink:
+        sink.save(result, 'user_perfect_circle.png', optimize=True)
+        for s in sizes:
+            sink.save(pyramid.resize(s), f'user_circle_{s}.png')
+    print(f"✅ Perfect circle icon created: user_perfect_circle.png")
     for s in sizes:
-        resized = result.resize((s, s), Image.Resampling.LANCZOS)
-        resized.save(f'user_circle_{s}.png')
         print(f"✅ Created {s}x{s} version")
 
+    # Record the outputs only once the whole batch is in place
+    for path, key in outputs:
+        cache.record(path, key)
+    cache.save()
     print("🎉 Your perfect circle icon is ready!")
     print("📁 Main icon: user_perfect_circle.png")
 
@@ -1,90 +1,82 @@
-from PIL import Image, ImageDraw
-import numpy as np
+from PIL import Image
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from smartcent_icons.autocrop import autocrop_box
+from smartcent_icons.cache import BuildCache, fingerprint, make_key
+from smartcent_icons.masks import apply_mask
+from smartcent_icons.pixelcache import DecodedCache
+from smartcent_icons.pyramid import ResolutionPyramid
+from smartcent_icons.sink import OutputSink
+from smartcent_icons.source import load_square
 
 print("🎯 Smart cropping - removing black space and creating perfect circle...")
 
 try:
-    # Open your uploaded image
-    img = Image.open('../custom_icon.png.jpg')
-    print(f"📏 Original size: {img.size}")
+    # Skip everything when the source image and this script are unchanged;
+    # the pixel cache remembers the upload's hash until it is modified
+    sizes = [64, 128, 256, 512, 1024]
+    cache = BuildCache()
+    pixels = DecodedCache()
+    source_hash = pixels.source_hash('../custom_icon.png.jpg')
+    base_key = make_key(source_hash, fingerprint(sys.modules[__name__]))
+    outputs = [('clean_circle_icon.png', make_key(base_key, 'master'))]
+    outputs += [(f'clean_circle_{s}.png', make_key(base_key, s)) for s in sizes]
+    if cache.all_fresh(outputs):
+        print("⏭️ Circle icons are up to date")
+        sys.exit(0)
 
-    # Convert to RGBA if needed
-    if img.mode != 'RGBA':
-        img = img.convert('RGBA')
-    
-    # Convert to numpy array for easier processing
-    img_array = np.array(img)
-    
-    # Find non-black pixels (allowing for some tolerance)
-    # Black pixels are close to (0,0,0) in RGB
+    def autocropped_square():
+        # Open your uploaded image
+        img = Image.open('../custom_icon.png.jpg')
+        print(f"📏 Original size: {img.size}")
+
+        # Find the bounding box of non-black content: pixels within the
+        # tolerance of black count as empty space
+        box = autocrop_box(img, padding=padding, background=(0, 0, 0), tolerance=tolerance)
+
+        if box is not None:
+            left, top, right, bottom = box
+            print(f"📦 Found content area with {padding}px padding: {left},{top} to {right},{bottom}")
+            print(f"✂️ Cropped to content: {right - left}x{bottom - top}")
+
+        else:
+            print("⚠️ No non-black content found, using original image")
+
+        # Now make it square by expanding the smaller dimension: decode only
+        # the content box, no larger than the pyramid needs for 1024px
+        # (twice its size), and center it on a transparent canvas
+        return load_square('../custom_icon.png.jpg', 2 * max(sizes), fit='pad', box=box)
+
+    # Later runs map the decoded, autocropped square from the pixel cache
+    # instead of decoding and scanning the upload again
     tolerance = 30  # Adjust if needed
-    non_black_mask = (
-        (img_array[:,:,0] > tolerance) | 
-        (img_array[:,:,1] > tolerance) | 
-        (img_array[:,:,2] > tolerance)
-    )
-    
-    # Find the bounding box of non-black content
-    rows = np.any(non_black_mask, axis=1)
-    cols = np.any(non_black_mask, axis=0)
-    
-    if np.any(rows) and np.any(cols):
-        # Get the bounding box coordinates
-        top, bottom = np.where(rows)[0][[0, -1]]
-        left, right = np.where(cols)[0][[0, -1]]
-        
-        print(f"📦 Found content area: {left},{top} to {right},{bottom}")
-        
-        # Add small padding around the content
-        padding = 10
-        left = max(0, left - padding)
-        top = max(0, top - padding)
-        right = min(img.size[0] - 1, right + padding)
-        bottom = min(img.size[1] - 1, bottom + padding)
-        
-        # Crop to remove black space
-        cropped = img.crop((left, top, right, bottom))
-        print(f"✂️ Cropped to content: {cropped.size}")
-        
-    else:
-        print("⚠️ No non-black content found, using original image")
-        cropped = img
-    
-    # Now make it square by expanding the smaller dimension
-    width, height = cropped.size
-    size = max(width, height)
-    
-    # Create square canvas with transparent background
-    square = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    
-    # Center the cropped image in the square
-    x_offset = (size - width) // 2
-    y_offset = (size - height) // 2
-    square.paste(cropped, (x_offset, y_offset))
+    padding = 10
+    square_key = make_key(source_hash, 'autocrop', tolerance, padding,
+                          2 * max(sizes), fingerprint(sys.modules[__name__]))
+    square = pixels.load(square_key, autocropped_square)
     
     print(f"📐 Made square: {square.size}")
     
-    # Create circular mask
-    mask = Image.new('L', (size, size), 0)
-    draw = ImageDraw.Draw(mask)
-    draw.ellipse((0, 0, size, size), fill=255)
-    
-    # Apply circular mask
-    result = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    result.paste(square, (0, 0))
-    result.putalpha(mask)
+    # Cut the square to an antialiased circle in place
+    result = apply_mask(square, 'circle')
     
-    # Save the clean circle icon
-    result.save('clean_circle_icon.png', format='PNG', optimize=True)
+    # Save the clean circle icon and every size as one batch: a crash leaves
+    # the previous files intact instead of a truncated icon
+    pyramid = ResolutionPyramid(result)
+    with OutputSink() as sink:
+        sink.save(result, 'clean_circle_icon.png', optimize=True)
+        for s in sizes:
+            sink.save(pyramid.resize(s), f'clean_circle_{s}.png')
     print(f"✅ Clean circle icon created: clean_circle_icon.png")
-    
-    # Create different sizes
-    sizes = [64, 128, 256, 512, 1024]
     for s in sizes:
-        resized = result.resize((s, s), Image.Resampling.LANCZOS)
-        resized.save(f'clean_circle_{s}.png')
         print(f"✅ Created clean {s}x{s} version")
-    
+
+    # Record the outputs only once the whole batch is in place
+    for path, key in outputs:
+        cache.record(path, key)
+    cache.save()
     print("🎉 Your clean circle icon (no black space) is ready!")
     print("📁 Main icon: clean_circle_icon.png")
 
@@ -1,5 +1,10 @@
 from PIL import Image
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from smartcent_icons.pyramid import ResolutionPyramid
+from smartcent_icons.sink import OutputSink, backup_file
 from datetime import datetime
 
 print("🎯 Processing your teal icon: my_new_icon.png.png")
@@ -18,10 +23,11 @@ try:
         print(f"📐 Image size: {new_icon.width}x{new_icon.height}")
         print(f"🎨 Image mode: {new_icon.mode}")
         
-        # Backup current final_smartcent_icon.png if it exists
+        # Backup current final_smartcent_icon.png if it exists; it stays in
+        # place until the new one atomically replaces it
         if os.path.exists('final_smartcent_icon.png'):
             backup_name = f"backup_final_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-            os.rename('final_smartcent_icon.png', backup_name)
+            backup_file('final_smartcent_icon.png', backup_name)
             print(f"📦 Backed up old icon as: {backup_name}")
         
         # Convert to RGBA if needed
@@ -29,21 +35,23 @@ try:
             new_icon = new_icon.convert('RGBA')
             print("🔄 Converted to RGBA format")
         
-        # Save as final_smartcent_icon.png
-        new_icon.save('final_smartcent_icon.png', format='PNG', optimize=True)
+        # Save final_smartcent_icon.png and multiple sizes for the app as
+        # one batch
+        sizes = [64, 128, 192, 256, 512, 1024]
+        pyramid = ResolutionPyramid(new_icon)
+        
+        with OutputSink() as sink:
+            sink.save(new_icon, 'final_smartcent_icon.png', optimize=True)
+            for size in sizes:
+                sink.save(pyramid.resize(size), f'final_smartcent_{size}.png')
         print("🎉 SUCCESS! Created new final_smartcent_icon.png")
         
         # Show new file info
         new_size = os.path.getsize('final_smartcent_icon.png')
         print(f"📊 New final_smartcent_icon.png size: {new_size:,} bytes")
         
-        # Create multiple sizes for the app
-        sizes = [64, 128, 192, 256, 512, 1024]
-        print("\n📱 Creating app icon sizes...")
-        
+        print("\n📱 Created app icon sizes...")
         for size in sizes:
-            resized = new_icon.resize((size, size), Image.Resampling.LANCZOS)
-            resized.save(f'final_smartcent_{size}.png')
             print(f"✅ Created {size}x{size} version")
         
         print("\n🎉 COMPLETE! Your teal icon is now the app icon!")
@@ -1,14 +1,18 @@
 from PIL import Image
 import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from smartcent_icons.sink import backup_file
+
 print("🎯 Replacing final_smartcent_icon.png with your new teal icon...")
 
 try:
-    # Save the current icon as backup first
+    # Save the current icon as backup first; the icon itself stays in place
     if os.path.exists('final_smartcent_icon.png'):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        os.rename('final_smartcent_icon.png', f'backup_final_smartcent_icon_{timestamp}.png')
+        backup_file('final_smartcent_icon.png', f'backup_final_smartcent_icon_{timestamp}.png')
         print(f"📦 Backed up old icon as: backup_final_smartcent_icon_{timestamp}.png")
     
     # Since you uploaded a new image, I'll create a new final_smartcent_icon.png
@@ -1,5 +1,12 @@
 from PIL import Image
+import io
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from smartcent_icons.optimize import PngOptimizer
+from smartcent_icons.pyramid import ResolutionPyramid
+from smartcent_icons.sink import OutputSink
 
 print("🎯 Updating final_smartcent_icon.png with your new uploaded icon...")
 
@@ -18,17 +25,27 @@ try:
         if new_icon.mode != 'RGBA':
             new_icon = new_icon.convert('RGBA')
         
-        # Replace the final_smartcent_icon.png with your new design
-        new_icon.save('final_smartcent_icon.png', format='PNG', optimize=True)
-        print("✅ Replaced final_smartcent_icon.png with your new design!")
-        
-        # Create all required sizes for the app
+        # Replace final_smartcent_icon.png and all required sizes as one
+        # batch: an interrupted run leaves the old files intact. Each file
+        # is recompressed in memory with the smallest lossless encoding
+        # first, so files whose bytes come out the same are not rewritten
         sizes = [64, 128, 192, 256, 512, 1024]
+        pyramid = ResolutionPyramid(new_icon)
+        optimizer = PngOptimizer()
+        outputs = [(new_icon, 'final_smartcent_icon.png')]
+        outputs += [(pyramid.resize(size), f'final_smartcent_{size}.png') for size in sizes]
         
+        with OutputSink() as sink:
+            for image, path in outputs:
+                encoded = io.BytesIO()
+                image.save(encoded, 'PNG')
+                data, result = optimizer.optimize_data(path, encoded.getvalue())
+                optimizer.results.append(result)
+                sink.write(path, data)
+        print("✅ Replaced final_smartcent_icon.png with your new design!")
         for size in sizes:
-            resized = new_icon.resize((size, size), Image.Resampling.LANCZOS)
-            resized.save(f'final_smartcent_{size}.png')
             print(f"✅ Created {size}x{size} version")
+        optimizer.report()
         
         print("🎉 Successfully updated with your beautiful new icon!")
         print("📁 Main file: final_smartcent_icon.png")
@@ -1,5 +1,10 @@
 from PIL import Image
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from smartcent_icons.pyramid import ResolutionPyramid
+from smartcent_icons.sink import OutputSink
 
 print("🎯 Using YOUR exact uploaded image...")
 
@@ -12,15 +17,16 @@ try:
     if your_image.mode != 'RGBA':
         your_image = your_image.convert('RGBA')
     
-    # Save your exact image as the app icon
-    your_image.save('your_exact_smartcent_icon.png', format='PNG', optimize=True)
-    print(f"✅ Saved your exact image as: your_exact_smartcent_icon.png")
-    
-    # Create required sizes from YOUR exact image
+    # Save your exact image as the app icon, with the required sizes from
+    # it, as one batch: a crash leaves the previous files intact
     sizes = [64, 128, 256, 512, 1024]
+    pyramid = ResolutionPyramid(your_image)
+    with OutputSink() as sink:
+        sink.save(your_image, 'your_exact_smartcent_icon.png', optimize=True)
+        for size in sizes:
+            sink.save(pyramid.resize(size), f'your_exact_{size}.png')
+    print(f"✅ Saved your exact image as: your_exact_smartcent_icon.png")
     for size in sizes:
-        resized = your_image.resize((size, size), Image.Resampling.LANCZOS)
-        resized.save(f'your_exact_{size}.png')
         print(f"✅ Created {size}x{size} from your image")
     
     print("🎉 Using YOUR exact uploaded image!")
@@ -4,123 +4,86 @@ Crop Circle Icon from User's Image
 Takes the user's uploaded image, crops to circle, and creates app icons
 """
 
-from PIL import Image, ImageDraw
 import os
 
+from smartcent_icons.cache import BuildCache, fingerprint, hash_file, make_key
+from smartcent_icons.export import job_key
+from smartcent_icons.manifest import execute, load_targets, plan
+from smartcent_icons.masks import apply_mask, crop_to_shape
+from smartcent_icons.optimize import optimizer_from_env
+from smartcent_icons.pixelcache import DecodedCache
+from smartcent_icons.pyramid import ResolutionPyramid
+from smartcent_icons.sink import save_atomic
+from smartcent_icons.source import StreamingSource, load_square
+
 def crop_to_circle(image):
     """Crop image to a perfect circle"""
-    # Make image square first
-    width, height = image.size
-    size = min(width, height)
-    
-    # Create square crop from center
-    left = (width - size) // 2
-    top = (height - size) // 2
-    right = left + size
-    bottom = top + size
-    
-    square_image = image.crop((left, top, right, bottom))
-    
-    # Create circular mask
-    mask = Image.new('L', (size, size), 0)
-    draw = ImageDraw.Draw(mask)
-    draw.ellipse((0, 0, size, size), fill=255)
-    
-    # Apply circular mask
-    result = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    result.paste(square_image, (0, 0))
-    result.putalpha(mask)
-    
-    return result
+    return crop_to_shape(image, 'circle')
 
-def create_app_icons_from_circle(input_path):
+def create_app_icons_from_circle(input_path, workers=None):
     """Create all app icon sizes from the cropped circle"""
     print(f"🎯 Processing your uploaded image: {input_path}")
     
     try:
-        # Open the user's image
-        original = Image.open(input_path)
-        print(f"📏 Original size: {original.size}")
+        # Every size and the ICO come from the shared icon target spec
+        planned = plan(load_targets('fanout', main='user_circle', android='android_circle', ios='ios_circle', web='web_circle', stem='user_circle_icon'))
         
-        # Convert to RGBA if needed
-        if original.mode != 'RGBA':
-            original = original.convert('RGBA')
+        master_path = "user_circle_icon_master.png"
         
-        # Crop to circle
-        circle_icon = crop_to_circle(original)
+        # Recompress each new PNG with the smallest lossless encoding only
+        # when asked for (SMARTCENT_OPTIMIZE=1): the sweep outweighs the
+        # whole fan-out
+        optimizer = optimizer_from_env(workers)
+        
+        # Outputs only change when the source image, this code or the
+        # optimizer settings change
+        cache = BuildCache()
+        base_key = make_key(hash_file(input_path), fingerprint(crop_to_circle))
+        master_key = make_key(base_key, 'master', 'PNG', optimize=True)
+        target_key = make_key(base_key, optimizer.key()) if optimizer is not None else base_key
+        outputs = [(master_path, master_key)]
+        outputs += [(target.path, job_key(target_key, output.job)) for output in planned for target in output.targets]
+        if cache.all_fresh(outputs):
+            print(f"⏭️ All {len(outputs)} circle icon files are up to date")
+            return True
+        
+        # Decode only the centered square, no larger than the pyramid
+        # needs for the biggest target (twice its size)
+        source = StreamingSource(input_path)
+        print(f"📏 Original size: {source.size}")
+        max_size = 2 * max(output.job.size for output in planned)
+        
+        # Crop to circle; the decoded square is mapped from the pixel
+        # cache when this source was loaded before
+        circle_icon = apply_mask(load_square(input_path, max_size, cache=DecodedCache()), 'circle')
         print(f"✂️ Cropped to circle: {circle_icon.size}")
         
         # Save the master circle icon
-        circle_icon.save("user_circle_icon_master.png", format='PNG', optimize=True)
-        print(f"💎 Master circle icon saved: user_circle_icon_master.png")
-        
-        # Create all required sizes
-        sizes = {
-            # Main app icons
-            'user_circle_1024': 1024,
-            'user_circle_512': 512,
-            'user_circle_256': 256,
-            'user_circle_128': 128,
-            'user_circle_64': 64,
-            
-            # Android sizes
-            'android_circle_mdpi': 48,
-            'android_circle_hdpi': 72,
-            'android_circle_xhdpi': 96,
-            'android_circle_xxhdpi': 144,
-            'android_circle_xxxhdpi': 192,
-            
-            # iOS sizes
-            'ios_circle_20': 20,
-            'ios_circle_29': 29,
-            'ios_circle_40': 40,
-            'ios_circle_58': 58,
-            'ios_circle_60': 60,
-            'ios_circle_76': 76,
-            'ios_circle_80': 80,
-            'ios_circle_87': 87,
-            'ios_circle_120': 120,
-            'ios_circle_152': 152,
-            'ios_circle_167': 167,
-            'ios_circle_180': 180,
-            'ios_circle_1024': 1024,
-            
-            # Web/PWA
-            'web_circle_16': 16,
-            'web_circle_32': 32,
-            'web_circle_192': 192,
-            'web_circle_512': 512,
-        }
+        if not cache.is_fresh(master_path, master_key):
+            save_atomic(circle_icon, master_path, optimize=True)
+            cache.record(master_path, master_key)
+        print(f"💎 Master circle icon saved: {master_path}")
         
         created_count = 0
         
-        for name, size in sizes.items():
-            try:
-                # High-quality resize
-                resized = circle_icon.resize((size, size), Image.Resampling.LANCZOS)
-                filename = f"{name}.png"
-                resized.save(filename, format='PNG', optimize=True)
-                print(f"✅ Created {filename} ({size}x{size})")
-                created_count += 1
-            except Exception as e:
-                print(f"❌ Failed to create {name}: {e}")
+        # Downsample through a pyramid so each size filters a small level
+        pyramid = ResolutionPyramid(circle_icon)
         
-        # Create ICO file for Windows
-        try:
-            ico_sizes = [16, 32, 48, 64, 128, 256]
-            ico_images = []
-            for ico_size in ico_sizes:
-                ico_img = circle_icon.resize((ico_size, ico_size), Image.Resampling.LANCZOS)
-                ico_images.append(ico_img)
-            
-            # Save ICO file
-            ico_images[0].save("user_circle_icon.ico", format='ICO', 
-                             sizes=[(img.size[0], img.size[1]) for img in ico_images])
-            print(f"🪟 Created user_circle_icon.ico")
-            created_count += 1
-        except Exception as e:
-            print(f"❌ Failed to create ICO: {e}")
+        # Resize and encode each distinct size once, in parallel, then copy duplicates
+        results = execute(planned, source=pyramid, workers=workers, cache=cache,
+                          base_key=base_key, optimizer=optimizer)
+        for result in results:
+            if result.cached:
+                print(f"⏭️ Up to date {result.filename} ({result.size}x{result.size})")
+            elif result.ok:
+                print(f"✅ Created {result.filename} ({result.size}x{result.size})")
+                created_count += 1
+            else:
+                print(f"❌ Failed to create {result.filename}: {result.error}")
         
+        if optimizer is not None:
+            optimizer.report()
+        cache.save()
         print(f"\n🎉 Successfully created {created_count} circle icon files!")
         print(f"📁 All files saved in: {os.getcwd()}")
         
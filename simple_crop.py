@@ -1,42 +1,44 @@
-from PIL import Image, ImageDraw
+from PIL import Image
 import os
+import sys
+
+from smartcent_icons.cache import BuildCache, fingerprint, hash_file, make_key
+from smartcent_icons.masks import crop_to_shape
+from smartcent_icons.pyramid import ResolutionPyramid
+from smartcent_icons.sink import OutputSink
 
 print("🔵 Cropping your image to circle...")
 
+# Skip everything when the source image and this script are unchanged
+sizes = [64, 128, 256, 512, 1024]
+cache = BuildCache()
+base_key = make_key(hash_file('custom_icon.png.jpg'), fingerprint(sys.modules[__name__]))
+outputs = [('your_circle_icon.png', make_key(base_key, 'master'))]
+outputs += [(f'circle_icon_{s}.png', make_key(base_key, s)) for s in sizes]
+if cache.all_fresh(outputs):
+    print("⏭️ Circle icons are up to date")
+    sys.exit(0)
+
 # Open your uploaded image
 img = Image.open('custom_icon.png.jpg')
 print(f"📏 Original size: {img.size}")
 
-# Convert to RGBA if needed
-if img.mode != 'RGBA':
-    img = img.convert('RGBA')
-
-# Make it square by cropping to center
-width, height = img.size
-size = min(width, height)
-left = (width - size) // 2
-top = (height - size) // 2
-square = img.crop((left, top, left + size, top + size))
+# Crop to the center square and cut it to an antialiased circle
+result = crop_to_shape(img, 'circle')
 
-# Create circular mask
-mask = Image.new('L', (size, size), 0)
-draw = ImageDraw.Draw(mask)
-draw.ellipse((0, 0, size, size), fill=255)
-
-# Apply mask to create circle
-result = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-result.paste(square, (0, 0))
-result.putalpha(mask)
-
-# Save the circle icon
-result.save('your_circle_icon.png', format='PNG', optimize=True)
+# Save the circle icon and every size as one batch: a crash leaves
+# the previous files intact instead of a truncated icon
+pyramid = ResolutionPyramid(result)
+with OutputSink() as sink:
+    sink.save(result, 'your_circle_icon.png', optimize=True)
+    for s in sizes:
+        sink.save(pyramid.resize(s), f'circle_icon_{s}.png')
 print(f"✅ Circle icon created: your_circle_icon.png")
-
-# Create different sizes
-sizes = [64, 128, 256, 512, 1024]
 for s in sizes:
-    resized = result.resize((s, s), Image.Resampling.LANCZOS)
-    resized.save(f'circle_icon_{s}.png')
     print(f"✅ Created {s}x{s} version")
 
+# Record the outputs only once the whole batch is in place
+for path, key in outputs:
+    cache.record(path, key)
+cache.save()
 print("🎉 Your circle icon is ready!") 
\ No newline at end of file
@@ -0,0 +1,4 @@
+"""
+SmartCent Icon Toolkit
+Shared building blocks for the icon generator scripts
+"""
@@ -0,0 +1,7 @@
+"""python -m smartcent_icons: the smartcent-icons command line"""
+
+import sys
+
+from smartcent_icons.cli import main
+
+sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Android Adaptive Icons for SmartCent
+Foreground, background and monochrome layers for every mipmap density,
+plus the mipmap-anydpi-v26 XML that ties them together
+
+The artwork is rendered once, at the safe-zone size of the largest
+density, and inset into the 108dp canvas (66dp visible circle). Each layer
+is built once at full size and every density is cut from its resolution
+pyramid, so a whole adaptive set costs one render and a handful of array
+operations.
+"""
+
+import os
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+from smartcent_icons.instrument import stage
+from smartcent_icons.masks import ADAPTIVE_CANVAS, ADAPTIVE_SAFE_ZONE
+from smartcent_icons.pyramid import ResolutionPyramid
+from smartcent_icons.sink import OutputSink
+
+# Layer edge length (px) per mipmap density: 108dp at 1x, 1.5x, 2x, 3x, 4x
+DENSITIES = OrderedDict([
+    ('mdpi', 108),
+    ('hdpi', 162),
+    ('xhdpi', 216),
+    ('xxhdpi', 324),
+    ('xxxhdpi', 432),
+])
+
+# Density every other one is cut from
+FULL_SIZE = DENSITIES['xxxhdpi']
+
+# Background: #1e3c72 in the center, lightening towards the corners
+BACKGROUND_INNER = (30, 60, 114)
+BACKGROUND_OUTER = (52, 92, 157)
+
+LAYERS = ('foreground', 'background', 'monochrome')
+
+_XML_TEMPLATE = """<?xml version="1.0" encoding="utf-8"?>
+<adaptive-icon xmlns:android="http://schemas.android.com/apk/res/android">
+    <background android:drawable="@mipmap/{name}_background"/>
+    <foreground android:drawable="@mipmap/{name}_foreground"/>
+{monochrome}</adaptive-icon>
+"""
+
+
+def safe_zone_size(size):
+    """Edge length of the always-visible area of a size x size layer"""
+    return round(size * ADAPTIVE_SAFE_ZONE / ADAPTIVE_CANVAS)
+
+
+def background_layer(size, inner=BACKGROUND_INNER, outer=BACKGROUND_OUTER):
+    """Opaque RGB radial gradient from the center out to the corners
+
+    Colours are looked up by integer squared distance, so the square root
+    and blend run once per distinct distance instead of once per pixel
+    and channel; one gather then fills the whole layer.
+    """
+    center = size // 2
+    offsets = (np.arange(size, dtype=np.int32) - center) ** 2
+    squared = offsets[:, np.newaxis] + offsets[np.newaxis, :]
+
+    ratio = np.sqrt(np.arange(2 * center * center + 1, dtype=np.float32))
+    ratio *= 1 / max(np.sqrt(2) * center, 1)
+    table = np.empty((ratio.size, 3), dtype=np.uint8)
+    for channel in range(3):
+        table[:, channel] = inner[channel] + ratio * (outer[channel] - inner[channel])
+    return Image.fromarray(np.take(table, squared, axis=0), 'RGB')
+
+
+def foreground_layer(artwork, size):
+    """Artwork centered in the safe zone of a transparent size x size canvas"""
+    inner = safe_zone_size(size)
+    if artwork.size != (inner, inner):
+        artwork = artwork.resize((inner, inner), Image.Resampling.LANCZOS)
+    canvas = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    offset = (size - inner) // 2
+    canvas.paste(artwork.convert('RGBA'), (offset, offset))
+    return canvas
+
+
+def monochrome_layer(foreground):
+    """Themed-icon layer: white, with the foreground's alpha weighted by
+    its luminance so light details stay visible once the launcher tints
+    the silhouette"""
+    pixels = np.asarray(foreground.convert('RGBA'), dtype=np.float32) / 255
+    luminance = pixels[..., :3] @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    alpha = pixels[..., 3] * luminance
+    peak = alpha.max()
+    if peak > 0:
+        alpha /= peak
+
+    mono = np.full(pixels.shape[:2] + (4,), 255, dtype=np.uint8)
+    mono[..., 3] = np.round(alpha * 255).astype(np.uint8)
+    return Image.fromarray(mono, 'RGBA')
+
+
+def adaptive_layers(artwork, size=FULL_SIZE, monochrome=True):
+    """The layers of one density, by name, from artwork at safe-zone size"""
+    layers = OrderedDict()
+    layers['foreground'] = foreground_layer(artwork, size)
+    layers['background'] = background_layer(size)
+    if monochrome:
+        layers['monochrome'] = monochrome_layer(layers['foreground'])
+    return layers
+
+
+def adaptive_xml(name='ic_launcher', monochrome=True):
+    """mipmap-anydpi-v26 XML of an adaptive icon"""
+    line = f'    <monochrome android:drawable="@mipmap/{name}_monochrome"/>\n' if monochrome else ''
+    return _XML_TEMPLATE.format(name=name, monochrome=line)
+
+
+def adaptive_outputs(res_dir, name='ic_launcher', densities=DENSITIES, monochrome=True):
+    """Every file path written by write_adaptive_icon()"""
+    layers = LAYERS if monochrome else LAYERS[:2]
+    paths = [os.path.join(res_dir, f'mipmap-{density}', f'{name}_{layer}.png')
+             for density in densities for layer in layers]
+    paths += [os.path.join(res_dir, 'mipmap-anydpi-v26', f'{icon}.xml') for icon in (name, f'{name}_round')]
+    return paths
+
+
+def write_adaptive_icon(render, res_dir='android/app/src/main/res', name='ic_launcher',
+                        densities=DENSITIES, monochrome=True):
+    """Write the adaptive icon layers of every density and its XML
+
+    render(size) draws the artwork at size x size (a rasterizer's or a
+    Scene's render, or a pyramid's resize); it is called once. Everything
+    is written as one batch; returns the paths in adaptive_outputs() order.
+    """
+    largest = max(densities.values())
+    with stage('render', size=safe_zone_size(largest)):
+        artwork = render(safe_zone_size(largest))
+    with stage('adaptive', size=largest):
+        pyramids = OrderedDict((layer, ResolutionPyramid(image))
+                               for layer, image in adaptive_layers(artwork, largest, monochrome).items())
+
+    paths = adaptive_outputs(res_dir, name, densities, monochrome)
+    outputs = iter(paths)
+    with OutputSink() as sink:
+        for density, size in densities.items():
+            for pyramid in pyramids.values():
+                sink.save(pyramid.resize(size), next(outputs), 'PNG', optimize=True)
+        xml = adaptive_xml(name, monochrome).encode()
+        for path in outputs:
+            sink.write(path, xml)
+    return paths
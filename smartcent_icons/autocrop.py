@@ -0,0 +1,122 @@
+"""
+Content Autocrop for SmartCent Icons
+Finds the bounding box of an image's content (everything that is not
+background, or not transparent) without building full-size arrays
+
+The box is first found on a reduced copy. When a block's average differs
+from the background by more than the tolerance, at least one pixel of
+that block differs, so a coarse hit always contains real content. Only
+the border strips outside the coarse hits are then scanned at full
+resolution to get the exact edges.
+"""
+
+from smartcent_icons.instrument import timed
+
+# Target edge length of the reduced copy
+PREVIEW_SIZE = 256
+
+_NATIVE_MODES = ('RGB', 'RGBA', 'L', 'LA')
+
+
+def _content_bbox(image, mode, background, tolerance):
+    """bbox of the content pixels of an image, computed in one point() pass
+
+    Each band is mapped to 0 (empty) or 255 (content), then getbbox()
+    finds pixels that are non-zero in any band.
+    """
+    bands = image.getbands()
+    if mode == 'alpha':
+        if 'A' not in bands:
+            return (0, 0) + image.size
+        tables = [[255 if v > tolerance else 0 for v in range(256)] if band == 'A' else [0] * 256
+                  for band in bands]
+    elif mode == 'background':
+        colors = iter(background)
+        tables = [[0] * 256 if band == 'A' else
+                  [255 if abs(v - level) > tolerance else 0 for v in range(256)]
+                  for band, level in ((band, 0 if band == 'A' else next(colors)) for band in bands)]
+    else:
+        raise ValueError(f"Unknown autocrop mode: {mode}")
+
+    return image.point([v for table in tables for v in table]).getbbox(alpha_only=False)
+
+
+def _strip_bbox(image, box, mode, background, tolerance):
+    """Content bbox inside one region, in full-image coordinates"""
+    if box[0] >= box[2] or box[1] >= box[3]:
+        return None
+    found = _content_bbox(image.crop(box), mode, background, tolerance)
+    if found is None:
+        return None
+    return (found[0] + box[0], found[1] + box[1], found[2] + box[0], found[3] + box[1])
+
+
+@timed('autocrop')
+def content_bbox(image, mode='background', background=(0, 0, 0), tolerance=30, factor=None):
+    """Bounding box (left, top, right, bottom; right/bottom exclusive) of
+    the content, or None when the image is all background
+
+    mode='background' treats pixels within tolerance of the background
+    colour (per channel) as empty; mode='alpha' treats pixels with alpha
+    at or below tolerance as empty.
+    """
+    if image.mode not in _NATIVE_MODES:
+        image = image.convert('RGBA')
+    width, height = image.size
+    if factor is None:
+        factor = max(1, min(width, height) // PREVIEW_SIZE)
+
+    coarse = None
+    if factor > 1:
+        preview = image.reduce(factor)
+        if mode == 'background' and 'A' in preview.getbands():
+            # reduce() averages colour weighted by alpha, which rounds
+            # badly (and turns fully transparent blocks black) unless the
+            # block is opaque; treat the others as background and leave
+            # them to the exact scan
+            transparent = preview.getchannel('A').point([255] * 255 + [0])
+            preview = preview.convert(preview.mode[:-1])
+            fill = tuple(background[:len(preview.mode)]) if len(preview.mode) > 1 else background[0]
+            preview.paste(fill, mask=transparent)
+        coarse = _content_bbox(preview, mode, background, tolerance)
+    if coarse is None:
+        # Nothing survived the reduction (or nothing to reduce): scan exactly
+        return _strip_bbox(image, (0, 0, width, height), mode, background, tolerance)
+
+    # Full-resolution rectangle whose every edge touches known content
+    inner = (min(width, (coarse[0] + 1) * factor), min(height, (coarse[1] + 1) * factor),
+             (coarse[2] - 1) * factor, (coarse[3] - 1) * factor)
+
+    # The exact edges lie in the border around it: full-width strips above
+    # and below, and side strips between them
+    strips = [
+        (0, 0, width, inner[1]),
+        (0, inner[3], width, height),
+        (0, inner[1], inner[0], inner[3]),
+        (inner[2], inner[1], width, inner[3]),
+    ]
+    found = [bbox for bbox in (_strip_bbox(image, strip, mode, background, tolerance) for strip in strips)
+             if bbox is not None]
+    if not found:
+        return _strip_bbox(image, (0, 0, width, height), mode, background, tolerance)
+    return (min(b[0] for b in found), min(b[1] for b in found),
+            max(b[2] for b in found), max(b[3] for b in found))
+
+
+def autocrop_box(image, padding=0, **options):
+    """Content bbox grown by padding on every side and clamped to the image,
+    or None when the image is all background"""
+    bbox = content_bbox(image, **options)
+    if bbox is None:
+        return None
+    width, height = image.size
+    return (max(0, bbox[0] - padding), max(0, bbox[1] - padding),
+            min(width, bbox[2] + padding), min(height, bbox[3] + padding))
+
+
+def autocrop(image, padding=0, **options):
+    """Crop an image to its content plus padding; unchanged if it has none"""
+    box = autocrop_box(image, padding, **options)
+    if box is None:
+        return image
+    return image.crop(box)
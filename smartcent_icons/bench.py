@@ -0,0 +1,245 @@
+"""
+Icon Pipeline Benchmarks for SmartCent
+Times the gradient, render, mask, fan-out and ICO stages of the generator
+scripts on synthetic fixed-seed inputs and compares them with a baseline
+
+    python -m smartcent_icons.bench --save        # record a baseline
+    python -m smartcent_icons.bench               # fail on >15% regressions
+
+Each benchmark runs cold: the toolkit's in-process caches (scene
+snapshots, masks, vignettes) are cleared before every repeat, as they
+would be in a fresh script run. The best of the repeats is compared, as
+it is the least disturbed by other load on the machine. Baselines are
+per machine, so they live outside the repository by default.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+import numpy as np
+from PIL import Image
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BASELINE_NAME = '.smartcent_bench.json'
+
+# Allowed slowdown of a benchmark's best time against the baseline (%)
+DEFAULT_THRESHOLD = 15.0
+
+DEFAULT_REPEAT = 3
+
+DEFAULT_SEED = 1234
+
+Benchmark = namedtuple('Benchmark', ['name', 'run'])
+
+BenchResult = namedtuple('BenchResult', ['name', 'best', 'median', 'repeat'])
+
+
+def load_script(relative_path):
+    """Import one of the generator scripts as a module, without running it"""
+    path = os.path.join(REPO_ROOT, relative_path)
+    name = 'bench_' + os.path.splitext(os.path.basename(path))[0]
+    if name in sys.modules:
+        return sys.modules[name]
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules[name] = module
+    return module
+
+
+def clear_caches():
+    """Forget every in-process cache of the toolkit"""
+    from smartcent_icons.scene import _shared_cache
+    _shared_cache.clear()
+    for name, module in list(sys.modules.items()):
+        if name.startswith('smartcent_icons.'):
+            for value in vars(module).values():
+                if callable(getattr(value, 'cache_clear', None)):
+                    value.cache_clear()
+
+
+def synthetic_photo(width, height, seed=DEFAULT_SEED):
+    """A deterministic photo-like RGB image: smooth colour fields, a bright
+    disc and sensor noise, so encoders and resamplers see real detail"""
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    fields = []
+    for _ in range(3):
+        fx, fy, phase = rng.uniform(0.5, 3.0), rng.uniform(0.5, 3.0), rng.uniform(0, 2 * np.pi)
+        fields.append(128 + 90 * np.sin(fx * 2 * np.pi * x / width + phase) * np.cos(fy * 2 * np.pi * y / height))
+    pixels = np.stack(fields, axis=-1)
+
+    cx, cy, radius = width / 2, height / 2, 0.4 * min(width, height)
+    disc = ((x - cx) ** 2 + (y - cy) ** 2) <= radius ** 2
+    pixels[disc] = pixels[disc] * 0.4 + np.array([40, 180, 170]) * 0.6
+
+    pixels += rng.normal(0, 6, pixels.shape)
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8), 'RGB')
+
+
+@contextlib.contextmanager
+def _quiet_in(directory):
+    """Run a script function inside directory, without its progress output
+    and without the build cache"""
+    cwd = os.getcwd()
+    no_cache = os.environ.get('SMARTCENT_NO_CACHE')
+    os.chdir(directory)
+    os.environ['SMARTCENT_NO_CACHE'] = '1'
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        os.chdir(cwd)
+        if no_cache is None:
+            del os.environ['SMARTCENT_NO_CACHE']
+        else:
+            os.environ['SMARTCENT_NO_CACHE'] = no_cache
+
+
+def benchmarks(workdir, seed=DEFAULT_SEED, workers=1):
+    """The benchmark suite; inputs are written to workdir"""
+    premium = load_script('assets/icons/create_premium_icon.py')
+    modern = load_script('assets/icons/create_modern_tech_icon.py')
+    circle = load_script('crop_circle_icon.py')
+    ico = load_script('assets/convert_to_ico.py')
+
+    photo_path = os.path.join(workdir, 'photo.jpg')
+    synthetic_photo(3000, 2250, seed).save(photo_path, quality=92)
+    photo = synthetic_photo(2048, 1536, seed)
+    icon_path = os.path.join(workdir, 'icon.png')
+    circle.crop_to_circle(synthetic_photo(1024, 1024, seed)).save(icon_path)
+
+    def fanout():
+        with _quiet_in(workdir):
+            if not circle.create_app_icons_from_circle(photo_path, workers=workers):
+                raise RuntimeError("fan-out failed")
+
+    def convert_ico():
+        with _quiet_in(workdir):
+            if not ico.convert_png_to_ico(icon_path, 'icon.ico'):
+                raise RuntimeError("ICO conversion failed")
+
+    suite = [
+        Benchmark('gradient.elegant.1024',
+                  lambda: premium.create_elegant_gradient(1024, (44, 62, 80), (52, 73, 94), 'radial')),
+        Benchmark('gradient.modern.1024',
+                  lambda: modern.create_modern_gradient(1024, (0, 150, 136), (0, 77, 64))),
+    ]
+    for size in (64, 256, 1024):
+        suite.append(Benchmark(f'render.premium.{size}',
+                               lambda size=size: premium.create_premium_smartcent_icon(size)))
+    suite += [
+        Benchmark('mask.crop_to_circle.2048x1536', lambda: circle.crop_to_circle(photo)),
+        Benchmark('fanout.create_app_icons_from_circle', fanout),
+        Benchmark('ico.convert_png_to_ico', convert_ico),
+    ]
+    return suite
+
+
+def run_benchmark(benchmark, repeat=DEFAULT_REPEAT):
+    """Time a benchmark cold, repeat times"""
+    times = []
+    for _ in range(repeat):
+        clear_caches()
+        start = time.perf_counter()
+        benchmark.run()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return BenchResult(benchmark.name, times[0], times[len(times) // 2], repeat)
+
+
+def load_baseline(path):
+    """Baseline results by benchmark name, or {} when there is none"""
+    try:
+        with open(path) as f:
+            return json.load(f).get('results', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(path, results):
+    data = {
+        'version': 1,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': {r.name: {'best': r.best, 'median': r.median, 'repeat': r.repeat} for r in results},
+    }
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Names of the benchmarks whose best time regressed beyond threshold %"""
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous and result.best > previous['best'] * (1 + threshold / 100):
+            regressions.append(result.name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m smartcent_icons.bench',
+                                     description="Benchmark the icon pipeline against a stored baseline.")
+    parser.add_argument('--baseline', default=BASELINE_NAME, help=f"baseline file (default: {BASELINE_NAME})")
+    parser.add_argument('--save', action='store_true', help="write these results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"allowed slowdown in percent (default: {DEFAULT_THRESHOLD:g})")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="runs per benchmark")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="seed of the synthetic inputs")
+    parser.add_argument('--jobs', type=int, default=1, help="workers for the fan-out benchmark (default 1)")
+    parser.add_argument('--filter', default='', help="only run benchmarks whose name contains this")
+    parser.add_argument('--json', action='store_true', help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline)
+    with tempfile.TemporaryDirectory(prefix='smartcent-bench-') as workdir:
+        suite = [b for b in benchmarks(workdir, args.seed, args.jobs) if args.filter in b.name]
+        results = []
+        for benchmark in suite:
+            result = run_benchmark(benchmark, args.repeat)
+            results.append(result)
+            if not args.json:
+                previous = baseline.get(result.name)
+                change = (f" ({100 * (result.best / previous['best'] - 1):+.1f}% vs baseline)"
+                          if previous else "")
+                print(f"⏱️ {result.name}: best {result.best * 1000:.1f} ms, "
+                      f"median {result.median * 1000:.1f} ms{change}")
+
+    regressions = compare(results, baseline, args.threshold)
+    if args.json:
+        json.dump({'results': [r._asdict() for r in results], 'regressions': regressions,
+                   'threshold': args.threshold}, sys.stdout, indent=1)
+        print()
+    else:
+        for name in regressions:
+            print(f"❌ {name} regressed by more than {args.threshold:g}%")
+        if baseline and not regressions:
+            print(f"✅ No benchmark regressed by more than {args.threshold:g}%")
+
+    if args.save:
+        # Keep baselines of benchmarks that were filtered out of this run
+        merged = {name: BenchResult(name, r['best'], r['median'], r['repeat']) for name, r in baseline.items()}
+        merged.update({r.name: r for r in results})
+        save_baseline(args.baseline, list(merged.values()))
+        if not args.json:
+            print(f"💾 Saved baseline to {args.baseline}")
+    return 1 if regressions and not args.save else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Incremental Build Cache for SmartCent Icons
+Skips outputs whose inputs, renderer code and encoder settings are unchanged
+
+Each output path is recorded in a small JSON manifest together with the
+key it was built from and the size/mtime of the file that was written.
+An output is fresh when its new key matches and the file on disk is the
+one the cache wrote.
+"""
+
+import glob
+import hashlib
+import inspect
+import json
+import os
+from functools import lru_cache
+
+MANIFEST_NAME = '.smartcent_cache.json'
+
+_TOOLKIT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def hash_bytes(data):
+    """SHA-256 hex digest of a bytes object"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """SHA-256 hex digest of a file's contents, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _source_file_hash(path):
+    return hash_file(path)
+
+
+def fingerprint(*objects):
+    """Fingerprint renderer code: the source files of the given functions or
+    modules plus the whole toolkit package, so palette or helper edits
+    invalidate the cache. Plain values are included by their repr.
+    """
+    parts = [_source_file_hash(path) for path in sorted(glob.glob(os.path.join(_TOOLKIT_DIR, '*.py')))]
+    for obj in objects:
+        try:
+            parts.append(_source_file_hash(inspect.getsourcefile(obj)))
+        except (TypeError, OSError):
+            parts.append(repr(obj))
+    return hash_bytes('\n'.join(parts).encode())
+
+
+def make_key(*parts, **named):
+    """Combine hashes and settings into one stable build key"""
+    payload = json.dumps([parts, named], sort_keys=True, default=repr)
+    return hash_bytes(payload.encode())
+
+
+class BuildCache:
+    """On-disk manifest mapping output paths to the key they were built from
+
+    The manifest lives in cache_dir (default: SMARTCENT_CACHE_DIR, then the
+    current directory). Setting SMARTCENT_NO_CACHE=1 makes every output stale.
+    Use as a context manager to save the manifest on exit.
+    """
+
+    def __init__(self, cache_dir=None):
+        cache_dir = cache_dir or os.environ.get('SMARTCENT_CACHE_DIR') or os.getcwd()
+        self.path = os.path.join(cache_dir, MANIFEST_NAME)
+        self.enabled = os.environ.get('SMARTCENT_NO_CACHE', '') in ('', '0')
+        self.entries = {}
+        self._dirty = False
+
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f).get('outputs', {})
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.save()
+
+    def is_fresh(self, output_path, key):
+        """True when output_path was built from key and is untouched since"""
+        if not self.enabled:
+            return False
+        entry = self.entries.get(os.path.abspath(output_path))
+        if not entry or entry['key'] != key:
+            return False
+        try:
+            stat = os.stat(output_path)
+        except OSError:
+            return False
+        return stat.st_size == entry['size'] and stat.st_mtime_ns == entry['mtime_ns']
+
+    def all_fresh(self, outputs):
+        """True when every (output_path, key) pair is fresh"""
+        return all(self.is_fresh(path, key) for path, key in outputs)
+
+    def record(self, output_path, key):
+        """Remember that output_path was just written from key"""
+        stat = os.stat(output_path)
+        self.entries[os.path.abspath(output_path)] = {
+            'key': key,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+        }
+        self._dirty = True
+
+    def save(self):
+        """Write the manifest atomically if anything changed"""
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': 1, 'outputs': self.entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -0,0 +1,665 @@
+"""
+SmartCent Icons Command Line
+One non-interactive entry point for the icon toolkit:
+
+    smartcent-icons render premium out/premium_{size}.png -s 64 -s 512
+    smartcent-icons crop upload.jpg circle.png --autocrop --size 1024
+    smartcent-icons export circle.png build/icon_{size}.png -s 48 -s 192
+    smartcent-icons ico basic app_icon.ico
+    smartcent-icons manifest platforms
+    smartcent-icons adaptive assets/icons/app_icon.svg
+    smartcent-icons variants premium themes/{palette}_{size}.png --palettes themes.json
+    smartcent-icons optimize build/*.png --min-psnr 40
+    smartcent-icons watch platforms fanout=upload.jpg --var prefix=app --draft
+
+A SOURCE is an image file, an SVG or the name of a built-in design.
+Commands import Pillow and the toolkit only when they run, so --help
+starts instantly. --json prints one machine-readable report with stage
+timings instead of progress messages.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# Built-in designs (smartcent_icons.designs.SCENES), listed here so the
+# parser does not need to import Pillow
+DESIGNS = ('premium', 'modern', 'basic', 'windows', 'simple')
+
+DEFAULT_ICO_SIZES = (16, 24, 32, 48, 64, 128, 256)
+
+
+class Report:
+    """Stage timings, outputs and messages of one command run"""
+
+    def __init__(self, command, quiet=False):
+        self.command = command
+        self.quiet = quiet
+        self.stages = {}
+        self.outputs = []
+        self.info = {}
+        self.ok = True
+
+    @contextmanager
+    def stage(self, name):
+        """Time a block, adding to earlier runs of the same stage"""
+        from smartcent_icons.instrument import stage
+        start = time.perf_counter()
+        try:
+            with stage(f'{self.command}.{name}'):
+                yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def say(self, message):
+        if not self.quiet:
+            print(message)
+
+    def output(self, filename, size=None, ok=True, error=None, bytes_written=None, cached=False):
+        """Record one written (or failed, or up-to-date) file"""
+        if bytes_written is None and ok and os.path.exists(filename):
+            bytes_written = os.path.getsize(filename)
+        self.outputs.append({'filename': filename, 'size': size, 'ok': ok, 'error': error,
+                             'bytes': bytes_written, 'cached': cached})
+        self.ok = self.ok and ok
+        if cached:
+            self.say(f"⏭️ Up to date {filename}")
+        elif ok:
+            self.say(f"✅ Created {filename}" + (f" ({size}x{size})" if size else ""))
+        else:
+            self.say(f"❌ Failed to create {filename}: {error}")
+
+    def export_results(self, results):
+        for result in results:
+            self.output(result.filename, result.size, result.ok, result.error,
+                        result.bytes_written if result.ok else None, result.cached)
+
+    def as_dict(self, wall_seconds, cpu_seconds):
+        return {
+            'command': self.command,
+            'ok': self.ok,
+            'wall_seconds': round(wall_seconds, 6),
+            'cpu_seconds': round(cpu_seconds, 6),
+            'stages': {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            'outputs': self.outputs,
+            **self.info,
+        }
+
+
+# Shared helpers
+
+def _is_design(source):
+    return source in DESIGNS and not os.path.exists(source)
+
+
+def _output_paths(pattern, sizes, parser):
+    """One output path per size from a pattern containing {size}, with
+    their directories created"""
+    if len(sizes) > 1 and '{size}' not in pattern:
+        parser.error(f"several sizes need a {{size}} placeholder in the output path: {pattern}")
+    paths = [pattern.format(size=size) for size in sizes]
+    for path in paths:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    return paths
+
+
+def _cache(args):
+    from smartcent_icons.cache import BuildCache
+    if args.no_cache:
+        return None
+    return BuildCache(args.cache_dir)
+
+
+def _decoded_cache(args):
+    from smartcent_icons.pixelcache import DecodedCache
+    if args.no_cache:
+        return None
+    return DecodedCache(args.cache_dir)
+
+
+def _decisions(args):
+    from smartcent_icons.supersample import DecisionTable
+    if args.no_cache:
+        return None
+    return DecisionTable(args.cache_dir)
+
+
+def _optimizer(args):
+    """PngOptimizer from --optimize/--min-psnr, or None"""
+    if not (args.optimize or args.min_psnr is not None):
+        return None
+    from smartcent_icons.optimize import PngOptimizer
+    return PngOptimizer(min_psnr=args.min_psnr, workers=args.jobs)
+
+
+def _renderer(design, args):
+    from smartcent_icons.designs import SCENES
+    from smartcent_icons.supersample import SupersamplePolicy, SupersampledRenderer
+    return SupersampledRenderer(SCENES[design], SupersamplePolicy(args.supersample, table=_decisions(args)))
+
+
+def _pixels(source, max_size, args, report):
+    """(pixel-source keyword arguments, base key) for export_sizes/execute
+
+    Designs render each size; SVGs go through a rasterizer; images are
+    loaded once as a square master no larger than needed.
+    """
+    from smartcent_icons.cache import fingerprint, hash_file, make_key
+
+    if _is_design(source):
+        renderer = _renderer(source, args)
+        return {'render': renderer}, make_key(fingerprint(), renderer.key())
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"No such source image or design: {source}")
+    if source.lower().endswith('.svg'):
+        from smartcent_icons.rasterize import get_rasterizer
+        rasterizer = get_rasterizer(source, args.rasterizer)
+        return {'rasterizer': rasterizer}, make_key(hash_file(source), rasterizer.name, fingerprint())
+
+    from smartcent_icons.pyramid import ResolutionPyramid
+    from smartcent_icons.source import load_square
+    with report.stage('load'):
+        master = load_square(source, max_size=2 * max_size, fit=args.fit, cache=_decoded_cache(args))
+        pyramid = ResolutionPyramid(master)
+    return {'source': pyramid}, make_key(hash_file(source), args.fit, fingerprint())
+
+
+def _report_optimizer(optimizer, report):
+    if optimizer is None:
+        return
+    report.info['optimized'] = [dict(result._asdict()) for result in optimizer.results]
+    if not report.quiet:
+        optimizer.report()
+
+
+# Commands
+
+def cmd_render(args, report):
+    """Render a built-in design at one or more sizes"""
+    from smartcent_icons.export import ExportJob, export_sizes
+
+    sizes = args.size or [512]
+    jobs = [ExportJob(path, size, 'PNG', {'optimize': True})
+            for path, size in zip(_output_paths(args.output, sizes, args.parser), sizes)]
+    pixels, base_key = _pixels(args.design, max(sizes), args, report)
+    optimizer = _optimizer(args)
+    report.say(f"🎨 Rendering {args.design} at {len(sizes)} size(s)...")
+    cache = _cache(args)
+    with report.stage('export'):
+        results = export_sizes(jobs, workers=args.jobs, cache=cache, base_key=base_key,
+                               optimizer=optimizer, **pixels)
+    if cache is not None:
+        cache.save()
+    report.export_results(results)
+    _report_optimizer(optimizer, report)
+
+
+def _square_box(box):
+    """Largest square centered in a box"""
+    width, height = box[2] - box[0], box[3] - box[1]
+    side = min(width, height)
+    left = box[0] + (width - side) // 2
+    top = box[1] + (height - side) // 2
+    return (left, top, left + side, top + side)
+
+
+def cmd_crop(args, report):
+    """Square-crop an image (optionally to its content) and cut it to a shape"""
+    from PIL import Image
+
+    from smartcent_icons.masks import apply_mask
+    from smartcent_icons.sink import save_atomic
+    from smartcent_icons.source import StreamingSource, load_square
+
+    box = None
+    if args.autocrop:
+        from smartcent_icons.autocrop import autocrop_box
+        background = tuple(int(v) for v in args.background.split(','))
+        with report.stage('autocrop'), Image.open(args.input) as image:
+            box = autocrop_box(image, padding=args.padding, background=background,
+                               tolerance=args.tolerance)
+        if box is None:
+            report.say("⚠️ No content found; using the whole image")
+    with report.stage('load'):
+        box = _square_box(box or StreamingSource(args.input).center_square())
+        image = load_square(args.input, max_size=args.size, box=box, cache=_decoded_cache(args))
+    with report.stage('mask'):
+        apply_mask(image, args.shape)
+    with report.stage('encode'):
+        save_atomic(image, args.output, 'PNG', optimize=True)
+    report.info['box'] = list(box)
+    report.output(args.output, image.size[0])
+
+
+def cmd_export(args, report):
+    """Cut a source into several PNG sizes"""
+    from smartcent_icons.export import ExportJob, export_sizes
+
+    sizes = args.size
+    jobs = [ExportJob(path, size, 'PNG', {'optimize': True})
+            for path, size in zip(_output_paths(args.output, sizes, args.parser), sizes)]
+    pixels, base_key = _pixels(args.source, max(sizes), args, report)
+    if 'rasterizer' in pixels:
+        # Rasterizers write straight to files; plan them like a manifest
+        return _export_rasterized(pixels['rasterizer'], jobs, base_key, args, report)
+    optimizer = _optimizer(args)
+    cache = _cache(args)
+    with report.stage('export'):
+        results = export_sizes(jobs, workers=args.jobs, cache=cache, base_key=base_key,
+                               optimizer=optimizer, **pixels)
+    if cache is not None:
+        cache.save()
+    report.export_results(results)
+    _report_optimizer(optimizer, report)
+
+
+def _export_rasterized(rasterizer, jobs, base_key, args, report):
+    from smartcent_icons.manifest import PlannedOutput, Target, execute
+
+    planned = [PlannedOutput(job, [Target(None, None, job.filename, job.size, 'png', (), {})]) for job in jobs]
+    optimizer = _optimizer(args)
+    cache = _cache(args)
+    with report.stage('export'):
+        results = execute(planned, rasterizer=rasterizer, cache=cache, base_key=base_key, optimizer=optimizer)
+    if cache is not None:
+        cache.save()
+    report.export_results(results)
+    _report_optimizer(optimizer, report)
+
+
+def cmd_ico(args, report):
+    """Write a multi-resolution ICO from a source"""
+    from smartcent_icons.cache import make_key
+    from smartcent_icons.ico import ico_frames, verify_ico, write_ico
+
+    sizes = sorted(set(args.sizes))
+    pixels, base_key = _pixels(args.source, max(sizes), args, report)
+    key = make_key(base_key, 'ICO', sizes)
+    cache = _cache(args)
+    if cache is not None and cache.is_fresh(args.output, key):
+        report.output(args.output, max(sizes), cached=True)
+        return
+
+    with report.stage('render'):
+        if 'render' in pixels:
+            frames = [pixels['render'](size) for size in sizes]
+        elif 'source' in pixels:
+            frames = ico_frames(pixels['source'], sizes)
+        else:
+            frames = ico_frames(pixels['rasterizer'].render(max(sizes)), sizes)
+    with report.stage('encode'):
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        write_ico(args.output, frames)
+        verify_ico(args.output, sizes)
+    if cache is not None:
+        cache.record(args.output, key)
+        cache.save()
+    report.info['frames'] = sizes
+    report.output(args.output, max(sizes))
+
+
+def cmd_manifest(args, report):
+    """Export a target set from targets.json"""
+    from smartcent_icons.manifest import execute, load_spec, load_targets, plan, plan_summary
+
+    spec = load_spec(args.spec)
+    if args.set not in spec.get('sets', {}):
+        args.parser.error(f"unknown target set '{args.set}' (have: {', '.join(spec.get('sets', {}))})")
+    path_vars = dict(var.split('=', 1) for var in args.var)
+    try:
+        planned = plan(load_targets(args.set, spec, **path_vars))
+    except KeyError as e:
+        args.parser.error(f"target set '{args.set}' needs --var {e.args[0]}=...")
+    target_count, render_count = plan_summary(planned)
+    report.info['targets'] = target_count
+    report.info['renders'] = render_count
+
+    if args.dry_run:
+        for output in planned:
+            for target in output.targets:
+                report.say(f"📋 {target.path} ({output.job.size}x{output.job.size} {output.job.format})")
+        report.info['plan'] = [{'render': output.job.filename, 'size': output.job.size,
+                                'format': output.job.format,
+                                'targets': [target.path for target in output.targets]}
+                               for output in planned]
+        return
+
+    source = args.source or spec['sets'][args.set].get('source')
+    if not source:
+        args.parser.error(f"target set '{args.set}' has no default source; pass one")
+    max_size = max(output.job.size for output in planned)
+    pixels, base_key = _pixels(source, max_size, args, report)
+    optimizer = _optimizer(args)
+    report.say(f"🖨️ Exporting {target_count} icons from {render_count} renders...")
+    cache = _cache(args)
+    with report.stage('export'):
+        results = execute(planned, workers=args.jobs, cache=cache, base_key=base_key,
+                          optimizer=optimizer, **pixels)
+    if cache is not None:
+        cache.save()
+    report.export_results(results)
+    _report_optimizer(optimizer, report)
+
+
+def cmd_adaptive(args, report):
+    """Write Android adaptive icon layers for every density and their XML"""
+    from smartcent_icons.adaptive import DENSITIES, adaptive_outputs, safe_zone_size, write_adaptive_icon
+    from smartcent_icons.cache import make_key
+
+    pixels, base_key = _pixels(args.source, safe_zone_size(max(DENSITIES.values())), args, report)
+    if 'render' in pixels:
+        render = pixels['render']
+    elif 'rasterizer' in pixels:
+        render = pixels['rasterizer'].render
+    else:
+        render = pixels['source'].resize
+
+    monochrome = not args.no_monochrome
+    key = make_key(base_key, 'adaptive', args.name, monochrome)
+    outputs = adaptive_outputs(args.res_dir, args.name, monochrome=monochrome)
+    cache = _cache(args)
+    if cache is not None and cache.all_fresh((path, key) for path in outputs):
+        for path in outputs:
+            report.output(path, cached=True)
+        return
+
+    report.say(f"🎨 Creating adaptive icon layers for {len(DENSITIES)} densities...")
+    with report.stage('adaptive'):
+        written = write_adaptive_icon(render, args.res_dir, args.name, monochrome=monochrome)
+    for path in written:
+        if cache is not None:
+            cache.record(path, key)
+        report.output(path)
+    if cache is not None:
+        cache.save()
+
+
+def cmd_variants(args, report):
+    """Render a built-in design in several palettes from one geometry pass"""
+    from smartcent_icons.cache import fingerprint, make_key
+    from smartcent_icons.designs import palette_scene
+    from smartcent_icons.sink import OutputSink
+    from smartcent_icons.supersample import SupersamplePolicy
+    from smartcent_icons.variants import coverage_masks, parse_color
+
+    with open(args.palettes, encoding='utf-8') as f:
+        palettes = json.load(f)
+    if not isinstance(palettes, dict) or not palettes:
+        raise ValueError(f"{args.palettes} must map palette names to {{color name: color}} objects")
+    sizes = args.size or [512]
+    if len(palettes) > 1 and '{palette}' not in args.output:
+        args.parser.error(f"several palettes need a {{palette}} placeholder in the output path: {args.output}")
+    if len(sizes) > 1 and '{size}' not in args.output:
+        args.parser.error(f"several sizes need a {{size}} placeholder in the output path: {args.output}")
+
+    names = list(palettes)
+    scenes = [palette_scene(args.design, **{color: parse_color(value) for color, value in palettes[name].items()})
+              for name in names]
+    policy = SupersamplePolicy(args.supersample, table=_decisions(args))
+    cache = _cache(args)
+    report.say(f"🎨 Rendering {args.design} in {len(names)} palette(s) at {len(sizes)} size(s)...")
+
+    written = []
+    with OutputSink() as sink:
+        for size in sizes:
+            factor = policy.factor_for(scenes[0], size)
+            outputs = [(args.output.format(palette=name, size=size),
+                        make_key(fingerprint(), repr(scene.key()), 'supersample', factor, size, 'PNG', optimize=True))
+                       for name, scene in zip(names, scenes)]
+            if cache is not None and cache.all_fresh(outputs):
+                for path, _ in outputs:
+                    report.output(path, size, cached=True)
+                continue
+            with report.stage('coverage'):
+                masks = coverage_masks(scenes, size, factor)
+            with report.stage('colorize'):
+                for index, (path, key) in enumerate(outputs):
+                    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                    sink.save(masks.colorize(index), path, 'PNG', optimize=True)
+                    written.append((path, size, key))
+    for path, size, key in written:
+        if cache is not None:
+            cache.record(path, key)
+        report.output(path, size)
+    if cache is not None:
+        cache.save()
+
+
+def cmd_watch(args, report):
+    """Re-export target sets whenever their source or the spec changes"""
+    from smartcent_icons.watch import SetBuilder, watch
+
+    path_vars = dict(var.split('=', 1) for var in args.var)
+    cache = _cache(args)
+    builders = []
+    for entry in args.sets:
+        set_name, _, source = entry.partition('=')
+        try:
+            builders.append(SetBuilder(set_name, source or None, path_vars, args.spec, workers=args.jobs,
+                                       cache=cache, draft=args.draft, fit=args.fit,
+                                       rasterizer=args.rasterizer, optimizer=_optimizer(args)))
+        except ValueError as e:
+            # Unknown sets and unusable sources are argument errors
+            args.parser.error(str(e))
+
+    def on_build(builder, changed, results, seconds):
+        written = [result for result in results if not result.cached]
+        failed = [result for result in written if not result.ok]
+        if args.json:
+            print(json.dumps({'set': builder.set_name, 'source': builder.source, 'ok': not failed,
+                              'changed': sorted(changed or ()), 'seconds': round(seconds, 6),
+                              'written': [result.filename for result in written if result.ok],
+                              'failed': {result.filename: result.error for result in failed},
+                              'up_to_date': len(results) - len(written)}), flush=True)
+            return
+        cause = ', '.join(os.path.basename(path) for path in sorted(changed)) if changed else 'start'
+        print(f"🔄 {builder.set_name} ({cause}): wrote {len(written) - len(failed)} of {len(results)} "
+              f"icons in {seconds:.2f}s", flush=True)
+        for result in failed:
+            print(f"❌ Failed to create {result.filename}: {result.error}", flush=True)
+
+    def on_error(builder, error):
+        report.ok = False
+        print(f"❌ {builder.set_name}: {error}", file=sys.stderr, flush=True)
+
+    report.say(f"👀 Watching {len(builders)} target set(s); press Ctrl+C to stop")
+    try:
+        watch(builders, on_build, debounce=args.debounce, backend='polling' if args.poll else 'auto',
+              on_error=on_error)
+    except KeyboardInterrupt:
+        report.say("👋 Stopped watching")
+
+
+def cmd_optimize(args, report):
+    """Losslessly (or within --min-psnr) recompress PNG files"""
+    from smartcent_icons.optimize import PngOptimizer
+
+    budgets = {}
+    for budget in args.budget:
+        pattern, limit = budget.rsplit('=', 1)
+        budgets[pattern] = int(limit)
+    optimizer = PngOptimizer(level=args.level, min_psnr=args.min_psnr, use_zopfli=not args.no_zopfli,
+                             budgets=budgets, workers=args.jobs)
+    with report.stage('optimize'):
+        results = optimizer.run(args.files)
+    for result in results:
+        report.outputs.append({'filename': result.filename, 'ok': result.error is None,
+                               'error': result.error, 'bytes': result.optimized_bytes,
+                               'original_bytes': result.original_bytes, 'method': result.method,
+                               'psnr': result.psnr, 'over_budget': result.over_budget})
+        report.ok = report.ok and result.error is None
+    if not report.quiet:
+        optimizer.report()
+
+
+# Parser
+
+def _positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {text}")
+    return value
+
+
+def _size_list(text):
+    return [_positive_int(part) for part in text.split(',') if part.strip()]
+
+
+def _supersample(text):
+    if text == 'auto':
+        return text
+    return _positive_int(text)
+
+
+def build_parser():
+    # Options accepted both before and after the command name
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--jobs', '-j', type=_positive_int, default=argparse.SUPPRESS,
+                        help="worker processes (default: SMARTCENT_JOBS, then the CPU count)")
+    common.add_argument('--cache-dir', default=argparse.SUPPRESS,
+                        help="directory of the build cache manifest (default: SMARTCENT_CACHE_DIR, then .)")
+    common.add_argument('--no-cache', action='store_true', default=argparse.SUPPRESS,
+                        help="rebuild every output")
+    common.add_argument('--json', action='store_true', default=argparse.SUPPRESS,
+                        help="print a JSON report with timings instead of progress messages")
+    common.add_argument('--trace', default=argparse.SUPPRESS, metavar='REPORT',
+                        help="record per-stage and per-file timings to REPORT (.json, .csv or .trace.json)")
+    common.add_argument('--trace-memory', action='store_true', default=argparse.SUPPRESS,
+                        help="add tracemalloc peaks to the --trace report (slower)")
+
+    parser = argparse.ArgumentParser(prog='smartcent-icons', parents=[common],
+                                     description="Render, crop and export SmartCent app icons.")
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+    commands.required = True
+
+    def add(name, func, help_text):
+        sub = commands.add_parser(name, parents=[common], help=help_text, description=help_text)
+        sub.set_defaults(func=func, parser=sub)
+        return sub
+
+    def add_pixel_options(sub, optimize=True):
+        sub.add_argument('--supersample', type=_supersample, default='auto',
+                         help="design supersample factor or 'auto' (default: auto)")
+        sub.add_argument('--fit', choices=('crop', 'pad'), default='crop',
+                         help="square an image source by center crop or transparent padding")
+        sub.add_argument('--rasterizer', default=None,
+                         help="SVG backend (default: SMARTCENT_RASTERIZER, then auto)")
+        if optimize:
+            sub.add_argument('--optimize', action='store_true', help="recompress written PNGs")
+            sub.add_argument('--min-psnr', type=float, default=None,
+                             help="allow lossy palette PNGs at or above this PSNR (dB)")
+
+    sub = add('render', cmd_render, "render a built-in design")
+    sub.add_argument('design', choices=DESIGNS)
+    sub.add_argument('output', help="output PNG; use {size} with several sizes")
+    sub.add_argument('--size', '-s', type=_positive_int, action='append', help="edge length (repeatable, default 512)")
+    add_pixel_options(sub)
+
+    sub = add('crop', cmd_crop, "square-crop an image and cut it to a shape")
+    sub.add_argument('input')
+    sub.add_argument('output', help="output PNG")
+    sub.add_argument('--shape', choices=('circle', 'rounded_rect', 'squircle', 'adaptive'), default='circle')
+    sub.add_argument('--size', type=_positive_int, default=None, help="maximum edge length of the result")
+    sub.add_argument('--autocrop', action='store_true', help="crop to the content bounding box first")
+    sub.add_argument('--background', default='0,0,0', help="autocrop background colour as R,G,B")
+    sub.add_argument('--tolerance', type=int, default=30, help="autocrop per-channel tolerance")
+    sub.add_argument('--padding', type=int, default=10, help="autocrop padding in pixels")
+
+    sub = add('export', cmd_export, "cut a source into several PNG sizes")
+    sub.add_argument('source', help="image, SVG or design name")
+    sub.add_argument('output', help="output path; use {size} with several sizes")
+    sub.add_argument('--size', '-s', type=_positive_int, action='append', required=True,
+                     help="edge length (repeatable)")
+    add_pixel_options(sub)
+
+    sub = add('ico', cmd_ico, "write a multi-resolution ICO")
+    sub.add_argument('source', help="image, SVG or design name")
+    sub.add_argument('output', help="output .ico")
+    sub.add_argument('--sizes', type=_size_list, default=list(DEFAULT_ICO_SIZES),
+                     help="comma-separated frame sizes (default: 16,24,32,48,64,128,256)")
+    add_pixel_options(sub, optimize=False)
+
+    sub = add('manifest', cmd_manifest, "export a target set from the target spec")
+    sub.add_argument('set', help="target set name, e.g. platforms, basic, fanout, windows")
+    sub.add_argument('source', nargs='?', help="image, SVG or design name (default: the set's source)")
+    sub.add_argument('--spec', default=None, help="target spec file (default: the bundled targets.json)")
+    sub.add_argument('--var', action='append', default=[], metavar='NAME=VALUE',
+                     help="fill a {NAME} placeholder in target paths (repeatable)")
+    sub.add_argument('--dry-run', action='store_true', help="print the plan without writing anything")
+    add_pixel_options(sub)
+
+    sub = add('adaptive', cmd_adaptive, "write Android adaptive icon layers and their XML")
+    sub.add_argument('source', help="image, SVG or design name")
+    sub.add_argument('--res-dir', default='android/app/src/main/res',
+                     help="Android res directory (default: android/app/src/main/res)")
+    sub.add_argument('--name', default='ic_launcher', help="mipmap name (default: ic_launcher)")
+    sub.add_argument('--no-monochrome', action='store_true', help="skip the themed-icon monochrome layer")
+    add_pixel_options(sub, optimize=False)
+
+    sub = add('variants', cmd_variants, "render a built-in design in several palettes at once")
+    sub.add_argument('design', choices=DESIGNS)
+    sub.add_argument('output', help="output PNG; use {palette} and {size} with several of each")
+    sub.add_argument('--palettes', required=True, metavar='FILE',
+                     help="JSON object of palette name -> {color name: '#rrggbb'}; unset colors keep the design's")
+    sub.add_argument('--size', '-s', type=_positive_int, action='append', help="edge length (repeatable, default 512)")
+    sub.add_argument('--supersample', type=_supersample, default='auto',
+                     help="supersample factor or 'auto' (default: auto)")
+
+    sub = add('watch', cmd_watch, "re-export target sets whenever their source or the spec changes")
+    sub.add_argument('sets', nargs='+', metavar='SET[=SOURCE]',
+                     help="target set, optionally with an image or SVG source (default: the set's source)")
+    sub.add_argument('--spec', default=None, help="target spec file (default: the bundled targets.json)")
+    sub.add_argument('--var', action='append', default=[], metavar='NAME=VALUE',
+                     help="fill a {NAME} placeholder in target paths (repeatable)")
+    sub.add_argument('--debounce', type=float, default=0.15,
+                     help="seconds of quiet that end a burst of changes (default 0.15)")
+    sub.add_argument('--poll', action='store_true', help="poll file stats instead of using inotify")
+    sub.add_argument('--draft', action='store_true',
+                     help="fast PNG compression and no optimizing, for quick previews")
+    add_pixel_options(sub)
+
+    sub = add('optimize', cmd_optimize, "recompress PNG files in place")
+    sub.add_argument('files', nargs='+')
+    sub.add_argument('--level', type=int, default=9, help="zlib level (default 9)")
+    sub.add_argument('--min-psnr', type=float, default=None,
+                     help="allow lossy palette PNGs at or above this PSNR (dB)")
+    sub.add_argument('--no-zopfli', action='store_true', help="skip zopfli even when installed")
+    sub.add_argument('--budget', action='append', default=[], metavar='PATTERN=BYTES',
+                     help="warn when files matching PATTERN exceed BYTES (repeatable)")
+    return parser
+
+
+def main(argv=None):
+    """Run the command line; returns the process exit status"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    for name, default in (('jobs', None), ('cache_dir', None), ('no_cache', False), ('json', False),
+                          ('trace', None), ('trace_memory', False)):
+        if not hasattr(args, name):
+            setattr(args, name, default)
+    if args.trace:
+        from smartcent_icons.instrument import enable
+        enable(args.trace, memory=args.trace_memory)
+
+    report = Report(args.command, quiet=args.json)
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        args.func(args, report)
+    except (OSError, ValueError, RuntimeError) as e:
+        report.ok = False
+        report.info['error'] = str(e)
+        if not args.json:
+            print(f"❌ {e}", file=sys.stderr)
+
+    if args.json:
+        json.dump(report.as_dict(time.perf_counter() - wall, time.process_time() - cpu),
+                  sys.stdout, indent=1)
+        print()
+    return 0 if report.ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
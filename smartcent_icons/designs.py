@@ -0,0 +1,540 @@
+"""
+SmartCent Icon Designs
+The premium, modern, basic, Windows and simple icons declared as scenes
+
+Each paint function is one step of the original renderer, drawing with
+the same coordinates and integer rounding, so a scene renders the same
+pixels the monolithic function did. The premium glow, rings, cent sign
+and dots are the exception: they are signed-distance shapes (sdf), with
+antialiased edges and real alpha blending at every size.
+"""
+
+import math
+
+from PIL import Image, ImageDraw, ImageFont
+
+from smartcent_icons import sdf
+from smartcent_icons.gradients import create_gradient
+from smartcent_icons.scene import Layer, Scene
+from smartcent_icons.vignette import apply_vignette
+
+
+# Shared layers
+
+def gradient_background(canvas, size, start, end, style='linear', mode='RGBA'):
+    """Fresh canvas filled with a gradient"""
+    image = create_gradient(size, start, end, style)
+    return image if mode == 'RGBA' else image.convert(mode)
+
+
+def vignette(canvas, size, inner_radius=0.7, strength=0.15):
+    """Darken the edges"""
+    return apply_vignette(canvas, inner_radius=inner_radius, strength=strength)
+
+
+# Premium
+
+def premium_outer_glow(canvas, size, color):
+    """Glow fading inward from just inside the edge"""
+    margin = size * 0.03
+    spread = size * 0.02
+    center = size / 2
+    return sdf.paint(canvas, sdf.disc(center, center, center - margin), color, alpha=50, glow=spread, inner=True)
+
+
+def premium_coin(canvas, size, start, end, highlight):
+    """Radial-gradient coin with a metallic highlight"""
+    circle_margin = int(size * 0.08)
+    circle_bg = create_gradient(size - circle_margin * 2, start, end, "radial")
+
+    metallic_overlay = Image.new('RGBA', circle_bg.size, (0, 0, 0, 0))
+    met_draw = ImageDraw.Draw(metallic_overlay)
+    highlight_size = int(circle_bg.size[0] * 0.3)
+    highlight_pos = int(circle_bg.size[0] * 0.2)
+    met_draw.ellipse([
+        highlight_pos, highlight_pos,
+        highlight_pos + highlight_size, highlight_pos + highlight_size
+    ], fill=(*highlight, 40))
+
+    circle_bg = Image.alpha_composite(circle_bg, metallic_overlay)
+    canvas.paste(circle_bg, (circle_margin, circle_margin), circle_bg)
+    return canvas
+
+
+def premium_rings(canvas, size, gold, white):
+    """Gold inner border and a finer white one inside it"""
+    center = size / 2
+
+    # Strokes lie inside their outer radius, as ImageDraw outlines do
+    width = max(2, size * 0.004)
+    sdf.paint(canvas, sdf.ring(center, center, center - size * 0.12 - width / 2, width), gold)
+
+    width = max(1, size * 0.002)
+    sdf.paint(canvas, sdf.ring(center, center, center - size * 0.15 - width / 2, width), white, alpha=180)
+    return canvas
+
+
+def premium_cent(canvas, size, gold, white):
+    """Gold cent sign with a white inner stroke"""
+    center = size / 2
+    cent_radius = size * 0.18
+    thickness = max(3, size * 0.025)
+
+    # The white stroke sits inside the gold one, 2px in from its outside
+    outer = cent_radius - thickness / 2
+    sdf.paint(canvas, sdf.arc(center, center, outer, thickness, 25, 335), gold)
+    sdf.paint(canvas, sdf.arc(center, center, outer - 1, thickness - 2, 25, 335), white)
+
+    half = size * 0.22
+    sdf.paint(canvas, sdf.line(center, center - half, center, center + half, thickness), gold)
+    sdf.paint(canvas, sdf.line(center, center - half + 2, center, center + half - 2, thickness - 2), white)
+    return canvas
+
+
+def premium_corner_accents(canvas, size, first, second):
+    """L-shaped accents in the four corners, alternating colors"""
+    draw = ImageDraw.Draw(canvas)
+    corner_size = int(size * 0.08)
+    corner_thickness = max(2, int(size * 0.008))
+    corner_offset = int(size * 0.15)
+
+    accent_positions = [
+        (corner_offset, corner_offset),
+        (size - corner_offset - corner_size, corner_offset),
+        (corner_offset, size - corner_offset - corner_size),
+        (size - corner_offset - corner_size, size - corner_offset - corner_size),
+    ]
+    for i, (x, y) in enumerate(accent_positions):
+        accent_color = first if i % 2 == 0 else second
+        draw.rectangle([x, y, x + corner_size, y + corner_thickness], fill=accent_color)
+        draw.rectangle([x, y, x + corner_thickness, y + corner_size], fill=accent_color)
+    return canvas
+
+
+def premium_constellation(canvas, size, first, second, min_size=64, glow_min_size=128):
+    """Ring of eight dots, alternating colors, with a glow on larger sizes"""
+    if size < min_size:
+        return canvas
+    center = size / 2
+    dot_radius = max(2, size * 0.012)
+    orbit_radius = size * 0.38
+
+    for i, angle in enumerate([0, 45, 90, 135, 180, 225, 270, 315]):
+        x = center + math.cos(math.radians(angle)) * orbit_radius
+        y = center + math.sin(math.radians(angle)) * orbit_radius
+        dot_color = first if i % 2 == 0 else second
+
+        dot = sdf.disc(x, y, dot_radius)
+        if size >= glow_min_size:
+            sdf.paint(canvas, dot, dot_color, alpha=50, glow=max(2, dot_radius * 0.5))
+        sdf.paint(canvas, dot, dot_color)
+    return canvas
+
+
+PREMIUM_COLORS = {
+    'bg_start': (15, 23, 42),               # slate-900 #0f172a
+    'bg_end': (30, 58, 138),                # blue-800 #1e3a8a
+    'coin_gradient_start': (6, 182, 212),   # cyan-500 #06b6d4
+    'coin_gradient_end': (14, 116, 144),    # cyan-700 #0e7490
+    'premium_gold': (251, 191, 36),         # amber-400 #fbbf24
+    'pure_white': (255, 255, 255),
+    'soft_white': (248, 250, 252),          # slate-50 #f8fafc
+    'accent_purple': (139, 92, 246),        # violet-500 #8b5cf6
+    'accent_emerald': (16, 185, 129),       # emerald-500 #10b981
+}
+
+
+def premium_scene(colors=PREMIUM_COLORS):
+    c = colors
+    return Scene('premium', [
+        Layer('background', gradient_background, start=c['bg_start'], end=c['bg_end'], style='radial'),
+        Layer('outer_glow', premium_outer_glow, color=c['coin_gradient_start']),
+        Layer('coin', premium_coin, start=c['coin_gradient_start'], end=c['coin_gradient_end'],
+              highlight=c['soft_white']),
+        Layer('rings', premium_rings, gold=c['premium_gold'], white=c['pure_white']),
+        Layer('cent', premium_cent, gold=c['premium_gold'], white=c['pure_white']),
+        Layer('corner_accents', premium_corner_accents, first=c['accent_emerald'], second=c['accent_purple']),
+        Layer('constellation', premium_constellation, first=c['premium_gold'], second=c['pure_white']),
+        Layer('vignette', vignette, inner_radius=0.7, strength=0.15),
+    ])
+
+
+# Modern tech
+
+def modern_border(canvas, size, outer, inner):
+    """White outer ring with a hairline inside it"""
+    draw = ImageDraw.Draw(canvas)
+    border_width = max(3, int(size * 0.015))
+    margin = int(size * 0.05)
+    draw.ellipse([
+        margin, margin,
+        size - margin, size - margin
+    ], outline=outer, width=border_width)
+
+    inner_margin = margin + border_width + 2
+    draw.ellipse([
+        inner_margin, inner_margin,
+        size - inner_margin, size - inner_margin
+    ], fill=None, outline=inner, width=1)
+    return canvas
+
+
+def modern_dollar(canvas, size, color):
+    """Dollar sign from two arcs and a vertical stroke"""
+    draw = ImageDraw.Draw(canvas)
+    center_x, center_y = size // 2, size // 2
+    dollar_width = int(size * 0.35)
+    dollar_height = int(size * 0.45)
+    dollar_thickness = max(4, int(size * 0.035))
+
+    draw.arc([
+        center_x - dollar_width//2, center_y - dollar_height//2,
+        center_x + dollar_width//2, center_y
+    ], start=180, end=0, fill=color, width=dollar_thickness)
+    draw.arc([
+        center_x - dollar_width//2, center_y,
+        center_x + dollar_width//2, center_y + dollar_height//2
+    ], start=180, end=0, fill=color, width=dollar_thickness)
+
+    line_start_y = center_y - int(dollar_height * 0.65)
+    line_end_y = center_y + int(dollar_height * 0.65)
+    draw.line([
+        (center_x, line_start_y), (center_x, line_end_y)
+    ], fill=color, width=dollar_thickness)
+    return canvas
+
+
+def modern_circuit(canvas, size, color):
+    """Circuit nodes with spokes toward the center"""
+    draw = ImageDraw.Draw(canvas)
+    center_x, center_y = size // 2, size // 2
+    circuit_radius = int(size * 0.38)
+
+    for angle in [30, 60, 120, 150, 210, 240, 300, 330]:
+        x = center_x + int(math.cos(math.radians(angle)) * circuit_radius)
+        y = center_y + int(math.sin(math.radians(angle)) * circuit_radius)
+
+        node_radius = max(2, int(size * 0.015))
+        draw.ellipse([
+            x - node_radius, y - node_radius,
+            x + node_radius, y + node_radius
+        ], fill=color)
+
+        inner_x = center_x + int(math.cos(math.radians(angle)) * circuit_radius * 0.7)
+        inner_y = center_y + int(math.sin(math.radians(angle)) * circuit_radius * 0.7)
+        line_width = max(1, int(size * 0.004))
+        draw.line([(x, y), (inner_x, inner_y)], fill=color, width=line_width)
+    return canvas
+
+
+def modern_dashes(canvas, size, color, count=24):
+    """Dashed ring near the edge"""
+    draw = ImageDraw.Draw(canvas)
+    center_x, center_y = size // 2, size // 2
+    dash_radius = int(size * 0.42)
+    dash_width = max(1, int(size * 0.006))
+
+    for i in range(count):
+        angle = (360 / count) * i
+        start_x = center_x + int(math.cos(math.radians(angle)) * dash_radius)
+        start_y = center_y + int(math.sin(math.radians(angle)) * dash_radius)
+
+        end_angle = angle + (360 / count) * 0.6  # 60% of segment
+        end_x = center_x + int(math.cos(math.radians(end_angle)) * dash_radius)
+        end_y = center_y + int(math.sin(math.radians(end_angle)) * dash_radius)
+
+        draw.line([(start_x, start_y), (end_x, end_y)], fill=color, width=dash_width)
+    return canvas
+
+
+def modern_tech_lines(canvas, size, color):
+    """Four short lines ending in dots on the right"""
+    draw = ImageDraw.Draw(canvas)
+    center_x, center_y = size // 2, size // 2
+    tech_x = center_x + int(size * 0.25)
+    tech_y = center_y
+    line_length = int(size * 0.08)
+    line_spacing = int(size * 0.02)
+
+    for i in range(4):
+        y_pos = tech_y - (2 * line_spacing) + (i * line_spacing)
+        draw.line([
+            (tech_x, y_pos), (tech_x + line_length, y_pos)
+        ], fill=color, width=max(1, int(size * 0.003)))
+
+        circle_radius = max(1, int(size * 0.008))
+        draw.ellipse([
+            tech_x + line_length - circle_radius, y_pos - circle_radius,
+            tech_x + line_length + circle_radius, y_pos + circle_radius
+        ], fill=color)
+    return canvas
+
+
+MODERN_COLORS = {
+    'bg_start': (56, 178, 172),    # teal-500 #38b2ac
+    'bg_end': (49, 130, 206),      # blue-500 #3182ce
+    'pure_white': (255, 255, 255),
+    'soft_white': (248, 250, 252),
+    'tech_blue': (99, 179, 237),   # light blue
+    'tech_green': (72, 187, 120),  # green-400
+}
+
+
+def modern_scene(colors=MODERN_COLORS):
+    c = colors
+    return Scene('modern', [
+        Layer('background', gradient_background, start=c['bg_start'], end=c['bg_end'], style='radial'),
+        Layer('border', modern_border, outer=c['pure_white'], inner=c['soft_white']),
+        Layer('dollar', modern_dollar, color=c['pure_white']),
+        Layer('circuit', modern_circuit, color=c['pure_white']),
+        Layer('dashes', modern_dashes, color=c['pure_white']),
+        Layer('tech_lines', modern_tech_lines, color=c['pure_white']),
+    ])
+
+
+# Basic (and its Windows variant)
+
+def basic_discs(canvas, size, outer, coin, outline, min_outline=0):
+    """Background disc and the coin on top of it"""
+    draw = ImageDraw.Draw(canvas)
+    margin = int(size * 0.05)
+    draw.ellipse([margin, margin, size-margin, size-margin], fill=outer, outline=None)
+
+    coin_margin = int(size * 0.2)
+    draw.ellipse([coin_margin, coin_margin, size-coin_margin, size-coin_margin],
+                 fill=coin, outline=outline, width=max(min_outline, int(size*0.01)))
+    return canvas
+
+
+def basic_cent(canvas, size, color, min_thickness=0):
+    """Open cent arc with a vertical stroke"""
+    draw = ImageDraw.Draw(canvas)
+    center_x, center_y = size // 2, size // 2
+    cent_thickness = max(min_thickness, int(size * 0.02))
+    cent_radius = int(size * 0.15)
+
+    bbox = [center_x - cent_radius, center_y - cent_radius,
+            center_x + cent_radius, center_y + cent_radius]
+    draw.arc(bbox, start=30, end=330, fill=color, width=cent_thickness)
+
+    line_start_y = center_y - int(size * 0.2)
+    line_end_y = center_y + int(size * 0.2)
+    draw.line([(center_x, line_start_y), (center_x, line_end_y)], fill=color, width=cent_thickness)
+    return canvas
+
+
+def basic_dots(canvas, size, color, min_size=0, min_radius=0):
+    """Eight small dots around the coin"""
+    if size < min_size:
+        return canvas
+    draw = ImageDraw.Draw(canvas)
+    center_x, center_y = size // 2, size // 2
+    dot_radius = max(min_radius, int(size * 0.01))
+    for angle in range(0, 360, 45):
+        x = center_x + int(math.cos(math.radians(angle)) * size * 0.35)
+        y = center_y + int(math.sin(math.radians(angle)) * size * 0.35)
+        draw.ellipse([x-dot_radius, y-dot_radius, x+dot_radius, y+dot_radius], fill=color)
+    return canvas
+
+
+BASIC_COLORS = {
+    'blue_dark': (30, 60, 114),     # #1e3c72
+    'blue_light': (59, 130, 246),   # #3b82f6
+    'green': (16, 185, 129),        # #10b981
+    'white': (255, 255, 255),
+}
+
+
+def basic_scene(colors=BASIC_COLORS):
+    c = colors
+    return Scene('basic', [
+        Layer('background', gradient_background, start=c['blue_dark'], end=c['blue_light']),
+        Layer('discs', basic_discs, outer=c['blue_light'], coin=c['green'], outline=c['white']),
+        Layer('cent', basic_cent, color=c['white']),
+        Layer('dots', basic_dots, color=c['white']),
+    ])
+
+
+def windows_scene(colors=BASIC_COLORS):
+    """The basic design with minimum stroke widths for tiny ICO frames"""
+    return (basic_scene(colors)
+            .with_params('discs', min_outline=1)
+            .with_params('cent', min_thickness=2)
+            .with_params('dots', min_size=32, min_radius=1))
+
+
+# Simple
+
+def simple_coin(canvas, size, start, end):
+    """Coin filled with concentric discs stepping from start to end color"""
+    draw = ImageDraw.Draw(canvas)
+    center = size // 2
+    coin_radius = int(size * 0.35)
+    for i in range(coin_radius, 0, -2):
+        ratio = (coin_radius - i) / coin_radius
+        r = int(start[0] * (1 - ratio) + end[0] * ratio)
+        g = int(start[1] * (1 - ratio) + end[1] * ratio)
+        b = int(start[2] * (1 - ratio) + end[2] * ratio)
+        draw.ellipse([center - i, center - i, center + i, center + i], fill=(r, g, b))
+    return canvas
+
+
+def simple_borders(canvas, size, color):
+    """Coin border and a thinner inner border"""
+    draw = ImageDraw.Draw(canvas)
+    center = size // 2
+    coin_radius = int(size * 0.35)
+    border_width = max(2, size // 100)
+    draw.ellipse([
+        center - coin_radius, center - coin_radius,
+        center + coin_radius, center + coin_radius
+    ], outline=color, width=border_width)
+
+    inner_radius = coin_radius - 10
+    draw.ellipse([
+        center - inner_radius, center - inner_radius,
+        center + inner_radius, center + inner_radius
+    ], outline=color, width=border_width//2)
+    return canvas
+
+
+def simple_brain(canvas, size, color, accent):
+    """Small 'smart' brain mark above the cent"""
+    draw = ImageDraw.Draw(canvas)
+    center = size // 2
+    coin_radius = int(size * 0.35)
+    brain_y = center - coin_radius // 2
+    brain_size = coin_radius // 3
+
+    draw.ellipse([
+        center - brain_size//2, brain_y - brain_size//3,
+        center + brain_size//2, brain_y + brain_size//3
+    ], fill=color)
+
+    line_width = max(1, size // 200)
+    draw.line([center - brain_size//3, brain_y, center + brain_size//3, brain_y], fill=accent, width=line_width)
+    draw.line([center - brain_size//4, brain_y + 5, center + brain_size//4, brain_y + 5], fill=accent, width=line_width)
+
+    dot_radius = max(2, size // 150)
+    draw.ellipse([
+        center - dot_radius, brain_y - dot_radius,
+        center + dot_radius, brain_y + dot_radius
+    ], fill=accent)
+    return canvas
+
+
+def simple_cent(canvas, size, color, font="arial.ttf"):
+    """Cent glyph from a font, or drawn from strokes when the font is missing"""
+    draw = ImageDraw.Draw(canvas)
+    center = size // 2
+    coin_radius = int(size * 0.35)
+    cent_y = center + coin_radius // 6
+
+    try:
+        font_size = max(24, size // 8)
+        draw.text((center, cent_y), "¢", font=ImageFont.truetype(font, font_size), fill=color, anchor="mm")
+    except (OSError, ImportError):
+        cent_radius = coin_radius // 3
+
+        # C shape approximated with a polyline over 270 degrees
+        points = []
+        for angle in range(45, 315, 10):
+            x = center + (cent_radius * 0.8) * math.cos(math.radians(angle))
+            y = cent_y + (cent_radius * 0.8) * math.sin(math.radians(angle))
+            points.append((x, y))
+        for i in range(len(points) - 1):
+            draw.line([points[i], points[i+1]], fill=color, width=max(3, size//60))
+
+        line_height = cent_radius * 1.5
+        draw.line([
+            center + cent_radius//4, cent_y - line_height//2,
+            center + cent_radius//4, cent_y + line_height//2
+        ], fill=color, width=max(2, size//80))
+    return canvas
+
+
+def simple_dots(canvas, size, color):
+    """Eight dots just outside the coin"""
+    draw = ImageDraw.Draw(canvas)
+    center = size // 2
+    dot_distance = int(size * 0.35) + 20
+    dot_radius = max(2, size // 150)
+    for angle in range(0, 360, 45):
+        x = center + dot_distance * math.cos(math.radians(angle))
+        y = center + dot_distance * math.sin(math.radians(angle))
+        draw.ellipse([x - dot_radius, y - dot_radius, x + dot_radius, y + dot_radius], fill=color)
+    return canvas
+
+
+def simple_corner_accents(canvas, size, color):
+    """L-shaped accents in the four corners"""
+    draw = ImageDraw.Draw(canvas)
+    accent_size = size // 20
+    accent_thickness = max(2, size // 100)
+    corners = [
+        (accent_size, accent_size),
+        (size - accent_size * 2, accent_size),
+        (accent_size, size - accent_size * 2),
+        (size - accent_size * 2, size - accent_size * 2)
+    ]
+    for x, y in corners:
+        draw.rectangle([x, y, x + accent_size, y + accent_thickness], fill=color)
+        draw.rectangle([x, y, x + accent_thickness, y + accent_size], fill=color)
+    return canvas
+
+
+SIMPLE_COLORS = {
+    'bg_color1': (30, 60, 114),     # Deep blue
+    'bg_color2': (59, 130, 246),    # Bright blue
+    'coin_color1': (16, 185, 129),  # Green
+    'coin_color2': (5, 150, 105),   # Dark green
+    'white': (255, 255, 255),
+}
+
+
+def simple_scene(colors=SIMPLE_COLORS):
+    c = colors
+    return Scene('simple', [
+        Layer('background', gradient_background, start=c['bg_color1'], end=c['bg_color2'], mode='RGB'),
+        Layer('coin', simple_coin, start=c['coin_color1'], end=c['coin_color2']),
+        Layer('borders', simple_borders, color=c['white']),
+        Layer('brain', simple_brain, color=c['white'], accent=c['coin_color1']),
+        Layer('cent', simple_cent, color=c['white']),
+        Layer('dots', simple_dots, color=c['white']),
+        Layer('corner_accents', simple_corner_accents, color=c['coin_color1']),
+    ])
+
+
+PREMIUM = premium_scene()
+MODERN = modern_scene()
+BASIC = basic_scene()
+WINDOWS = windows_scene()
+SIMPLE = simple_scene()
+
+# Scenes by name, for the command line
+SCENES = {
+    'premium': PREMIUM,
+    'modern': MODERN,
+    'basic': BASIC,
+    'windows': WINDOWS,
+    'simple': SIMPLE,
+}
+
+# Scene builder and default colors of each design, for palette variants
+PALETTES = {
+    'premium': (premium_scene, PREMIUM_COLORS),
+    'modern': (modern_scene, MODERN_COLORS),
+    'basic': (basic_scene, BASIC_COLORS),
+    'windows': (windows_scene, BASIC_COLORS),
+    'simple': (simple_scene, SIMPLE_COLORS),
+}
+
+
+def palette_scene(design, **colors):
+    """The design with some of its named colors replaced"""
+    builder, defaults = PALETTES[design]
+    unknown = sorted(set(colors) - set(defaults))
+    if unknown:
+        raise ValueError(f"The {design} design has no color {', '.join(unknown)} "
+                         f"(its colors: {', '.join(defaults)})")
+    return builder(dict(defaults, **colors))
@@ -0,0 +1,179 @@
+"""
+Export Executor for SmartCent Icons
+Spreads per-size resize, encode and write jobs across a process pool
+
+The pyramid levels the jobs resize from are published to the pool once
+through shared memory, so a job's IPC cost does not grow with the source.
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+
+from PIL import Image
+
+from smartcent_icons.cache import make_key
+from smartcent_icons.ico import encode_ico
+from smartcent_icons.instrument import stage
+from smartcent_icons.pyramid import ResolutionPyramid
+from smartcent_icons.shared import SharedImages
+from smartcent_icons.sink import OutputSink, SinkError, encode_image
+
+ExportJob = namedtuple('ExportJob', ['filename', 'size', 'format', 'options'])
+ExportJob.__new__.__defaults__ = ('PNG', None)
+
+ExportResult = namedtuple('ExportResult', ['filename', 'size', 'ok', 'error', 'bytes_written', 'cached'])
+ExportResult.__new__.__defaults__ = (False,)
+
+
+def default_workers():
+    """Worker count from SMARTCENT_JOBS, falling back to the CPU count"""
+    try:
+        return max(1, int(os.environ['SMARTCENT_JOBS']))
+    except (KeyError, ValueError):
+        return os.cpu_count() or 1
+
+
+def job_key(base_key, job):
+    """Build-cache key of one export job: its inputs plus size and encoder settings"""
+    return make_key(base_key, job.size, job.format, job.options)
+
+
+def _run_job(job, level=None, render=None, optimizer=None):
+    """Produce and encode one output in memory (runs inside a worker)
+
+    Returns (ExportResult, encoded bytes or None, OptimizeResult or None);
+    the caller writes the bytes.
+    """
+    try:
+        with stage('export', file=job.filename, size=job.size) as exported:
+            if render is not None:
+                with stage('render', size=job.size):
+                    image = render(job.size)
+            elif job.format == 'ICO' or level.size == (job.size, job.size):
+                image = level
+            else:
+                with stage('resize', size=job.size):
+                    image = level.resize((job.size, job.size), Image.Resampling.LANCZOS)
+
+            with stage('encode', file=job.filename):
+                if job.format == 'ICO':
+                    # Write the frames cut from this image rather than letting the
+                    # encoder resample every size again
+                    sizes = (job.options or {}).get('sizes') or [job.size]
+                    data = encode_ico(image, sizes)
+                else:
+                    data = encode_image(image, job.format, **(job.options or {}))
+
+            optimized = None
+            if optimizer is not None and job.format == 'PNG':
+                data, optimized = optimizer.optimize_data(job.filename, data)
+            exported.add_bytes(len(data))
+        return ExportResult(job.filename, job.size, True, None, len(data)), data, optimized
+    except Exception as e:
+        return ExportResult(job.filename, job.size, False, str(e), 0), None, None
+
+
+def export_sizes(jobs, source=None, render=None, workers=None, cache=None, base_key=None, optimizer=None):
+    """Run export jobs and return one ExportResult per job, in job order
+
+    Pass either a source image (or ResolutionPyramid) to downsample from,
+    or a render(size) callable that draws each size from scratch. render
+    must be a module-level function so it can be sent to the workers.
+    A failing job is reported in its result and never stops the others.
+
+    With a BuildCache and a base_key describing the inputs, jobs whose
+    output is still fresh are skipped and reported with cached=True.
+
+    An optimizer (PngOptimizer) recompresses each PNG in memory before it
+    is written. Outputs are written through an OutputSink: all of them are
+    renamed into place together once every job has finished, and files
+    whose bytes did not change are left untouched.
+    """
+    if (source is None) == (render is None):
+        raise ValueError("Pass exactly one of source or render")
+
+    jobs = list(jobs)
+    if optimizer is not None and base_key is not None:
+        base_key = make_key(base_key, optimizer.key())
+    if cache is None:
+        return _export_all(jobs, source, render, workers, optimizer)
+
+    keys = [job_key(base_key, job) for job in jobs]
+    fresh = [cache.is_fresh(job.filename, key) for job, key in zip(jobs, keys)]
+    built = iter(_export_all([job for job, ok in zip(jobs, fresh) if not ok], source, render, workers, optimizer))
+
+    results = []
+    for job, key, is_fresh in zip(jobs, keys, fresh):
+        if is_fresh:
+            result = ExportResult(job.filename, job.size, True, None, os.path.getsize(job.filename), True)
+        else:
+            result = next(built)
+            if result.ok:
+                cache.record(job.filename, key)
+        results.append(result)
+    return results
+
+
+def _export_all(jobs, source, render, workers, optimizer=None):
+    """Export every job, on a process pool when there is more than one
+    worker, and write the outputs as one batch"""
+    if not jobs:
+        return []
+    if source is not None and not isinstance(source, ResolutionPyramid):
+        with stage('pyramid'):
+            source = ResolutionPyramid(source)
+
+    def job_args(job, shared=None):
+        if render is not None:
+            return (job, None, render, optimizer)
+        # Only ship the nearest pyramid level, not the full master; to a
+        # pool, only a reference to it in shared memory
+        level = source.level_for(job.size)
+        return (job, shared[id(level)] if shared else level, None, optimizer)
+
+    workers = default_workers() if workers is None else workers
+    results = []
+    with OutputSink() as sink:
+        # Each output is queued for writing as soon as it is encoded, so
+        # the writes overlap with the jobs still running
+        def collect(job, result, data, optimized):
+            if data is not None:
+                sink.write(job.filename, data)
+            if optimized is not None:
+                optimizer.results.append(optimized)
+            results.append(result)
+
+        if workers <= 1 or len(jobs) <= 1:
+            for job in jobs:
+                collect(job, *_run_job(*job_args(job)))
+        else:
+            with ExitStack() as resources:
+                shared = None
+                if source is not None:
+                    # Publish each level the jobs read once, however many
+                    # jobs and workers read it
+                    levels = {}
+                    for job in jobs:
+                        level = source.level_for(job.size)
+                        levels[id(level)] = level
+                    with stage('share', levels=len(levels)):
+                        published = resources.enter_context(SharedImages(levels.values()))
+                    shared = dict(zip(levels, published.handles))
+                executor = resources.enter_context(ProcessPoolExecutor(max_workers=min(workers, len(jobs))))
+                futures = [executor.submit(_run_job, *job_args(job, shared)) for job in jobs]
+                for job, future in zip(jobs, futures):
+                    try:
+                        collect(job, *future.result())
+                    except Exception as e:
+                        collect(job, ExportResult(job.filename, job.size, False, str(e), 0), None, None)
+        try:
+            sink.commit()
+        except SinkError as e:
+            # Nothing of the batch was written
+            results = [result._replace(ok=False, bytes_written=0,
+                                       error=e.errors.get(result.filename, f"batch not written: {e}"))
+                       if result.ok else result
+                       for result in results]
+    return results
@@ -0,0 +1,78 @@
+"""
+Gradient Engine for SmartCent Icons
+Builds linear, radial and conic gradients as whole NumPy arrays
+
+The blend uses the same float64 arithmetic and integer truncation as the
+old per-pixel loops, so linear and radial output is pixel-identical to
+the putpixel versions it replaces.
+"""
+
+import math
+
+import numpy as np
+from PIL import Image
+
+
+def _blend(ratio, start_color, end_color):
+    """Blend two RGB colors over a ratio array into an opaque RGBA image"""
+    ratio = ratio[..., np.newaxis]
+    start = np.asarray(start_color[:3], dtype=np.float64)
+    end = np.asarray(end_color[:3], dtype=np.float64)
+
+    # Same expression as the scalar loops: start * (1 - t) + end * t
+    rgb = start * (1 - ratio) + end * ratio
+
+    pixels = np.empty(ratio.shape[:-1] + (4,), dtype=np.uint8)
+    pixels[..., :3] = rgb.astype(np.uint8)
+    pixels[..., 3] = 255
+    return pixels
+
+
+def linear_gradient(size, start_color, end_color):
+    """Create a top-to-bottom linear gradient"""
+    ratio = np.arange(size, dtype=np.float64) / size
+    rows = _blend(ratio, start_color, end_color)
+    pixels = np.ascontiguousarray(np.broadcast_to(rows[:, np.newaxis, :], (size, size, 4)))
+    return Image.fromarray(pixels, 'RGBA')
+
+
+def radial_gradient(size, start_color, end_color):
+    """Create a radial gradient from the center out to the corners"""
+    center = size // 2
+    max_distance = math.sqrt(2 * (center ** 2))
+
+    offsets = (np.arange(size, dtype=np.int64) - center) ** 2
+    distance = np.sqrt(np.add.outer(offsets, offsets).astype(np.float64))
+
+    if max_distance:
+        ratio = np.minimum(distance / max_distance, 1.0)
+    else:
+        ratio = np.zeros_like(distance)
+
+    return Image.fromarray(_blend(ratio, start_color, end_color), 'RGBA')
+
+
+def conic_gradient(size, start_color, end_color, start_angle=0):
+    """Create a conic (angular) gradient sweeping clockwise from start_angle degrees"""
+    center = size // 2
+    coords = np.arange(size, dtype=np.float64) - center
+    angle = np.arctan2(coords[:, np.newaxis], coords[np.newaxis, :])
+    ratio = np.mod(angle - math.radians(start_angle), 2 * math.pi) / (2 * math.pi)
+
+    return Image.fromarray(_blend(ratio, start_color, end_color), 'RGBA')
+
+
+GRADIENTS = {
+    'linear': linear_gradient,
+    'radial': radial_gradient,
+    'conic': conic_gradient,
+}
+
+
+def create_gradient(size, start_color, end_color, style="linear"):
+    """Create a gradient image of the given style"""
+    try:
+        builder = GRADIENTS[style]
+    except KeyError:
+        raise ValueError(f"Unknown gradient style: {style}")
+    return builder(size, start_color, end_color)
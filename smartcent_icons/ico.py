@@ -0,0 +1,156 @@
+"""
+ICO / CUR Writer for SmartCent Icons
+Writes already-prepared per-size frames straight into a multi-resolution
+icon file, so no frame is resampled a second time by the encoder
+"""
+
+import io
+import struct
+
+import numpy as np
+from PIL import Image
+
+from smartcent_icons.instrument import stage
+from smartcent_icons.pyramid import ResolutionPyramid
+from smartcent_icons.sink import write_atomic
+
+ICO = 1
+CUR = 2
+
+# Frames at least this large are stored PNG-compressed, smaller ones as BMP
+PNG_MIN_SIZE = 256
+
+_PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _png_entry(frame):
+    """PNG-compressed entry data"""
+    buffer = io.BytesIO()
+    frame.save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def _bmp_entry(frame):
+    """32-bit BGRA DIB entry data with its 1-bit AND mask"""
+    width, height = frame.size
+
+    # BITMAPINFOHEADER; the height covers both the colour and AND mask rows
+    header = struct.pack('<IiiHHIIiiII', 40, width, height * 2, 1, 32, 0, 0, 0, 0, 0, 0)
+
+    # Rows are stored bottom-up
+    pixels = frame.tobytes('raw', 'BGRA', 0, -1)
+
+    # AND mask: fully transparent pixels set, rows padded to 32 bits
+    alpha = np.asarray(frame.getchannel('A'))[::-1]
+    mask = np.packbits(alpha == 0, axis=1)
+    stride = ((width + 31) // 32) * 4
+    mask = np.pad(mask, ((0, 0), (0, stride - mask.shape[1])))
+
+    return header + pixels + mask.tobytes()
+
+
+def ico_bytes(frames, kind=ICO, hotspots=None, png_min_size=PNG_MIN_SIZE):
+    """Encode RGBA frames as an ICO (or CUR) file, in the given order
+
+    Frames are used exactly as passed in; nothing is resized. Edge
+    lengths must be 1-256. For cursors, hotspots gives one (x, y) per
+    frame and defaults to the top-left corner.
+    """
+    frames = [frame if frame.mode == 'RGBA' else frame.convert('RGBA') for frame in frames]
+    if not frames:
+        raise ValueError("An icon needs at least one frame")
+    for frame in frames:
+        if not 1 <= frame.width <= 256 or not 1 <= frame.height <= 256:
+            raise ValueError(f"Icon frames must be 1-256 px, got {frame.width}x{frame.height}")
+    if hotspots is None:
+        hotspots = [(0, 0)] * len(frames)
+
+    entries = []
+    for frame in frames:
+        if max(frame.size) >= png_min_size:
+            entries.append(_png_entry(frame))
+        else:
+            entries.append(_bmp_entry(frame))
+
+    directory = struct.pack('<HHH', 0, kind, len(frames))
+    offset = 6 + 16 * len(frames)
+    for frame, data, hotspot in zip(frames, entries, hotspots):
+        # Width and height are stored as a byte; 0 means 256
+        if kind == CUR:
+            planes, bit_count = hotspot
+        else:
+            planes, bit_count = 1, 32
+        directory += struct.pack('<BBBBHHII', frame.width % 256, frame.height % 256, 0, 0,
+                                 planes, bit_count, len(data), offset)
+        offset += len(data)
+    return directory + b''.join(entries)
+
+
+def write_ico(path, frames, kind=ICO, hotspots=None, png_min_size=PNG_MIN_SIZE):
+    """Write frames (see ico_bytes) into an ICO (or CUR) file, replacing
+    it atomically and leaving it untouched when nothing changed"""
+    with stage('encode', file=path):
+        data = ico_bytes(frames, kind, hotspots, png_min_size)
+    write_atomic(path, data)
+    return path
+
+
+def _ico_entries(data, name):
+    reserved, kind, count = struct.unpack_from('<HHH', data, 0)
+    if reserved != 0 or kind not in (ICO, CUR):
+        raise ValueError(f"{name} is not an ICO or CUR file")
+
+    entries = []
+    for i in range(count):
+        width, height, _, _, _, _, size, offset = struct.unpack_from('<BBBBHHII', data, 6 + 16 * i)
+        encoding = 'PNG' if data[offset:offset + 8] == _PNG_SIGNATURE else 'BMP'
+        entries.append((width or 256, height or 256, encoding))
+    return entries
+
+
+def read_ico_entries(path):
+    """Directory of an ICO/CUR file as (width, height, 'PNG' or 'BMP') tuples, in file order"""
+    with open(path, 'rb') as f:
+        return _ico_entries(f.read(), path)
+
+
+def verify_ico_data(data, sizes, name='icon'):
+    """Check that encoded icon bytes hold exactly the expected frame sizes,
+    in order, and that every frame decodes; raises ValueError otherwise"""
+    expected = [(s, s) if isinstance(s, int) else tuple(s) for s in sizes]
+    found = [(width, height) for width, height, _ in _ico_entries(data, name)]
+    if found != expected:
+        raise ValueError(f"{name} holds frames {found}, expected {expected}")
+
+    with Image.open(io.BytesIO(data)) as icon:
+        for size in expected:
+            if icon.ico.getimage(size).size != size:
+                raise ValueError(f"{name}: the {size[0]}x{size[1]} frame does not decode")
+
+
+def verify_ico(path, sizes):
+    """verify_ico_data() for an icon file"""
+    with open(path, 'rb') as f:
+        verify_ico_data(f.read(), sizes, path)
+
+
+def ico_frames(source, sizes):
+    """Per-size frames from an image or ResolutionPyramid, each read from
+    the nearest pyramid level"""
+    if not isinstance(source, ResolutionPyramid):
+        source = ResolutionPyramid(source)
+    return [source.resize(size) for size in sizes]
+
+
+def encode_ico(source, sizes, verify=True):
+    """ICO bytes with every size cut from one source"""
+    data = ico_bytes(ico_frames(source, sizes))
+    if verify:
+        verify_ico_data(data, sizes)
+    return data
+
+
+def save_ico(source, path, sizes, verify=True):
+    """Cut every size from one source and write them as a single ICO"""
+    write_atomic(path, encode_ico(source, sizes, verify))
+    return path
@@ -0,0 +1,107 @@
+"""
+Batched Inkscape Rasterization for SmartCent Icons
+Exports every PNG size of an SVG from a single Inkscape process
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+
+from smartcent_icons.rasterize import RasterResult, Rasterizer
+from smartcent_icons.sink import OutputSink, SinkError
+
+
+def inkscape_command():
+    """Inkscape executable, overridable through the INKSCAPE environment variable"""
+    return os.environ.get('INKSCAPE', 'inkscape')
+
+
+class InkscapeBatch(Rasterizer):
+    """Collects PNG exports of one SVG and runs them in one Inkscape invocation
+
+    Every distinct size is exported once through the --actions interface;
+    further destinations asking for the same size get the same bytes.
+    """
+
+    name = 'inkscape'
+
+    def __init__(self, svg_path, inkscape=None):
+        super().__init__(svg_path)
+        self.inkscape = inkscape or inkscape_command()
+
+    @classmethod
+    def available(cls):
+        return shutil.which(inkscape_command()) is not None
+
+    def _actions(self, exports):
+        """Build the action list exporting each (path, size) pair"""
+        actions = ['export-type:png']
+        for output_path, size in exports:
+            actions += [
+                f'export-filename:{output_path}',
+                f'export-width:{size}',
+                f'export-height:{size}',
+                'export-do',
+            ]
+        return ';'.join(actions)
+
+    def _export(self, exports):
+        """Run Inkscape once for all (path, size) pairs; returns an error or None"""
+        cmd = [self.inkscape, f'--actions={self._actions(exports)}', self.svg_path]
+        try:
+            subprocess.run(cmd, check=True, capture_output=True)
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
+            return str(e)
+        return None
+
+    def render(self, size):
+        from PIL import Image
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = os.path.join(tmp, 'render.png')
+            error = self._export([(output_path, size)])
+            if error is not None:
+                raise RuntimeError(error)
+            return Image.open(output_path).convert('RGBA')
+
+    def run(self, optimizer=None):
+        """Run the batch and return one RasterResult per queued target, in order
+
+        Inkscape exports into a scratch directory; the files are then
+        optimized (with an optimizer) and written to every destination as
+        one batch (see OutputSink).
+        """
+        by_size = self._grouped_targets()
+        if not by_size:
+            return []
+
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp, OutputSink() as sink:
+            exports = [(os.path.join(tmp, f'{size}.png'), size) for size in by_size]
+            error = self._export(exports)
+            for (export_path, size), paths in zip(exports, by_size.values()):
+                failure = error
+                if failure is None:
+                    try:
+                        with open(export_path, 'rb') as f:
+                            data = f.read()
+                    except OSError:
+                        failure = 'Inkscape did not write the file'
+                if failure is None:
+                    if optimizer is not None:
+                        data, optimized = optimizer.optimize_data(paths[0], data)
+                        optimizer.results.append(optimized)
+                    for path in paths:
+                        sink.write(path, data)
+                for path in paths:
+                    results[(path, size)] = RasterResult(path, size, failure is None, failure)
+            try:
+                sink.commit()
+            except SinkError as e:
+                results = {target: result._replace(ok=False, error=e.errors.get(result.output_path,
+                                                                                 f"batch not written: {e}"))
+                           if result.ok else result
+                           for target, result in results.items()}
+
+        return [results[target] for target in self.targets]
@@ -0,0 +1,331 @@
+"""
+Stage Instrumentation for SmartCent Icons
+Records wall time, CPU time, bytes written and (optionally) tracemalloc
+peaks of each pipeline stage and output file
+
+Set SMARTCENT_TRACE to a report path to switch it on:
+
+    SMARTCENT_TRACE=build.json        summary plus every event
+    SMARTCENT_TRACE=build.csv         one row per event
+    SMARTCENT_TRACE=build.trace.json  Chrome trace (chrome://tracing, Perfetto)
+
+SMARTCENT_TRACE_MEMORY=1 also records tracemalloc peaks, which slows
+Python allocations down noticeably. Export workers inherit the setting
+and append their events to the same log, so per-file stages run on the
+process pool show up too. The report is written when the process that
+enabled tracing exits.
+
+When tracing is off, stage() hands back one shared no-op context manager
+and @timed functions cost a single attribute check.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+
+TRACE_ENV = 'SMARTCENT_TRACE'
+MEMORY_ENV = 'SMARTCENT_TRACE_MEMORY'
+
+# Event log shared with worker processes (set by the process that owns the report)
+_EVENTS_ENV = 'SMARTCENT_TRACE_EVENTS'
+
+
+class _NullStage:
+    """Stand-in for a stage while tracing is off"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def add_bytes(self, nbytes):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.report_path = None
+        self.events_path = None
+        self.owner = None
+        self.local = threading.local()
+        self._fd = None
+        self._lock = threading.Lock()
+
+    def configure(self, report_path, events_path, owner, memory):
+        self.report_path = report_path
+        self.events_path = events_path
+        # Forked workers inherit this object; only the enabling process owns the report
+        self.owner = os.getpid() if owner else None
+        self.memory = memory
+        if memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        self.enabled = True
+
+    def stack(self):
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def emit(self, event):
+        line = (json.dumps(event, separators=(',', ':'), default=str) + '\n').encode()
+        with self._lock:
+            if self._fd is None:
+                self._fd = os.open(self.events_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            # One O_APPEND write per event keeps lines from different
+            # processes whole
+            os.write(self._fd, line)
+
+
+_tracer = _Tracer()
+
+
+class _Stage:
+    """A running stage; use through stage()"""
+
+    __slots__ = ('name', 'args', 'bytes', '_start', '_cpu', '_mem_start', '_max_peak')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.bytes = 0
+
+    def add_bytes(self, nbytes):
+        """Count bytes written by this stage"""
+        self.bytes += nbytes
+
+    def __enter__(self):
+        if _tracer.memory:
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            stack = _tracer.stack()
+            if stack:
+                stack[-1]._max_peak = max(stack[-1]._max_peak, peak)
+            tracemalloc.reset_peak()
+            self._mem_start = self._max_peak = current
+        _tracer.stack().append(self)
+        self._cpu = time.process_time_ns()
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter_ns() - self._start
+        cpu = time.process_time_ns() - self._cpu
+        stack = _tracer.stack()
+        stack.pop()
+        event = {
+            'name': self.name,
+            'start_us': self._start // 1000,
+            'wall_us': wall // 1000,
+            'cpu_us': cpu // 1000,
+            'bytes': self.bytes,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'parent': stack[-1].name if stack else None,
+            'error': exc_type.__name__ if exc_type else None,
+        }
+        if _tracer.memory:
+            import tracemalloc
+            peak = max(self._max_peak, tracemalloc.get_traced_memory()[1])
+            event['peak_bytes'] = peak - self._mem_start
+            if stack:
+                stack[-1]._max_peak = max(stack[-1]._max_peak, peak)
+        if self.args:
+            event['args'] = self.args
+            filename = self.args.get('file')
+            if filename and any(outer.args and outer.args.get('file') == filename for outer in stack):
+                event['nested'] = True
+        _tracer.emit(event)
+        return False
+
+
+def enabled():
+    """Whether stages are being recorded in this process"""
+    return _tracer.enabled
+
+
+def stage(name, **args):
+    """Context manager timing one stage; args (e.g. file=, size=) are kept
+    with the event, and add_bytes() on the stage counts bytes written"""
+    if not _tracer.enabled:
+        return _NULL_STAGE
+    return _Stage(name, args)
+
+
+def timed(name=None):
+    """Decorator recording every call of a function as a stage
+
+    Use as @timed or @timed('stage name').
+    """
+    def decorate(func):
+        stage_name = name or func.__qualname__
+
+        def wrapper(*args, **kwargs):
+            if not _tracer.enabled:
+                return func(*args, **kwargs)
+            with _Stage(stage_name, None):
+                return func(*args, **kwargs)
+
+        wrapper.__name__ = func.__name__
+        wrapper.__qualname__ = func.__qualname__
+        wrapper.__doc__ = func.__doc__
+        wrapper.__module__ = func.__module__
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    if callable(name):
+        func, name = name, None
+        return decorate(func)
+    return decorate
+
+
+def enable(report_path, memory=None):
+    """Record stages in this process and the workers it starts from now on,
+    and write the report to report_path at exit"""
+    if _tracer.enabled and _tracer.owner == os.getpid():
+        _tracer.report_path = report_path
+        os.environ[TRACE_ENV] = report_path
+        return
+    events_path = f"{report_path}.events-{os.getpid()}"
+    os.environ[TRACE_ENV] = report_path
+    os.environ[_EVENTS_ENV] = events_path
+    if memory is not None:
+        os.environ[MEMORY_ENV] = '1' if memory else '0'
+    try:
+        os.remove(events_path)
+    except OSError:
+        pass
+    _tracer.configure(report_path, events_path, True, os.environ.get(MEMORY_ENV) == '1')
+    atexit.register(_finish)
+
+
+def _finish():
+    write_report()
+    try:
+        os.remove(_tracer.events_path)
+    except OSError:
+        pass
+
+
+def _read_events(path):
+    events = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    pass
+    except OSError:
+        pass
+    return events
+
+
+def _peak_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None, None
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+
+def summarize(events):
+    """Totals per stage name, and per output file with the slowest first"""
+    stages = {}
+    files = {}
+    for event in events:
+        total = stages.setdefault(event['name'], {'count': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'bytes': 0})
+        total['count'] += 1
+        total['wall_s'] += event['wall_us'] / 1e6
+        total['cpu_s'] += event['cpu_us'] / 1e6
+        total['bytes'] += event['bytes']
+        if 'peak_bytes' in event:
+            total['peak_bytes'] = max(total.get('peak_bytes', 0), event['peak_bytes'])
+
+        filename = (event.get('args') or {}).get('file')
+        if filename:
+            entry = files.setdefault(filename, {'wall_s': 0.0, 'cpu_s': 0.0, 'bytes': 0, 'stages': {}})
+            entry['stages'][event['name']] = entry['stages'].get(event['name'], 0.0) + event['wall_us'] / 1e6
+            # Stages nested in another stage of the same file are already
+            # part of its time; the last stage to write the file gives its size
+            if not event.get('nested'):
+                entry['wall_s'] += event['wall_us'] / 1e6
+                entry['cpu_s'] += event['cpu_us'] / 1e6
+                entry['bytes'] = event['bytes'] or entry['bytes']
+    for total in list(stages.values()) + list(files.values()):
+        for key in ('wall_s', 'cpu_s'):
+            total[key] = round(total[key], 6)
+    return stages, dict(sorted(files.items(), key=lambda item: item[1]['wall_s'], reverse=True))
+
+
+def _chrome_trace(events):
+    trace = []
+    for event in events:
+        args = dict(event.get('args') or {})
+        args.update({key: event[key] for key in ('cpu_us', 'bytes', 'peak_bytes', 'error') if event.get(key)})
+        trace.append({'name': event['name'], 'cat': 'smartcent', 'ph': 'X',
+                      'ts': event['start_us'], 'dur': event['wall_us'],
+                      'pid': event['pid'], 'tid': event['tid'], 'args': args})
+    return {'traceEvents': trace, 'displayTimeUnit': 'ms'}
+
+
+def _write_csv(path, events):
+    import csv
+    columns = ['name', 'file', 'size', 'parent', 'pid', 'tid', 'start_us', 'wall_us', 'cpu_us', 'bytes',
+               'peak_bytes', 'error']
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, columns, extrasaction='ignore')
+        writer.writeheader()
+        for event in events:
+            row = dict(event)
+            row.update({key: value for key, value in (event.get('args') or {}).items() if key in ('file', 'size')})
+            writer.writerow(row)
+
+
+def write_report(path=None):
+    """Write the report of everything recorded so far (all processes)
+
+    The format follows the file name: .csv, .trace.json (Chrome trace) or
+    any other name for the JSON summary.
+    """
+    if not (_tracer.enabled and _tracer.owner == os.getpid()):
+        return None
+    path = path or _tracer.report_path
+    events = sorted(_read_events(_tracer.events_path), key=lambda event: event['start_us'])
+
+    if path.endswith('.csv'):
+        _write_csv(path, events)
+    else:
+        if path.endswith(('.trace.json', '.trace')):
+            data = _chrome_trace(events)
+        else:
+            stages, files = summarize(events)
+            peak_self, peak_children = _peak_rss_kb()
+            data = {'version': 1, 'peak_rss_kb': peak_self, 'peak_rss_children_kb': peak_children,
+                    'stages': stages, 'files': files, 'events': events}
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=1)
+    return path
+
+
+# Workers (and scripts started by a traced process) join the owner's log;
+# a process started with only SMARTCENT_TRACE set owns its own report
+if os.environ.get(TRACE_ENV):
+    if os.environ.get(_EVENTS_ENV):
+        _tracer.configure(os.environ[TRACE_ENV], os.environ[_EVENTS_ENV], False,
+                          os.environ.get(MEMORY_ENV) == '1')
+    else:
+        enable(os.environ[TRACE_ENV])
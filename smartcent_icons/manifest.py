@@ -0,0 +1,166 @@
+"""
+Icon Target Manifest for SmartCent
+Reads the declarative target spec and exports each set in one pass
+
+Every output is declared once in targets.json (or a YAML file of the
+same shape). The planner groups targets that need identical pixels and
+encoding, such as the iOS 120px icon used both as 40x40@3x and 60x60@2x,
+so each group is rendered and encoded once and then copied to the rest.
+"""
+
+import json
+import os
+from collections import OrderedDict, namedtuple
+
+from smartcent_icons.cache import make_key
+from smartcent_icons.export import ExportJob, ExportResult, export_sizes, job_key
+from smartcent_icons.sink import copy_atomic
+
+SPEC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'targets.json')
+
+Target = namedtuple('Target', ['set', 'platform', 'path', 'size', 'format', 'sizes', 'options'])
+
+PlannedOutput = namedtuple('PlannedOutput', ['job', 'targets'])
+
+_FORMATS = {'png': 'PNG', 'ico': 'ICO'}
+
+
+def load_spec(path=None):
+    """Load the target spec from JSON, or YAML when PyYAML is installed"""
+    path = path or SPEC_PATH
+    with open(path) as f:
+        if path.endswith(('.yaml', '.yml')):
+            import yaml
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def load_targets(set_name, spec=None, **path_vars):
+    """Expand one target set into Target records
+
+    Paths may contain {placeholders}; they are filled from path_vars so
+    scripts sharing a set can keep their own file name prefixes.
+    """
+    spec = spec or load_spec()
+    try:
+        target_set = spec['sets'][set_name]
+    except KeyError:
+        raise ValueError(f"Unknown target set: {set_name}")
+
+    defaults = target_set.get('defaults', {})
+    targets = []
+    for entry in target_set['targets']:
+        merged = dict(defaults, **entry)
+        fmt = merged.get('format', 'png').lower()
+        if fmt not in _FORMATS:
+            raise ValueError(f"Unsupported format '{fmt}' for {merged['path']}")
+        targets.append(Target(
+            set=set_name,
+            platform=merged.get('platform'),
+            path=merged['path'].format(**path_vars),
+            size=merged['size'],
+            format=fmt,
+            sizes=tuple(merged.get('sizes') or ()),
+            options=merged.get('options') or {},
+        ))
+    return targets
+
+
+def _export_job(target):
+    """The export job that produces a target's pixels and encoding"""
+    if target.format == 'ico':
+        options = {'sizes': [(s, s) for s in target.sizes or (target.size,)]}
+        size = max(target.sizes or (target.size,))
+    else:
+        options = dict(target.options)
+        size = target.size
+    return ExportJob(target.path, size, _FORMATS[target.format], options)
+
+
+def plan(targets):
+    """Group targets needing identical output into PlannedOutputs
+
+    Each planned output renders and encodes once (to its first target's
+    path) and is copied to the remaining targets.
+    """
+    groups = OrderedDict()
+    for target in targets:
+        job = _export_job(target)
+        key = (job.size, job.format, json.dumps(job.options, sort_keys=True))
+        if key in groups:
+            groups[key].targets.append(target)
+        else:
+            groups[key] = PlannedOutput(job, [target])
+    return list(groups.values())
+
+
+def execute(planned, source=None, render=None, rasterizer=None, workers=None, cache=None, base_key=None,
+            optimizer=None):
+    """Produce every planned output and return one ExportResult per target,
+    grouped in plan order
+
+    Pixels come from exactly one of: a source image or ResolutionPyramid,
+    a render(size) function (run on the export process pool), or a
+    Rasterizer, whose run() handles all sizes at once (PNG targets only).
+    An optimizer (PngOptimizer) recompresses each PNG once, in memory,
+    before it is written and copied to duplicate targets.
+    """
+    if sum(x is not None for x in (source, render, rasterizer)) != 1:
+        raise ValueError("Pass exactly one of source, render or rasterizer")
+    if optimizer is not None and base_key is not None:
+        base_key = make_key(base_key, optimizer.key())
+
+    # Leave groups whose every target is still fresh alone
+    work = []
+    for output in planned:
+        stale = [t for t in output.targets
+                 if cache is None or not cache.is_fresh(t.path, job_key(base_key, output.job))]
+        if stale:
+            work.append(PlannedOutput(output.job._replace(filename=stale[0].path), stale))
+
+    jobs = [output.job for output in work]
+    for output in work:
+        for target in output.targets:
+            os.makedirs(os.path.dirname(target.path) or '.', exist_ok=True)
+
+    if rasterizer is not None:
+        rasterizer.targets = []
+        for job in jobs:
+            if job.format != 'PNG':
+                raise ValueError(f"Rasterizers only write PNG targets: {job.filename}")
+            rasterizer.add(job.filename, job.size)
+        built = [ExportResult(r.output_path, r.size, r.ok, r.error,
+                              os.path.getsize(r.output_path) if r.ok else 0)
+                 for r in rasterizer.run(optimizer)]
+    else:
+        built = export_sizes(jobs, source=source, render=render, workers=workers, optimizer=optimizer)
+
+    results = {}
+    for output, result in zip(work, built):
+        key = job_key(base_key, output.job)
+        for target in output.targets:
+            if target.path != result.filename and result.ok:
+                try:
+                    copy_atomic(result.filename, target.path)
+                    copied = ExportResult(target.path, target.size, True, None, result.bytes_written)
+                except OSError as e:
+                    copied = ExportResult(target.path, target.size, False, str(e), 0)
+            else:
+                copied = result._replace(filename=target.path, size=target.size)
+            if copied.ok and cache is not None:
+                cache.record(target.path, key)
+            results[target.path] = copied
+
+    ordered = []
+    for output in planned:
+        for target in output.targets:
+            if target.path not in results:
+                results[target.path] = ExportResult(
+                    target.path, target.size, True, None, os.path.getsize(target.path), True)
+            ordered.append(results[target.path])
+    return ordered
+
+
+def plan_summary(planned):
+    """(targets, renders) counts for progress messages"""
+    return sum(len(output.targets) for output in planned), len(planned)
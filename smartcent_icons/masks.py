@@ -0,0 +1,130 @@
+"""
+Shape Masks for SmartCent Icons
+Antialiased circle, squircle, rounded-rect and adaptive safe-zone masks,
+cached by shape and size and applied to icons in place
+"""
+
+import math
+from functools import lru_cache
+
+from PIL import Image, ImageChops, ImageDraw
+
+from smartcent_icons.instrument import timed
+
+# Masks are drawn this many times larger and box-filtered down
+SUPERSAMPLE = 4
+
+# Cap on the supersampled edge, so huge sources do not allocate huge masks
+MAX_SUPERSAMPLED = 4096
+
+# Android adaptive icons: 108dp canvas, 66dp guaranteed-visible circle
+ADAPTIVE_CANVAS = 108
+ADAPTIVE_SAFE_ZONE = 66
+
+
+def _circle(draw, width, height):
+    """Ellipse filling the whole box"""
+    draw.ellipse((0, 0, width, height), fill=255)
+
+
+def _rounded_rect(draw, width, height, radius=0.225):
+    """Rectangle with corner radius given as a fraction of the short side"""
+    draw.rounded_rectangle((0, 0, width - 1, height - 1), radius=radius * min(width, height), fill=255)
+
+
+def _squircle(draw, width, height, exponent=5.0, points=720):
+    """Superellipse |x|^n + |y|^n = 1 filling the whole box"""
+    outline = []
+    for i in range(points):
+        angle = 2 * math.pi * i / points
+        c, s = math.cos(angle), math.sin(angle)
+        x = math.copysign(abs(c) ** (2 / exponent), c)
+        y = math.copysign(abs(s) ** (2 / exponent), s)
+        outline.append(((x + 1) * width / 2, (y + 1) * height / 2))
+    draw.polygon(outline, fill=255)
+
+
+def _adaptive_safe_zone(draw, width, height):
+    """Centered circle an Android launcher never crops (66 of 108 dp)"""
+    inset_x = width * (1 - ADAPTIVE_SAFE_ZONE / ADAPTIVE_CANVAS) / 2
+    inset_y = height * (1 - ADAPTIVE_SAFE_ZONE / ADAPTIVE_CANVAS) / 2
+    draw.ellipse((inset_x, inset_y, width - inset_x, height - inset_y), fill=255)
+
+
+SHAPES = {
+    'circle': _circle,
+    'rounded_rect': _rounded_rect,
+    'squircle': _squircle,
+    'adaptive': _adaptive_safe_zone,
+}
+
+
+def _as_size(size):
+    """Accept either an edge length or a (width, height) pair"""
+    if isinstance(size, int):
+        return (size, size)
+    return tuple(size)
+
+
+@lru_cache(maxsize=32)
+def _cached_mask(shape, size, supersample, params):
+    try:
+        draw_shape = SHAPES[shape]
+    except KeyError:
+        raise ValueError(f"Unknown mask shape: {shape}")
+
+    width, height = size
+    factor = max(1, min(supersample, MAX_SUPERSAMPLED // max(width, height)))
+    mask = Image.new('L', (width * factor, height * factor), 0)
+    draw_shape(ImageDraw.Draw(mask), width * factor, height * factor, **dict(params))
+    if factor > 1:
+        mask = mask.reduce(factor)
+    return mask
+
+
+def shape_mask(shape, size, supersample=SUPERSAMPLE, **params):
+    """Antialiased 'L' mask of a shape; cached, so treat it as read-only"""
+    return _cached_mask(shape, _as_size(size), supersample, tuple(sorted(params.items())))
+
+
+@timed('mask')
+def apply_mask(image, shape='circle', supersample=SUPERSAMPLE, **params):
+    """Cut an RGBA image to a shape by writing its alpha channel in place
+
+    Existing transparency is kept: the shape is multiplied into the alpha
+    channel unless the image is fully opaque. Returns the image.
+    """
+    if image.mode != 'RGBA':
+        raise ValueError(f"apply_mask needs an RGBA image, got {image.mode}")
+
+    mask = shape_mask(shape, image.size, supersample, **params)
+    alpha = image.getchannel('A')
+    if alpha.getextrema() != (255, 255):
+        mask = ImageChops.multiply(alpha, mask)
+    image.putalpha(mask)
+    return image
+
+
+def center_square(image):
+    """Largest centered square of an image"""
+    width, height = image.size
+    size = min(width, height)
+    if width == height:
+        return image
+    left = (width - size) // 2
+    top = (height - size) // 2
+    return image.crop((left, top, left + size, top + size))
+
+
+def crop_to_shape(image, shape='circle', **params):
+    """Center-square crop an image and cut it to a shape
+
+    The crop is the only copy made; the mask comes from the cache and is
+    written into the cropped image's alpha channel.
+    """
+    square = center_square(image)
+    if square.mode != 'RGBA':
+        square = square.convert('RGBA')
+    elif square is image:
+        square = image.copy()
+    return apply_mask(square, shape, **params)
@@ -0,0 +1,255 @@
+"""
+PNG Optimizer for SmartCent Icons
+Re-encodes exported PNGs with a sweep of lossless (and optionally
+perceptually bounded) candidates and keeps the smallest file
+"""
+
+import fnmatch
+import io
+import os
+import zlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image, ImageChops
+
+from smartcent_icons.cache import make_key
+from smartcent_icons.export import default_workers
+from smartcent_icons.instrument import stage
+from smartcent_icons.pyramid import psnr
+from smartcent_icons.sink import write_atomic
+
+OptimizeResult = namedtuple('OptimizeResult', ['filename', 'original_bytes', 'optimized_bytes',
+                                               'method', 'psnr', 'over_budget', 'error'])
+
+# zlib strategies worth trying on icon artwork; Z_HUFFMAN_ONLY and
+# Z_FIXED never win on gradients and are left out to keep the sweep short
+DEFAULT_STRATEGIES = (zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED, zlib.Z_RLE)
+
+_STRATEGY_NAMES = {
+    zlib.Z_DEFAULT_STRATEGY: 'default',
+    zlib.Z_FILTERED: 'filtered',
+    zlib.Z_HUFFMAN_ONLY: 'huffman',
+    zlib.Z_RLE: 'rle',
+    zlib.Z_FIXED: 'fixed',
+}
+
+
+def _zopfli():
+    """The optional zopfli PNG recompressor, or None when not installed"""
+    try:
+        import zopfli.png
+        return zopfli.png
+    except ImportError:
+        return None
+
+
+def _encode(image, level, strategy, info):
+    """PNG bytes of an image at one zlib level and strategy"""
+    buffer = io.BytesIO()
+    image.save(buffer, format='PNG', compress_level=level, compress_type=strategy, **info)
+    return buffer.getvalue()
+
+
+def _exact_palette(image):
+    """Lossless palette version of an image with at most 256 colours, or None"""
+    if image.getcolors(256) is None:
+        return None
+
+    rgba = np.asarray(image.convert('RGBA'))
+    packed = rgba.view(np.uint32).reshape(rgba.shape[:2])
+    colors, indices = np.unique(packed, return_inverse=True)
+    entries = colors.view(np.uint8).reshape(-1, 4)
+
+    palette = Image.fromarray(indices.reshape(packed.shape).astype(np.uint8), 'P')
+    palette.putpalette(entries[:, :3].tobytes(), rawmode='RGB')
+    if image.mode in ('RGBA', 'LA') and (entries[:, 3] != 255).any():
+        palette.info['transparency'] = entries[:, 3].tobytes()
+    return palette
+
+
+def _reduced_forms(image):
+    """Lossless lower-depth versions of an image: (name, image) pairs"""
+    forms = [('original', image)]
+
+    if image.mode == 'RGBA' and image.getchannel('A').getextrema() == (255, 255):
+        image = image.convert('RGB')
+        forms.append(('rgb', image))
+
+    if image.mode == 'RGB':
+        r, g, b = image.split()
+        if ImageChops.difference(r, g).getbbox() is None and ImageChops.difference(r, b).getbbox() is None:
+            forms.append(('gray', r))
+
+    palette = _exact_palette(image)
+    if palette is not None:
+        forms.append(('palette', palette))
+    return forms
+
+
+def optimize_bytes(original, level=9, strategies=DEFAULT_STRATEGIES, min_psnr=None, use_zopfli=True):
+    """Smallest candidate encoding of PNG bytes: (data, method, psnr)
+
+    Every candidate decodes to exactly the same pixels, unless min_psnr
+    is given: then a 256-colour quantized version is also tried and kept
+    if its PSNR against the original is at least min_psnr dB. The
+    original bytes come back unchanged when no candidate is smaller.
+    """
+    image = Image.open(io.BytesIO(original))
+    image.load()
+
+    info = {}
+    if image.info.get('icc_profile'):
+        info['icc_profile'] = image.info['icc_profile']
+
+    forms = _reduced_forms(image)
+    if min_psnr is not None and image.mode in ('RGB', 'RGBA') and image.getcolors(256) is None:
+        quantized = image.quantize(256, method=Image.Quantize.FASTOCTREE)
+        score = psnr(image, quantized.convert(image.mode))
+        if score >= min_psnr:
+            forms.append(('quantized', quantized))
+
+    best, best_method, best_psnr = original, 'unchanged', None
+    for name, form in forms:
+        for strategy in strategies:
+            # Transparency has to be passed explicitly for palette images
+            extra = dict(info)
+            if 'transparency' in form.info:
+                extra['transparency'] = form.info['transparency']
+            data = _encode(form, level, strategy, extra)
+            if len(data) < len(best):
+                best, best_method = data, f"{name}/{_STRATEGY_NAMES.get(strategy, strategy)}"
+                best_psnr = score if name == 'quantized' else None
+
+    zopfli_png = _zopfli() if use_zopfli else None
+    if zopfli_png is not None:
+        data = zopfli_png.optimize(best)
+        if len(data) < len(best):
+            best, best_method = data, f"{best_method}+zopfli"
+    return best, best_method, best_psnr
+
+
+def optimize_png(path, level=9, strategies=DEFAULT_STRATEGIES, min_psnr=None,
+                 use_zopfli=True, budget=None):
+    """Rewrite one PNG with the smallest candidate encoding (see
+    optimize_bytes)
+
+    The file is only replaced, atomically, when a candidate is smaller.
+    budget (bytes) only flags the result; it never forces a lossier
+    encoding.
+    """
+    try:
+        with stage('optimize', file=path) as optimizing:
+            with open(path, 'rb') as f:
+                original = f.read()
+            best, best_method, best_psnr = optimize_bytes(original, level, strategies, min_psnr, use_zopfli)
+            if len(best) < len(original):
+                write_atomic(path, best)
+                optimizing.add_bytes(len(best))
+
+            over_budget = budget is not None and len(best) > budget
+            return OptimizeResult(path, len(original), len(best), best_method, best_psnr, over_budget, None)
+    except Exception as e:
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        return OptimizeResult(path, size, size, 'failed', None, False, str(e))
+
+
+class PngOptimizer:
+    """Post-export optimization stage run across a process pool
+
+    budgets maps file name patterns (fnmatch, e.g. 'web/*') to byte
+    limits; the first matching pattern applies. Results of every run()
+    are kept in .results for report().
+    """
+
+    def __init__(self, level=9, strategies=DEFAULT_STRATEGIES, min_psnr=None,
+                 use_zopfli=True, budgets=None, workers=None):
+        self.level = level
+        self.strategies = tuple(strategies)
+        self.min_psnr = min_psnr
+        self.use_zopfli = use_zopfli and _zopfli() is not None
+        self.budgets = budgets or {}
+        self.workers = workers
+        self.results = []
+
+    def key(self):
+        """Build-cache key part for these settings, so changing them rebuilds"""
+        return make_key('optimize', self.level, self.strategies, self.min_psnr, self.use_zopfli)
+
+    def __getstate__(self):
+        # Workers get the settings, not the results collected so far
+        return dict(self.__dict__, results=[])
+
+    def budget_for(self, path):
+        """Byte budget of a file, or None"""
+        for pattern, limit in self.budgets.items():
+            if fnmatch.fnmatch(path, pattern) or fnmatch.fnmatch(os.path.basename(path), pattern):
+                return limit
+        return None
+
+    def optimize_data(self, path, data):
+        """Optimize encoded PNG bytes bound for path without touching the
+        file: (smallest bytes, OptimizeResult)"""
+        try:
+            with stage('optimize', file=path) as optimizing:
+                best, method, score = optimize_bytes(data, self.level, self.strategies, self.min_psnr,
+                                                     self.use_zopfli)
+                optimizing.add_bytes(len(best))
+        except Exception as e:
+            return data, OptimizeResult(path, len(data), len(data), 'failed', None, False, str(e))
+        budget = self.budget_for(path)
+        over_budget = budget is not None and len(best) > budget
+        return best, OptimizeResult(path, len(data), len(best), method, score, over_budget, None)
+
+    def run(self, paths):
+        """Optimize every PNG in paths and return one OptimizeResult each, in order"""
+        paths = [path for path in paths if path.lower().endswith('.png')]
+        if not paths:
+            return []
+        args = [(path, self.level, self.strategies, self.min_psnr, self.use_zopfli, self.budget_for(path))
+                for path in paths]
+
+        workers = default_workers() if self.workers is None else self.workers
+        if workers <= 1 or len(paths) <= 1:
+            results = [optimize_png(*arg) for arg in args]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as executor:
+                results = list(executor.map(optimize_png, *zip(*args)))
+
+        self.results.extend(results)
+        return results
+
+    def report(self):
+        """Print bytes saved per file and in total"""
+        total_before = total_after = 0
+        for result in self.results:
+            if result.error:
+                print(f"❌ Failed to optimize {result.filename}: {result.error}")
+                continue
+            total_before += result.original_bytes
+            total_after += result.optimized_bytes
+            saved = result.original_bytes - result.optimized_bytes
+            note = f", {result.psnr:.1f} dB" if result.psnr is not None else ""
+            print(f"🗜️ {result.filename}: {result.original_bytes:,} → {result.optimized_bytes:,} bytes "
+                  f"(-{saved:,}, {result.method}{note})")
+            if result.over_budget:
+                print(f"⚠️ {result.filename} is over its size budget of {self.budget_for(result.filename):,} bytes")
+        if total_before:
+            saved = total_before - total_after
+            print(f"📉 Saved {saved:,} of {total_before:,} bytes ({100 * saved / total_before:.1f}%)")
+
+
+def optimizer_from_env(workers=None):
+    """PngOptimizer when SMARTCENT_OPTIMIZE=1 (or a PSNR floor such as 40 for
+    near-lossless candidates), else None
+
+    The sweep costs more than resizing and encoding a whole fan-out, so
+    scripts only run it when asked.
+    """
+    value = os.environ.get('SMARTCENT_OPTIMIZE', '').strip().lower()
+    if value in ('', '0', 'false', 'no'):
+        return None
+    if value in ('1', 'true', 'yes'):
+        return PngOptimizer(workers=workers)
+    return PngOptimizer(min_psnr=float(value), workers=workers)
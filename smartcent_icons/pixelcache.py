@@ -0,0 +1,160 @@
+"""
+Decoded Source Cache for SmartCent Icons
+Keeps the decoded pixels of source images as raw .npy files, so later
+runs and worker processes map them instead of decoding again
+
+Entries are keyed by the source's content hash plus everything that
+shapes the decoded result (box, fit, size, toolkit code). A hit is a
+read-only np.memmap wrapped by Image.frombuffer without a copy; Pillow
+copies it only if the image is modified. Hits refresh an entry's mtime,
+and the least recently used entries are deleted once the directory
+grows past its byte budget.
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+from smartcent_icons.cache import hash_file
+from smartcent_icons.instrument import stage
+
+DIRECTORY_NAME = '.smartcent_pixels'
+
+# Bytes of decoded pixels kept on disk (SMARTCENT_PIXEL_CACHE_MB overrides)
+DEFAULT_BUDGET = 512 * 1024 * 1024
+
+# Image mode by array channel count
+_MODES = {1: 'L', 3: 'RGB', 4: 'RGBA'}
+
+_SOURCES_NAME = 'sources.json'
+
+
+class DecodedCache:
+    """Directory of decoded images, least recently used first out
+
+    The directory is DIRECTORY_NAME in cache_dir (default:
+    SMARTCENT_CACHE_DIR, then the current directory). SMARTCENT_NO_CACHE=1
+    turns every lookup into a miss and stores nothing.
+    """
+
+    def __init__(self, cache_dir=None, budget=None):
+        cache_dir = cache_dir or os.environ.get('SMARTCENT_CACHE_DIR') or os.getcwd()
+        self.directory = os.path.join(cache_dir, DIRECTORY_NAME)
+        if budget is None:
+            megabytes = os.environ.get('SMARTCENT_PIXEL_CACHE_MB')
+            budget = int(float(megabytes) * 1024 * 1024) if megabytes else DEFAULT_BUDGET
+        self.budget = budget
+        self.enabled = os.environ.get('SMARTCENT_NO_CACHE', '') in ('', '0')
+        self._sources = None
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.npy')
+
+    def source_hash(self, path):
+        """Content hash of a source file, rehashed only when its size or
+        mtime changed since the last run"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        if self._sources is None:
+            try:
+                with open(os.path.join(self.directory, _SOURCES_NAME)) as f:
+                    self._sources = json.load(f)
+            except (OSError, ValueError):
+                self._sources = {}
+        entry = self._sources.get(path)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['sha256']
+
+        digest = hash_file(path)
+        self._sources[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest}
+        if self.enabled:
+            self._write_sources()
+        return digest
+
+    def _write_sources(self):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=f'.{_SOURCES_NAME}.', suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(self._sources, f, indent=1, sort_keys=True)
+        os.replace(temp_path, os.path.join(self.directory, _SOURCES_NAME))
+
+    def get(self, key):
+        """The image stored under key, memory-mapped and read-only, or None"""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            pixels = np.load(path, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        mode = _MODES.get(1 if pixels.ndim == 2 else pixels.shape[2])
+        if mode is None or pixels.dtype != np.uint8:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        height, width = pixels.shape[:2]
+        return Image.frombuffer(mode, (width, height), pixels, 'raw', mode, 0, 1)
+
+    def put(self, key, image):
+        """Store an image's pixels under key, then evict down to the budget"""
+        if not self.enabled or image.mode not in _MODES.values():
+            return
+        nbytes = image.width * image.height * len(image.getbands())
+        if nbytes > self.budget:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=f'.{key}.', suffix='.tmp')
+        try:
+            with stage('pixel_cache', file=key) as writing, os.fdopen(fd, 'wb') as f:
+                np.save(f, np.asarray(image), allow_pickle=False)
+                writing.add_bytes(nbytes)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        self.evict()
+
+    def load(self, key, loader):
+        """The image under key, or loader()'s result, stored for next time"""
+        image = self.get(key)
+        if image is not None:
+            return image
+        image = loader()
+        self.put(key, image)
+        return image
+
+    def evict(self, budget=None):
+        """Delete least recently used entries until the total fits budget"""
+        budget = self.budget if budget is None else budget
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith('.npy')]
+        except OSError:
+            return
+        entries = []
+        for name in names:
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= budget:
+                break
+            try:
+                # Processes that already mapped the file keep their pages
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        self.evict(0)
@@ -0,0 +1,71 @@
+"""
+Resolution Pyramid for SmartCent Icons
+Render once, downsample many: every export size reads from the nearest
+pre-halved level instead of filtering the full-size master again
+"""
+
+import math
+
+import numpy as np
+from PIL import Image
+
+
+def _as_size(size):
+    """Accept either an edge length or a (width, height) pair"""
+    if isinstance(size, int):
+        return (size, size)
+    return tuple(size)
+
+
+class ResolutionPyramid:
+    """Successively halved copies of a master image
+
+    Each level is a Lanczos downsample of the previous one. A target size
+    is produced from the smallest level that is still at least twice as
+    large, so the final Lanczos step only ever filters a small image.
+    """
+
+    def __init__(self, master, min_size=16, resample=Image.Resampling.LANCZOS):
+        self.master = master
+        self.resample = resample
+        self.levels = [master]
+
+        width, height = master.size
+        while min(width, height) // 2 >= min_size:
+            width, height = width // 2, height // 2
+            self.levels.append(self.levels[-1].resize((width, height), resample))
+
+    def level_for(self, size):
+        """Return the smallest level at least twice the target size"""
+        width, height = _as_size(size)
+        best = self.levels[0]
+        for level in self.levels[1:]:
+            if level.size[0] >= 2 * width and level.size[1] >= 2 * height:
+                best = level
+            else:
+                break
+        return best
+
+    def resize(self, size):
+        """Resize to the target size from the nearest larger level"""
+        size = _as_size(size)
+        level = self.level_for(size)
+        if level.size == size:
+            return level.copy()
+        return level.resize(size, self.resample)
+
+    def quality(self, size):
+        """PSNR (dB) of the pyramid result against a direct resize of the master"""
+        size = _as_size(size)
+        direct = self.master.resize(size, self.resample)
+        return psnr(direct, self.resize(size))
+
+
+def psnr(first, second):
+    """Peak signal-to-noise ratio between two same-sized images, in dB"""
+    a = np.asarray(first, dtype=np.float64)
+    b = np.asarray(second, dtype=np.float64)
+    mse = np.mean((a - b) ** 2)
+    if mse == 0:
+        return math.inf
+    return 10 * math.log10(255 ** 2 / mse)
@@ -0,0 +1,175 @@
+"""
+SVG Rasterizer Backends for SmartCent Icons
+One interface over CairoSVG, the built-in Pillow renderer and Inkscape
+"""
+
+import os
+from abc import ABC, abstractmethod
+from collections import OrderedDict, namedtuple
+
+from smartcent_icons.instrument import stage
+from smartcent_icons.sink import OutputSink, SinkError, encode_image
+
+RasterResult = namedtuple('RasterResult', ['output_path', 'size', 'ok', 'error'])
+
+
+class Rasterizer(ABC):
+    """Renders one SVG to PNG files at many sizes
+
+    Queue outputs with add() and write them all with run(). Backends
+    implement render(size); the default run() renders and encodes each
+    distinct size once and writes it to every destination of that size.
+    """
+
+    name = None
+
+    def __init__(self, svg_path):
+        self.svg_path = svg_path
+        self.targets = []
+
+    @classmethod
+    def available(cls):
+        """Whether this backend can run on the current machine"""
+        return True
+
+    def add(self, output_path, size):
+        """Queue an export of the SVG at size x size pixels"""
+        self.targets.append((output_path, size))
+
+    @abstractmethod
+    def render(self, size):
+        """Render the SVG to a size x size RGBA image"""
+
+    def _grouped_targets(self):
+        by_size = OrderedDict()
+        for output_path, size in self.targets:
+            by_size.setdefault(size, []).append(output_path)
+        return by_size
+
+    def run(self, optimizer=None):
+        """Write every queued target and return one RasterResult each, in order
+
+        Each size is encoded (and, with an optimizer, recompressed) once in
+        memory and written to all of its destinations as one batch (see
+        OutputSink).
+        """
+        results = {}
+        with OutputSink() as sink:
+            for size, paths in self._grouped_targets().items():
+                error = None
+                try:
+                    with stage('rasterize', file=paths[0], size=size):
+                        image = self.render(size)
+                    with stage('encode', file=paths[0]):
+                        data = encode_image(image, 'PNG')
+                    if optimizer is not None:
+                        data, optimized = optimizer.optimize_data(paths[0], data)
+                        optimizer.results.append(optimized)
+                    for path in paths:
+                        sink.write(path, data)
+                except Exception as e:
+                    error = str(e)
+                for path in paths:
+                    results[(path, size)] = RasterResult(path, size, error is None, error)
+            try:
+                sink.commit()
+            except SinkError as e:
+                results = {target: result._replace(ok=False, error=e.errors.get(result.output_path,
+                                                                                 f"batch not written: {e}"))
+                           if result.ok else result
+                           for target, result in results.items()}
+        return [results[target] for target in self.targets]
+
+
+class PillowRasterizer(Rasterizer):
+    """Built-in renderer: parses the SVG once, no external process or library"""
+
+    name = 'pillow'
+
+    def __init__(self, svg_path):
+        super().__init__(svg_path)
+        self._document = None
+
+    def render(self, size):
+        from smartcent_icons.svg import SvgDocument
+
+        if self._document is None:
+            self._document = SvgDocument(self.svg_path)
+        return self._document.render(size)
+
+
+class CairoSvgRasterizer(Rasterizer):
+    """CairoSVG renderer: parses the SVG tree once and reuses it for every size"""
+
+    name = 'cairosvg'
+
+    def __init__(self, svg_path):
+        super().__init__(svg_path)
+        self._tree = None
+
+    @classmethod
+    def available(cls):
+        try:
+            import cairosvg  # noqa: F401
+        except (ImportError, OSError):
+            # OSError: the Python package is installed but libcairo is missing
+            return False
+        return True
+
+    def render(self, size):
+        import io
+
+        from cairosvg.parser import Tree
+        from cairosvg.surface import PNGSurface
+        from PIL import Image
+
+        if self._tree is None:
+            with open(self.svg_path, 'rb') as f:
+                self._tree = Tree(bytestring=f.read())
+
+        output = io.BytesIO()
+        PNGSurface(self._tree, output, 96, output_width=size, output_height=size).finish()
+        output.seek(0)
+        return Image.open(output).convert('RGBA')
+
+
+def _inkscape_backend():
+    from smartcent_icons.inkscape import InkscapeBatch
+    return InkscapeBatch
+
+
+BACKENDS = OrderedDict([
+    ('cairosvg', lambda: CairoSvgRasterizer),
+    ('pillow', lambda: PillowRasterizer),
+    ('inkscape', _inkscape_backend),
+])
+
+# Inkscape is the optional fidelity backend: only used when asked for by name
+AUTO_ORDER = ('cairosvg', 'pillow')
+
+
+def available_backends():
+    """Names of the backends usable on this machine"""
+    return [name for name, backend in BACKENDS.items() if backend().available()]
+
+
+def get_rasterizer(svg_path, backend=None):
+    """Create a rasterizer for svg_path
+
+    backend is a name from BACKENDS or 'auto'; it defaults to the
+    SMARTCENT_RASTERIZER environment variable, then to 'auto'.
+    """
+    backend = backend or os.environ.get('SMARTCENT_RASTERIZER', 'auto')
+    if backend == 'auto':
+        for name in AUTO_ORDER:
+            if BACKENDS[name]().available():
+                return BACKENDS[name]()(svg_path)
+        raise RuntimeError(f"No rasterizer backend available (tried {', '.join(AUTO_ORDER)}; "
+                           f"usable here: {', '.join(available_backends()) or 'none'})")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown rasterizer backend: {backend}")
+
+    cls = BACKENDS[backend]()
+    if not cls.available():
+        raise RuntimeError(f"Rasterizer backend '{backend}' is not available")
+    return cls(svg_path)
@@ -0,0 +1,174 @@
+"""
+Icon Scene Graph for SmartCent
+Declares a procedural icon as an ordered list of layers and caches the
+canvas after each layer, per size
+
+Layers paint onto the canvas left by the layers before them, exactly as
+the monolithic renderers did, so output is pixel-identical. Changing one
+layer's parameters only repaints from that layer on: every earlier
+prefix is restored from its snapshot.
+"""
+
+from collections import OrderedDict
+
+from smartcent_icons.instrument import stage
+
+# Snapshot memory budget shared by every scene (bytes)
+SNAPSHOT_BUDGET = 256 * 1024 * 1024
+
+
+class SnapshotCache:
+    """Least-recently-used canvas snapshots, bounded by total pixel bytes"""
+
+    def __init__(self, budget=SNAPSHOT_BUDGET):
+        self.budget = budget
+        self.used = 0
+        self.snapshots = OrderedDict()
+
+    def get(self, key):
+        """The snapshot stored under key, or None; never modify it"""
+        image = self.snapshots.get(key)
+        if image is not None:
+            self.snapshots.move_to_end(key)
+        return image
+
+    def put(self, key, image):
+        """Store a private copy of a canvas"""
+        if key in self.snapshots:
+            return
+        nbytes = image.width * image.height * len(image.getbands())
+        if nbytes > self.budget:
+            return
+        self.snapshots[key] = image.copy()
+        self.used += nbytes
+        while self.used > self.budget:
+            _, old = self.snapshots.popitem(last=False)
+            self.used -= old.width * old.height * len(old.getbands())
+
+    def clear(self):
+        self.snapshots.clear()
+        self.used = 0
+
+
+_shared_cache = SnapshotCache()
+
+
+def _is_pixel_floor(name):
+    return name.startswith('min_') or '_min_' in name
+
+
+class Layer:
+    """One painting step: paint(canvas, size, **params) -> canvas
+
+    The first layer of a scene receives canvas=None and creates it. A
+    layer may draw in place and return the same canvas, or return a new
+    image (compositing layers such as a vignette do).
+    """
+
+    def __init__(self, name, paint, **params):
+        self.name = name
+        self.paint = paint
+        self.params = params
+
+    def key(self):
+        """Identity of this layer's output given the canvas before it"""
+        return (self.name, self.paint.__module__, self.paint.__qualname__,
+                repr(sorted(self.params.items())))
+
+    def with_params(self, **params):
+        """Copy of this layer with some parameters changed"""
+        return Layer(self.name, self.paint, **dict(self.params, **params))
+
+    def scaled(self, factor):
+        """Copy of this layer for a canvas factor times larger
+
+        Parameters named min_* or *_min_* are pixel floors and detail
+        thresholds in target pixels (min_size, glow_min_size, min_outline,
+        min_radius, ...), so they scale with the canvas; everything else is
+        left alone.
+        """
+        params = {name: value * factor if _is_pixel_floor(name) else value
+                  for name, value in self.params.items()}
+        return Layer(self.name, self.paint, **params)
+
+    def __repr__(self):
+        return f"Layer({self.name!r})"
+
+
+class Scene:
+    """An icon design: an ordered list of layers rendered at any size"""
+
+    def __init__(self, name, layers, cache=None):
+        self.name = name
+        self.layers = list(layers)
+        self.cache = cache or _shared_cache
+
+    def layer(self, name):
+        """The layer called name"""
+        for layer in self.layers:
+            if layer.name == name:
+                return layer
+        raise KeyError(f"{self.name} has no layer {name!r}")
+
+    def with_params(self, layer_name, **params):
+        """Copy of this scene with one layer's parameters changed
+
+        The copy shares the snapshot cache, so rendering it only repaints
+        from the changed layer on.
+        """
+        self.layer(layer_name)
+        layers = [layer.with_params(**params) if layer.name == layer_name else layer
+                  for layer in self.layers]
+        return Scene(self.name, layers, self.cache)
+
+    def without(self, *layer_names):
+        """Copy of this scene with some layers left out"""
+        return Scene(self.name, [layer for layer in self.layers if layer.name not in layer_names], self.cache)
+
+    def scaled(self, factor):
+        """Copy of this scene for rendering factor times larger, keeping
+        size-dependent detail decisions those of the target size"""
+        if factor == 1:
+            return self
+        return Scene(self.name, [layer.scaled(factor) for layer in self.layers], self.cache)
+
+    def key(self):
+        """Identity of the scene's design, independent of size"""
+        return (self.name,) + tuple(layer.key() for layer in self.layers)
+
+    def __getstate__(self):
+        # Snapshots stay in the process that painted them
+        state = dict(self.__dict__)
+        state['cache'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.cache = _shared_cache
+
+    def _prefix_keys(self, size):
+        keys = []
+        prefix = (self.name, size)
+        for layer in self.layers:
+            prefix = prefix + (layer.key(),)
+            keys.append(prefix)
+        return keys
+
+    def render(self, size):
+        """Render the scene at size, repainting only layers without a snapshot"""
+        keys = self._prefix_keys(size)
+
+        # Resume from the longest cached prefix
+        start, canvas = 0, None
+        for i in range(len(keys) - 1, -1, -1):
+            snapshot = self.cache.get(keys[i])
+            if snapshot is not None:
+                start, canvas = i + 1, snapshot.copy()
+                break
+
+        with stage('scene', scene=self.name, size=size, cached_layers=start):
+            for i in range(start, len(self.layers)):
+                layer = self.layers[i]
+                canvas = layer.paint(canvas, size, **layer.params)
+                self.cache.put(keys[i], canvas)
+        return canvas
@@ -0,0 +1,108 @@
+"""
+Shared-Memory Images for SmartCent Icons
+Publishes images to worker processes once through
+multiprocessing.shared_memory, so each job carries a segment name and an
+offset instead of pickled pixels
+
+The owner copies the images into one segment and unlinks it when the
+work is done or cancelled. Workers map it read-only with Image.frombuffer,
+without a copy, and keep the mapping for later jobs. Before Python 3.13
+attaching registers the segment with the resource tracker as if the
+worker owned it, which makes the tracker unlink it early and warn about
+leaks; workers therefore attach untracked.
+"""
+
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+from PIL import Image
+
+# Segments this process has attached to, by name
+_attached = {}
+
+
+def _attach(name):
+    segment = _attached.get(name)
+    if segment is not None:
+        return segment
+    if sys.version_info >= (3, 13):
+        segment = shared_memory.SharedMemory(name=name, track=False)
+    else:
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None if rtype == 'shared_memory' else register(name, rtype)
+        try:
+            segment = shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+    _attached[name] = segment
+    return segment
+
+
+def attach_image(name, offset, mode, size):
+    """Read-only image over part of a shared segment (runs in a worker)"""
+    segment = _attach(name)
+    nbytes = size[0] * size[1] * len(mode)
+    return Image.frombuffer(mode, size, segment.buf[offset:offset + nbytes], 'raw', mode, 0, 1)
+
+
+class SharedImage:
+    """Reference to an image published by SharedImages
+
+    Pickles as the segment name and layout only, and unpickles as the
+    image itself, mapped onto the segment, so it can be passed wherever a
+    worker expects an Image.
+    """
+
+    __slots__ = ('name', 'offset', 'mode', 'size')
+
+    def __init__(self, name, offset, mode, size):
+        self.name = name
+        self.offset = offset
+        self.mode = mode
+        self.size = size
+
+    def __reduce__(self):
+        return (attach_image, (self.name, self.offset, self.mode, self.size))
+
+    def open(self):
+        return attach_image(self.name, self.offset, self.mode, self.size)
+
+
+class SharedImages:
+    """One shared-memory segment holding copies of some images
+
+    handles lists a SharedImage per image, in order. Use as a context
+    manager (or call close()) to unlink the segment; if this process dies
+    without doing so, the resource tracker removes it.
+    """
+
+    def __init__(self, images):
+        images = [image if image.mode in ('L', 'RGB', 'RGBA') else image.convert('RGBA') for image in images]
+        layout, offset = [], 0
+        for image in images:
+            layout.append(offset)
+            offset += image.width * image.height * len(image.mode)
+        self.segment = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        self.handles = []
+        for image, start in zip(images, layout):
+            pixels = np.asarray(image)
+            view = np.ndarray(pixels.shape, dtype=np.uint8, buffer=self.segment.buf, offset=start)
+            view[...] = pixels
+            del view
+            self.handles.append(SharedImage(self.segment.name, start, image.mode, image.size))
+
+    def close(self):
+        if self.segment is None:
+            return
+        self.segment.close()
+        self.segment.unlink()
+        self.segment = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,248 @@
+"""
+Atomic Output Sink for SmartCent Icons
+Encodes outputs in memory, writes them to fsynced temporary files on a
+background thread pool and renames the whole batch into place at the end
+
+An interrupted or failing run never leaves a missing or truncated output:
+until commit() every existing file is untouched, and each rename swaps a
+complete, flushed file in. Outputs whose bytes are unchanged are not
+rewritten at all, so their mtimes stay put and Flutter/Xcode do not
+rebuild for them.
+
+    with OutputSink() as sink:
+        for size in sizes:
+            sink.save(pyramid.resize(size), f'icon_{size}.png', optimize=True)
+"""
+
+import io
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from smartcent_icons.instrument import stage
+
+# Background writer threads; writes are I/O bound, so a few are plenty
+DEFAULT_IO_WORKERS = 4
+
+# Permissions of new files, as open() would create them
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_NEW_FILE_MODE = 0o666 & ~_UMASK
+
+
+class SinkError(OSError):
+    """Raised by commit() when some outputs could not be staged; nothing
+    of the batch was written. errors maps each failing path to its message."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        path, message = next(iter(errors.items()))
+        super().__init__(f"{path}: {message}" + (f" (and {len(errors) - 1} more)" if len(errors) > 1 else ""))
+
+
+def encode_image(image, format='PNG', **options):
+    """Encoded bytes of an image, as image.save() would write them"""
+    buffer = io.BytesIO()
+    image.save(buffer, format=format, **options)
+    return buffer.getvalue()
+
+
+def same_bytes(path, data):
+    """True when path already holds exactly data"""
+    try:
+        if os.path.getsize(path) != len(data):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == data
+    except OSError:
+        return False
+
+
+def _fsync_directory(directory):
+    # Makes the renames durable; not possible (nor needed) on Windows
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    try:
+        fd = os.open(directory or '.', os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _stage_file(path, data, fsync=True):
+    """Write data to a flushed temporary file next to path and return its
+    name, or None when path already holds data"""
+    if same_bytes(path, data):
+        return None
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with stage('write', file=path) as writing:
+        fd, temp_path = tempfile.mkstemp(dir=directory or '.', prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                if fsync:
+                    os.fsync(f.fileno())
+            try:
+                mode = os.stat(path).st_mode & 0o7777
+            except OSError:
+                mode = _NEW_FILE_MODE
+            os.chmod(temp_path, mode)
+        except BaseException:
+            _remove(temp_path)
+            raise
+        writing.add_bytes(len(data))
+    return temp_path
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def write_atomic(path, data, fsync=True):
+    """Replace path with data in one rename; returns False (and leaves the
+    file alone) when it already holds exactly data"""
+    temp_path = _stage_file(path, data, fsync)
+    if temp_path is None:
+        return False
+    os.replace(temp_path, path)
+    if fsync:
+        _fsync_directory(os.path.dirname(path))
+    return True
+
+
+def save_atomic(image, path, format='PNG', **options):
+    """image.save() that never leaves a truncated file and keeps unchanged
+    files untouched; returns whether the file was written"""
+    return write_atomic(path, encode_image(image, format, **options))
+
+
+def copy_atomic(source_path, path):
+    """Copy a file with write_atomic(); returns whether path was written"""
+    with open(source_path, 'rb') as f:
+        return write_atomic(path, f.read())
+
+
+def backup_file(path, backup_path):
+    """Keep the current contents of path as backup_path, leaving path in
+    place until it is atomically replaced (a hard link where possible)"""
+    try:
+        os.link(path, backup_path)
+    except OSError:
+        shutil.copy2(path, backup_path)
+    return backup_path
+
+
+class OutputSink:
+    """One batch of outputs written in the background and renamed into
+    place together
+
+    write() and save() return immediately; encoding (for save()) and the
+    temporary file writes run on a thread pool. Images handed to save()
+    must not be changed until the batch is committed. commit() waits for
+    every write and then renames the batch into place, or removes it all
+    and raises SinkError if any output failed. Used as a context manager,
+    the batch is committed on success and discarded on an exception.
+
+    After commit(), written and unchanged list the output paths.
+    """
+
+    def __init__(self, workers=DEFAULT_IO_WORKERS, fsync=True):
+        self.fsync = fsync
+        self.written = []
+        self.unchanged = []
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='smartcent-io')
+        self._pending = {}
+        self._superseded = []
+
+    def _submit(self, path, func, *args):
+        if path in self._pending:
+            # The last write to a path wins
+            self._superseded.append(self._pending.pop(path))
+        self._pending[path] = self._executor.submit(func, *args)
+
+    def write(self, path, data):
+        """Queue encoded bytes for path"""
+        self._submit(path, _stage_file, path, data, self.fsync)
+
+    def save(self, image, path, format='PNG', **options):
+        """Queue an image to be encoded like image.save() and written to path"""
+        def encode_and_stage():
+            with stage('encode', file=path):
+                data = encode_image(image, format, **options)
+            return _stage_file(path, data, self.fsync)
+        self._submit(path, encode_and_stage)
+
+    def _wait(self):
+        staged, errors = {}, {}
+        for future in self._superseded:
+            try:
+                temp_path = future.result()
+            except Exception:
+                continue
+            if temp_path:
+                _remove(temp_path)
+        self._superseded = []
+        for path, future in self._pending.items():
+            try:
+                staged[path] = future.result()
+            except Exception as e:
+                errors[path] = str(e)
+        self._pending = {}
+        return staged, errors
+
+    def commit(self):
+        """Rename every staged output into place and return the written paths"""
+        staged, errors = self._wait()
+        if errors:
+            for temp_path in staged.values():
+                if temp_path:
+                    _remove(temp_path)
+            raise SinkError(errors)
+
+        written = []
+        for path, temp_path in staged.items():
+            if temp_path is None:
+                self.unchanged.append(path)
+            else:
+                os.replace(temp_path, path)
+                written.append(path)
+        if self.fsync:
+            for directory in sorted({os.path.dirname(path) for path in written}):
+                _fsync_directory(directory)
+        self.written.extend(written)
+        return written
+
+    def discard(self):
+        """Drop every queued output, leaving the existing files alone"""
+        staged, _ = self._wait()
+        for temp_path in staged.values():
+            if temp_path:
+                _remove(temp_path)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.discard()
+        finally:
+            self.close()
+        return False
@@ -0,0 +1,147 @@
+"""
+Streaming Source Loader for SmartCent Icons
+Opens very large source artwork and produces only the region and size an
+export actually needs, converting and downscaling strip by strip
+
+Peak memory is the decoded source in its native mode (already shrunk by
+the JPEG decoder through draft()) plus the output, instead of several
+full-size RGBA copies of an 8K-12K upload.
+"""
+
+import math
+
+from PIL import Image
+
+from smartcent_icons.instrument import stage
+
+# Output rows produced per strip
+STRIP_ROWS = 256
+
+# Lanczos reads 3 output pixels either side of each sample
+LANCZOS_SUPPORT = 3
+
+
+class StreamingSource:
+    """A lazily decoded source image
+
+    Only the header is read on construction; pixels are decoded on the
+    first load(), at the smallest JPEG draft scale that still covers the
+    requested output size.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with Image.open(path) as image:
+            self.size = image.size
+            self.mode = image.mode
+            self.format = image.format
+
+    def center_square(self):
+        """Box of the largest centered square"""
+        width, height = self.size
+        side = min(width, height)
+        left = (width - side) // 2
+        top = (height - side) // 2
+        return (left, top, left + side, top + side)
+
+    def load(self, box=None, size=None, strip_rows=STRIP_ROWS):
+        """RGBA image of a source region, scaled to size
+
+        box is in source pixels (default: the whole image); size defaults
+        to the box size. Rows are converted and resampled in strips, so no
+        full-size RGBA copy of the source is ever made.
+        """
+        box = tuple(box or (0, 0) + self.size)
+        box_width, box_height = box[2] - box[0], box[3] - box[1]
+        width, height = size or (box_width, box_height)
+
+        with Image.open(self.path) as image, stage('load', file=self.path, size=width):
+            with stage('decode', file=self.path):
+                if image.format == 'JPEG':
+                    # Let the decoder scale by 1/2, 1/4 or 1/8 while keeping
+                    # the region at least as large as the output
+                    requested = (math.ceil(self.size[0] * width / box_width),
+                                 math.ceil(self.size[1] * height / box_height))
+                    image.draft(image.mode, requested)
+                image.load()
+
+            # Box in decoded pixels
+            sx, sy = image.size[0] / self.size[0], image.size[1] / self.size[1]
+            left, top = round(box[0] * sx), round(box[1] * sy)
+            right, bottom = round(box[2] * sx), round(box[3] * sy)
+
+            scale_x = (right - left) / width
+            scale_y = (bottom - top) / height
+
+            # Cheap integer reduce first, leaving Lanczos at least a 2x step
+            factor = max(1, int(min(scale_x, scale_y) // 2))
+            margin = math.ceil(LANCZOS_SUPPORT * scale_y) + factor
+
+            output = Image.new('RGBA', (width, height))
+            for y0 in range(0, height, strip_rows):
+                y1 = min(height, y0 + strip_rows)
+
+                # Source rows this strip samples, plus the filter margin,
+                # kept inside the box and aligned to the reduce factor
+                src_top = top + y0 * scale_y
+                src_bottom = top + y1 * scale_y
+                crop_top = max(top, int(src_top) - margin)
+                crop_top = top + (crop_top - top) // factor * factor
+                crop_bottom = min(bottom, math.ceil(src_bottom) + margin)
+
+                region = (left, crop_top, right, crop_bottom)
+                if factor > 1:
+                    strip = image.reduce(factor, box=region)
+                else:
+                    strip = image.crop(region)
+                if strip.mode != 'RGBA':
+                    strip = strip.convert('RGBA')
+
+                sample_box = (0, (src_top - crop_top) / factor,
+                              (right - left) / factor, (src_bottom - crop_top) / factor)
+                if strip.size == (width, y1 - y0) and sample_box == (0, 0) + strip.size:
+                    output.paste(strip, (0, y0))
+                else:
+                    output.paste(strip.resize((width, y1 - y0), Image.Resampling.LANCZOS, box=sample_box), (0, y0))
+        return output
+
+
+def load_square(path, max_size=None, fit='crop', box=None, cache=None):
+    """Square RGBA master of a source, at most max_size pixels wide
+
+    fit='crop' keeps the centered square; fit='pad' scales the whole image
+    (or just box, in source pixels) and centers it on a transparent square.
+    With a DecodedCache, a master already decoded from the same file
+    contents and options is mapped from disk instead (read-only until
+    modified).
+    """
+    if cache is not None:
+        from smartcent_icons.cache import fingerprint, make_key
+        key = make_key('square', cache.source_hash(path), max_size, fit, box and tuple(box), fingerprint())
+        return cache.load(key, lambda: load_square(path, max_size, fit, box))
+
+    source = StreamingSource(path)
+
+    if fit == 'crop':
+        box = box or source.center_square()
+        side = min(box[2] - box[0], box[3] - box[1])
+        if max_size:
+            side = min(side, max_size)
+        return source.load(box, (side, side))
+
+    if fit != 'pad':
+        raise ValueError(f"Unknown fit: {fit}")
+
+    box = box or (0, 0) + source.size
+    width, height = box[2] - box[0], box[3] - box[1]
+    side = max(width, height)
+    if max_size:
+        side = min(side, max_size)
+    content = (max(1, round(width * side / max(width, height))),
+               max(1, round(height * side / max(width, height))))
+    image = source.load(box, content)
+    if content == (side, side):
+        return image
+    square = Image.new('RGBA', (side, side), (0, 0, 0, 0))
+    square.paste(image, ((side - content[0]) // 2, (side - content[1]) // 2))
+    return square
@@ -0,0 +1,202 @@
+"""
+Supersampled Rendering for SmartCent Icons
+Draws a scene at an integer multiple of the target size and box-filters
+it down once, so the aliased ImageDraw strokes of small icons come out
+antialiased without rendering a large master
+
+The auto policy renders a size at every factor up to a reference factor
+and keeps the cheapest one whose PSNR against the reference meets a
+threshold. The reference is never larger than the old 1024px master, and
+sizes from NATIVE_SIZE up are drawn at 1x without a search: at 16px the
+bundled designs need the full 4x, at 64-256px 2x or 3x. Decisions are
+remembered in a DecisionTable on disk, keyed by scene and size, so later
+runs and pool workers render each size once.
+"""
+
+import json
+import os
+import tempfile
+
+from smartcent_icons.cache import fingerprint, make_key
+from smartcent_icons.pyramid import psnr
+
+# Supersample factors the auto policy may choose, cheapest first
+FACTORS = (1, 2, 3, 4)
+
+# Factor of the render every candidate is measured against
+REFERENCE_FACTOR = 4
+
+# Longest edge ever rendered; factors beyond it are not considered
+MAX_SUPERSAMPLED = 4096
+
+# Longest edge of an auto reference render (the old master size)
+MAX_REFERENCE = 1024
+
+# Sizes auto draws at 1x: large enough that the aliasing does not show
+NATIVE_SIZE = 512
+
+DECISIONS_NAME = '.smartcent_supersample.json'
+
+# PSNR (dB) a candidate needs against the reference
+DEFAULT_MIN_PSNR = 30.0
+
+
+def render_supersampled(scene, size, factor):
+    """Render scene at size x factor and downsample to size"""
+    if factor == 1:
+        return scene.render(size)
+    # reduce() is an exact box filter over factor x factor blocks and
+    # averages colour weighted by alpha
+    return scene.scaled(factor).render(size * factor).reduce(factor)
+
+
+class DecisionTable:
+    """Auto supersample factors on disk, by scene, size and policy settings
+
+    The table is DECISIONS_NAME in cache_dir (default: SMARTCENT_CACHE_DIR,
+    then the current directory). Keys include the toolkit fingerprint, so
+    design edits are decided again. SMARTCENT_NO_CACHE=1 leaves every size
+    undecided and stores nothing.
+    """
+
+    def __init__(self, cache_dir=None):
+        cache_dir = cache_dir or os.environ.get('SMARTCENT_CACHE_DIR') or os.getcwd()
+        self.path = os.path.join(cache_dir, DECISIONS_NAME)
+        self.enabled = os.environ.get('SMARTCENT_NO_CACHE', '') in ('', '0')
+        self.entries = None
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f).get('decisions', {})
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        if self.entries is None:
+            self.entries = self._load()
+        return self.entries.get(key)
+
+    def put(self, key, factor):
+        """Record a decision, merging with what other processes wrote"""
+        if not self.enabled:
+            return
+        self.entries = self._load()
+        self.entries[key] = factor
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f'{DECISIONS_NAME}.', suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'version': 1, 'decisions': self.entries}, f, indent=1, sort_keys=True)
+            os.replace(temp_path, self.path)
+        except OSError:
+            # Only costs a search next time
+            pass
+
+
+class SupersamplePolicy:
+    """Chooses a supersample factor per scene and size
+
+    mode is 'auto' or a fixed factor. Auto decisions are remembered for
+    the life of the policy object and, with a DecisionTable, across runs
+    and worker processes, so re-rendering a size (another palette, a
+    watch-mode rebuild, the next build) costs a single render at the
+    chosen factor.
+    """
+
+    def __init__(self, mode='auto', min_psnr=DEFAULT_MIN_PSNR, factors=FACTORS,
+                 reference=REFERENCE_FACTOR, table=None):
+        if mode != 'auto':
+            mode = int(mode)
+            if mode < 1:
+                raise ValueError(f"Supersample factor must be at least 1, not {mode}")
+        self.mode = mode
+        self.min_psnr = min_psnr
+        self.factors = tuple(sorted(factors))
+        self.reference = reference
+        self.table = table
+        self.decisions = {}
+
+    def key(self):
+        """Build-cache key part: everything that changes the pixels"""
+        if self.mode == 'auto':
+            return make_key('supersample', 'auto', self.min_psnr, self.factors, self.reference)
+        return make_key('supersample', self.mode)
+
+    def _max_factor(self, size):
+        return max(1, MAX_SUPERSAMPLED // size)
+
+    def _table_key(self, scene, size):
+        return make_key(fingerprint(), repr(scene.key()), size, self.min_psnr, self.factors, self.reference)
+
+    def _decide(self, scene, size):
+        """(factor, image) for the cheapest factor within min_psnr of the
+        reference; image is None when nothing had to be rendered"""
+        if size >= NATIVE_SIZE:
+            return 1, None
+        if self.table is not None:
+            factor = self.table.get(self._table_key(scene, size))
+            if factor is not None:
+                return factor, None
+        factor, image = self._search(scene, size)
+        if self.table is not None:
+            self.table.put(self._table_key(scene, size), factor)
+        return factor, image
+
+    def _search(self, scene, size):
+        reference_factor = max(1, min(self.reference, self._max_factor(size), MAX_REFERENCE // size))
+        reference = render_supersampled(scene, size, reference_factor)
+        for factor in self.factors:
+            if factor >= reference_factor:
+                break
+            candidate = render_supersampled(scene, size, factor)
+            if psnr(candidate, reference) >= self.min_psnr:
+                return factor, candidate
+        return reference_factor, reference
+
+    def factor_for(self, scene, size):
+        """Supersample factor used for scene at size"""
+        if self.mode != 'auto':
+            return min(self.mode, self._max_factor(size))
+        decision = (scene.key(), size)
+        if decision not in self.decisions:
+            self.decisions[decision] = self._decide(scene, size)[0]
+        return self.decisions[decision]
+
+    def render(self, scene, size):
+        """Render scene at size with the chosen factor"""
+        if self.mode == 'auto':
+            decision = (scene.key(), size)
+            if decision not in self.decisions:
+                factor, image = self._decide(scene, size)
+                self.decisions[decision] = factor
+                if image is not None:
+                    return image
+        return render_supersampled(scene, size, self.factor_for(scene, size))
+
+
+def policy_from_env(default='auto'):
+    """Policy from SMARTCENT_SUPERSAMPLE ('auto' or a factor such as 1, 2, 4),
+    remembering auto decisions in the default DecisionTable"""
+    return SupersamplePolicy(os.environ.get('SMARTCENT_SUPERSAMPLE') or default, table=DecisionTable())
+
+
+class SupersampledRenderer:
+    """A render(size) function for export_sizes() and manifest.execute()
+
+    Picklable, so each export worker keeps its own policy decisions.
+    """
+
+    def __init__(self, scene, policy=None):
+        self.scene = scene
+        self.policy = policy or policy_from_env()
+
+    def key(self):
+        """Build-cache key part for the scene and supersample settings"""
+        return make_key(repr(self.scene.key()), self.policy.key())
+
+    def __call__(self, size):
+        return self.policy.render(self.scene, size)
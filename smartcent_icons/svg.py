@@ -0,0 +1,354 @@
+"""
+Minimal SVG Renderer for SmartCent Icons
+Pure Pillow/NumPy renderer for the subset of SVG our app icon uses
+
+Supported: <g> with translate/scale transforms and inherited presentation
+attributes, <circle>, <ellipse>, <rect>, <line>, <path> (M/L/H/V/Q/C/Z,
+absolute and relative), solid colors and objectBoundingBox
+<linearGradient> paints, opacity/fill-opacity/stroke-opacity and round
+line caps. Filters are ignored. Shapes are supersampled and only their
+bounding box is rasterized, so a parsed document renders any size quickly.
+"""
+
+import math
+import re
+import xml.etree.ElementTree as ET
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+SVG_NS = '{http://www.w3.org/2000/svg}'
+
+INHERITED = ('fill', 'stroke', 'stroke-width', 'stroke-linecap', 'fill-opacity', 'stroke-opacity')
+
+_NUMBER = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+_PATH_TOKEN = re.compile(r'[MmLlHhVvQqCcZz]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+
+def _tag(element):
+    return element.tag.replace(SVG_NS, '')
+
+
+def _style(element):
+    """Merge the style attribute into the element attributes"""
+    attrs = dict(element.attrib)
+    for declaration in attrs.pop('style', '').split(';'):
+        if ':' in declaration:
+            key, value = declaration.split(':', 1)
+            attrs[key.strip()] = value.strip()
+    return attrs
+
+
+def _length(value, default=0.0):
+    if value is None:
+        return default
+    value = value.strip()
+    if value.endswith('%'):
+        return float(value[:-1]) / 100
+    return float(_NUMBER.match(value).group())
+
+
+def _color(value):
+    """Parse #rgb / #rrggbb / named black and white into an RGB tuple"""
+    value = value.strip().lower()
+    if value in ('black', 'white'):
+        return (0, 0, 0) if value == 'black' else (255, 255, 255)
+    value = value.lstrip('#')
+    if len(value) == 3:
+        value = ''.join(c * 2 for c in value)
+    return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def _transform(value, matrix):
+    """Apply translate()/scale() transforms to an (a, d, e, f) scale+offset matrix"""
+    a, d, e, f = matrix
+    for name, args in re.findall(r'(\w+)\s*\(([^)]*)\)', value or ''):
+        numbers = [float(n) for n in _NUMBER.findall(args)]
+        if name == 'translate':
+            tx = numbers[0]
+            ty = numbers[1] if len(numbers) > 1 else 0.0
+            e, f = e + a * tx, f + d * ty
+        elif name == 'scale':
+            sx = numbers[0]
+            sy = numbers[1] if len(numbers) > 1 else sx
+            a, d = a * sx, d * sy
+    return (a, d, e, f)
+
+
+def _flatten_path(data, steps=16):
+    """Turn path data into a list of subpaths, each a list of points"""
+    tokens = _PATH_TOKEN.findall(data)
+    subpaths, points = [], []
+    x = y = start_x = start_y = 0.0
+    command = None
+    index = 0
+
+    def take(count):
+        nonlocal index
+        values = [float(t) for t in tokens[index:index + count]]
+        index += count
+        return values
+
+    while index < len(tokens):
+        if tokens[index].isalpha():
+            command = tokens[index]
+            index += 1
+            if command in 'Zz':
+                if points:
+                    points.append((start_x, start_y))
+                    subpaths.append(points)
+                points = []
+                x, y = start_x, start_y
+                continue
+
+        relative = command.islower()
+        ox, oy = (x, y) if relative else (0.0, 0.0)
+        op = command.upper()
+
+        if op == 'M':
+            if points:
+                subpaths.append(points)
+            px, py = take(2)
+            x, y = ox + px, oy + py
+            start_x, start_y = x, y
+            points = [(x, y)]
+            command = 'l' if relative else 'L'
+        elif op == 'L':
+            px, py = take(2)
+            x, y = ox + px, oy + py
+            points.append((x, y))
+        elif op == 'H':
+            x = ox + take(1)[0]
+            points.append((x, y))
+        elif op == 'V':
+            y = oy + take(1)[0]
+            points.append((x, y))
+        elif op == 'Q':
+            cx, cy, px, py = take(4)
+            c = (ox + cx, oy + cy)
+            end = (ox + px, oy + py)
+            for i in range(1, steps + 1):
+                t = i / steps
+                points.append((
+                    (1 - t) ** 2 * x + 2 * (1 - t) * t * c[0] + t ** 2 * end[0],
+                    (1 - t) ** 2 * y + 2 * (1 - t) * t * c[1] + t ** 2 * end[1],
+                ))
+            x, y = end
+        elif op == 'C':
+            c1x, c1y, c2x, c2y, px, py = take(6)
+            c1 = (ox + c1x, oy + c1y)
+            c2 = (ox + c2x, oy + c2y)
+            end = (ox + px, oy + py)
+            for i in range(1, steps + 1):
+                t = i / steps
+                u = 1 - t
+                points.append((
+                    u ** 3 * x + 3 * u * u * t * c1[0] + 3 * u * t * t * c2[0] + t ** 3 * end[0],
+                    u ** 3 * y + 3 * u * u * t * c1[1] + 3 * u * t * t * c2[1] + t ** 3 * end[1],
+                ))
+            x, y = end
+        else:
+            raise ValueError(f"Unsupported path command: {command}")
+
+    if points:
+        subpaths.append(points)
+    return subpaths
+
+
+class Shape:
+    """One drawable primitive in document units, with its resolved style"""
+
+    def __init__(self, kind, geometry, style, opacity):
+        self.kind = kind
+        self.geometry = geometry
+        self.style = style
+        self.opacity = opacity
+
+    def bbox(self):
+        """Geometry bounding box (x0, y0, x1, y1) in document units"""
+        if self.kind == 'ellipse':
+            cx, cy, rx, ry = self.geometry
+            return (cx - rx, cy - ry, cx + rx, cy + ry)
+        xs = [p[0] for sub in self.geometry for p in sub]
+        ys = [p[1] for sub in self.geometry for p in sub]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+
+class SvgDocument:
+    """A parsed SVG, ready to render at any pixel size"""
+
+    def __init__(self, source):
+        root = ET.parse(source).getroot()
+        view_box = root.get('viewBox')
+        if view_box:
+            self.origin_x, self.origin_y, self.width, self.height = [float(v) for v in _NUMBER.findall(view_box)]
+        else:
+            self.origin_x = self.origin_y = 0.0
+            self.width = _length(root.get('width'), 100.0)
+            self.height = _length(root.get('height'), 100.0)
+
+        self.gradients = {}
+        for element in root.iter():
+            if _tag(element) == 'linearGradient':
+                self.gradients[element.get('id')] = self._parse_gradient(element)
+
+        self.shapes = []
+        self._walk(root, {'fill': '#000000'}, 1.0, (1.0, 1.0, -self.origin_x, -self.origin_y))
+
+    def _parse_gradient(self, element):
+        vector = tuple(_length(element.get(name), default) for name, default in
+                       (('x1', 0.0), ('y1', 0.0), ('x2', 1.0), ('y2', 0.0)))
+        stops = []
+        for stop in element:
+            if _tag(stop) != 'stop':
+                continue
+            attrs = _style(stop)
+            stops.append((
+                _length(attrs.get('offset'), 0.0),
+                _color(attrs.get('stop-color', '#000000')),
+                float(attrs.get('stop-opacity', 1.0)),
+            ))
+        return vector, stops
+
+    def _walk(self, element, inherited, opacity, matrix):
+        for child in element:
+            tag = _tag(child)
+            if tag in ('defs', 'linearGradient', 'radialGradient', 'filter') or not isinstance(child.tag, str):
+                continue
+
+            attrs = _style(child)
+            style = dict(inherited)
+            style.update({k: attrs[k] for k in INHERITED if k in attrs})
+            child_opacity = opacity * float(attrs.get('opacity', 1.0))
+            child_matrix = _transform(attrs.get('transform'), matrix)
+
+            if tag == 'g':
+                self._walk(child, style, child_opacity, child_matrix)
+                continue
+
+            shape = self._shape(tag, attrs, child_matrix)
+            if shape is not None:
+                kind, geometry = shape
+                self.shapes.append(Shape(kind, geometry, style, child_opacity))
+
+    def _shape(self, tag, attrs, matrix):
+        a, d, e, f = matrix
+
+        def point(px, py):
+            return (a * px + e, d * py + f)
+
+        def num(name):
+            return _length(attrs.get(name), 0.0)
+
+        if tag in ('circle', 'ellipse'):
+            cx, cy = point(num('cx'), num('cy'))
+            rx = num('r') if tag == 'circle' else num('rx')
+            ry = num('r') if tag == 'circle' else num('ry')
+            return 'ellipse', (cx, cy, abs(a) * rx, abs(d) * ry)
+        if tag == 'rect':
+            x, y, w, h = num('x'), num('y'), num('width'), num('height')
+            corners = [point(x, y), point(x + w, y), point(x + w, y + h), point(x, y + h), point(x, y)]
+            return 'path', [corners]
+        if tag == 'line':
+            return 'path', [[point(num('x1'), num('y1')), point(num('x2'), num('y2'))]]
+        if tag == 'path':
+            subpaths = [[point(px, py) for px, py in sub] for sub in _flatten_path(attrs.get('d', ''))]
+            return 'path', [sub for sub in subpaths if sub]
+        return None
+
+    def render(self, size, supersample=4):
+        """Rasterize the document to a square RGBA image of size x size pixels"""
+        canvas = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        scale = size / max(self.width, self.height)
+        for shape in self.shapes:
+            for paint_key, opacity_key in (('fill', 'fill-opacity'), ('stroke', 'stroke-opacity')):
+                paint = shape.style.get(paint_key, 'none')
+                if paint == 'none' or (paint_key == 'fill' and shape.kind == 'path' and self._is_open(shape)):
+                    continue
+                opacity = shape.opacity * float(shape.style.get(opacity_key, 1.0))
+                self._draw(canvas, shape, paint_key, paint, opacity, scale, supersample)
+        return canvas
+
+    @staticmethod
+    def _is_open(shape):
+        """Lines and unclosed two-point paths have no fill area"""
+        return all(len(sub) < 3 for sub in shape.geometry)
+
+    def _draw(self, canvas, shape, mode, paint, opacity, scale, ss):
+        stroke_width = _length(shape.style.get('stroke-width'), 1.0) if mode == 'stroke' else 0.0
+        pad = stroke_width / 2 + 1
+
+        x0, y0, x1, y1 = shape.bbox()
+        left = max(0, int(math.floor((x0 - pad) * scale)))
+        top = max(0, int(math.floor((y0 - pad) * scale)))
+        right = min(canvas.size[0], int(math.ceil((x1 + pad) * scale)))
+        bottom = min(canvas.size[1], int(math.ceil((y1 + pad) * scale)))
+        if right <= left or bottom <= top:
+            return
+
+        # Draw coverage supersampled over the shape's box only, then box-filter down
+        mask = Image.new('L', ((right - left) * ss, (bottom - top) * ss), 0)
+        draw = ImageDraw.Draw(mask)
+        k = scale * ss
+
+        def device(px, py):
+            return ((px * scale - left) * ss, (py * scale - top) * ss)
+
+        if shape.kind == 'ellipse':
+            cx, cy, rx, ry = shape.geometry
+            dcx, dcy = device(cx, cy)
+            if mode == 'fill':
+                draw.ellipse([dcx - rx * k, dcy - ry * k, dcx + rx * k, dcy + ry * k], fill=255)
+            else:
+                half = stroke_width * k / 2
+                draw.ellipse([dcx - rx * k - half, dcy - ry * k - half, dcx + rx * k + half, dcy + ry * k + half],
+                             outline=255, width=max(1, round(stroke_width * k)))
+        else:
+            for sub in shape.geometry:
+                points = [device(px, py) for px, py in sub]
+                if mode == 'fill':
+                    draw.polygon(points, fill=255)
+                else:
+                    width = max(1, round(stroke_width * k))
+                    draw.line(points, fill=255, width=width, joint='curve')
+                    if shape.style.get('stroke-linecap') == 'round':
+                        r = width / 2
+                        for px, py in (points[0], points[-1]):
+                            draw.ellipse([px - r, py - r, px + r, py + r], fill=255)
+
+        coverage = np.asarray(mask.reduce(ss), dtype=np.float32) / 255
+        box = (left, top, right, bottom)
+        rgb, alpha = self._paint(paint, shape, box, scale)
+
+        layer = np.empty(coverage.shape + (4,), dtype=np.uint8)
+        layer[..., :3] = rgb
+        layer[..., 3] = np.clip(coverage * alpha * opacity * 255 + 0.5, 0, 255).astype(np.uint8)
+        canvas.alpha_composite(Image.fromarray(layer, 'RGBA'), dest=(left, top))
+
+    def _paint(self, paint, shape, box, scale):
+        """Resolve a paint into per-pixel RGB and alpha arrays over a device box"""
+        left, top, right, bottom = box
+        height, width = bottom - top, right - left
+
+        match = re.match(r'url\(#([^)]+)\)', paint)
+        if not match or match.group(1) not in self.gradients:
+            return np.array(_color(paint), dtype=np.float32), 1.0
+
+        (gx1, gy1, gx2, gy2), stops = self.gradients[match.group(1)]
+        bx0, by0, bx1, by1 = shape.bbox()
+        bw, bh = max(bx1 - bx0, 1e-6), max(by1 - by0, 1e-6)
+
+        # Pixel centers in objectBoundingBox units
+        u = ((np.arange(left, right) + 0.5) / scale - bx0) / bw
+        v = ((np.arange(top, bottom) + 0.5) / scale - by0) / bh
+        dx, dy = gx2 - gx1, gy2 - gy1
+        length = dx * dx + dy * dy or 1.0
+        t = ((u[np.newaxis, :] - gx1) * dx + (v[:, np.newaxis] - gy1) * dy) / length
+        t = np.clip(t, 0.0, 1.0)
+
+        offsets = [s[0] for s in stops]
+        rgb = np.empty((height, width, 3), dtype=np.float32)
+        for channel in range(3):
+            rgb[..., channel] = np.interp(t, offsets, [s[1][channel] for s in stops])
+        alpha = np.interp(t, offsets, [s[2] for s in stops]).astype(np.float32)
+        return rgb, alpha
@@ -0,0 +1,200 @@
+"""
+Palette Variants for SmartCent Icons
+Renders a design's geometry once as per-color coverage masks and colors
+it for any number of palettes with one matrix product each
+
+Every layer composites flat-colored shapes, gradients and overlays onto
+the canvas below it, which is affine in both the layer's colors and that
+canvas: out = canvas * T + sum(weight_i * color_i). Each layer is painted
+once with its color parameters (and the canvas) set to unit red, green
+and blue, three unknowns per paint, which reads off T and every weight_i.
+Folding the layers together leaves one weight map per distinct color of
+the whole scene, so a palette costs (pixels x colors) @ (colors x RGB)
+instead of a full render.
+
+Layers must take every color they draw from their parameters (tuples of
+three ints) and must not branch on color values; the bundled designs do.
+"""
+
+import numpy as np
+from PIL import Image
+
+from smartcent_icons.instrument import stage
+
+_CHANNELS = 3
+
+
+def is_color(value):
+    """True for an (r, g, b) parameter"""
+    return (isinstance(value, tuple) and len(value) == 3
+            and all(isinstance(part, int) and not isinstance(part, bool) for part in value))
+
+
+def parse_color(value):
+    """(r, g, b) from '#rrggbb', 'r,g,b' or a sequence of three ints"""
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith('#') and len(text) == 7:
+            return tuple(int(text[i:i + 2], 16) for i in (1, 3, 5))
+        value = text.split(',')
+    parts = tuple(int(part) for part in value)
+    if len(parts) != 3 or not all(0 <= part <= 255 for part in parts):
+        raise ValueError(f"Not an RGB color: {value!r}")
+    return parts
+
+
+def _check_geometry(scenes):
+    """Raise ValueError unless the scenes differ in color parameters only"""
+    first = scenes[0]
+    for scene in scenes[1:]:
+        if [(layer.name, layer.paint) for layer in scene.layers] != \
+                [(layer.name, layer.paint) for layer in first.layers]:
+            raise ValueError(f"Scene {scene.name} does not have the layers of {first.name}")
+        for layer, base in zip(scene.layers, first.layers):
+            shape = {name: value for name, value in layer.params.items() if not is_color(value)}
+            base_shape = {name: value for name, value in base.params.items() if not is_color(value)}
+            if shape != base_shape or set(layer.params) != set(base.params):
+                raise ValueError(f"Layer {layer.name} of {scene.name} differs in more than its colors")
+
+
+def _probe_canvas(mode, alpha, channel):
+    """Canvas of the previous layer's alpha, unit color in channel (or black)"""
+    pixels = np.zeros(alpha.shape + (len(mode),), dtype=np.uint8)
+    if channel is not None:
+        pixels[..., channel] = 255
+    if mode == 'RGBA':
+        pixels[..., 3] = alpha
+    return Image.fromarray(pixels, mode)
+
+
+class CoverageMasks:
+    """The geometry of a set of same-shaped scenes at one size
+
+    weights holds one flattened coverage map per distinct color (columns x
+    pixels, float32); colors[column] lists that column's color in each
+    scene. alpha and mode are shared by all variants of the geometry.
+    """
+
+    def __init__(self, size, weights, colors, alpha, mode, variants):
+        self.size = size
+        self.variants = variants
+        self.weights = weights
+        self.colors = colors
+        self.alpha = alpha
+        self.mode = mode
+
+    def colorize(self, index):
+        """The image of scene index"""
+        palette = np.array([column[index] for column in self.colors], dtype=np.float32).reshape(-1, 3)
+        with stage('colorize', size=self.size):
+            rgb = self.weights.T @ palette
+            pixels = np.empty((self.size * self.size, len(self.mode)), dtype=np.uint8)
+            pixels[:, :3] = np.clip(rgb + 0.5, 0, 255)
+            if self.mode == 'RGBA':
+                pixels[:, 3] = self.alpha.reshape(-1)
+            return Image.fromarray(pixels.reshape(self.size, self.size, -1), self.mode)
+
+
+def _reduce(weights, alpha, size, factor):
+    """Box-filter supersampled weights down by factor, weighting by alpha
+    as Image.reduce() does"""
+    weights = weights.reshape(len(weights), size * factor, size * factor)
+    opaque = alpha.min() == 255
+    alpha = alpha.astype(np.float32)
+    # One strided add per offset in the block beats summing over block axes
+    weighted = np.zeros((len(weights), size, size), dtype=np.float32)
+    coverage = np.zeros((size, size), dtype=np.float32)
+    for dy in range(factor):
+        for dx in range(factor):
+            if opaque:
+                weighted += weights[:, dy::factor, dx::factor]
+            else:
+                weighted += weights[:, dy::factor, dx::factor] * alpha[dy::factor, dx::factor]
+            coverage += alpha[dy::factor, dx::factor]
+    if opaque:
+        weighted *= np.float32(1 / (factor * factor))
+    else:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weighted = np.where(coverage > 0, weighted / coverage, np.float32(0))
+    reduced_alpha = np.clip(coverage / (factor * factor) + 0.5, 0, 255).astype(np.uint8)
+    return weighted.reshape(len(weighted), -1), reduced_alpha
+
+
+def _columns(scenes):
+    """Index of every distinct color, keyed by its value in each scene"""
+    columns = {}
+    for index, layer in enumerate(scenes[0].layers):
+        for name, value in layer.params.items():
+            if is_color(value):
+                columns.setdefault(tuple(scene.layers[index].params[name] for scene in scenes), len(columns))
+    return columns
+
+
+def coverage_masks(scenes, size, factor=1):
+    """CoverageMasks of scenes that differ only in their colors
+
+    factor supersamples as render_supersampled() does. Each layer is
+    painted once per three unknowns (its colors plus the canvas below it),
+    about one paint per layer for the bundled designs; with the float32
+    weight updates the masks cost roughly 1.5-4x one render (the cheaper
+    the design, the higher the ratio), paid once for every variant.
+    """
+    scenes = list(scenes)
+    if not scenes:
+        raise ValueError("No scenes to render")
+    _check_geometry(scenes)
+    base = scenes[0].scaled(factor)
+    canvas_size = size * factor
+    columns = _columns(scenes)
+    weights = np.zeros((len(columns), canvas_size * canvas_size), dtype=np.float32)
+
+    alpha, mode = None, None
+    filled = 0            # columns painted so far
+    with stage('coverage', scene=scenes[0].name, size=size, variants=len(scenes)):
+        for index, layer in enumerate(base.layers):
+            names = [name for name, value in layer.params.items() if is_color(value)]
+            unknowns = ([None] if alpha is not None else []) + names
+            transmit = None
+            added = []
+            for start in range(0, max(len(unknowns), 1), _CHANNELS):
+                chunk = unknowns[start:start + _CHANNELS]
+                params = {name: (0, 0, 0) for name in names}
+                canvas_channel = None
+                for channel, name in enumerate(chunk):
+                    if name is None:
+                        canvas_channel = channel
+                    else:
+                        params[name] = tuple(255 if c == channel else 0 for c in range(_CHANNELS))
+                canvas = None if alpha is None else _probe_canvas(mode, alpha, canvas_channel)
+                out = layer.paint(canvas, canvas_size, **dict(layer.params, **params))
+                pixels = np.asarray(out).reshape(canvas_size * canvas_size, -1)
+                for channel, name in enumerate(chunk):
+                    if name is None:
+                        transmit = pixels[:, channel] * np.float32(1 / 255)
+                    else:
+                        added.append((name, pixels[:, channel]))
+
+            # What the layer covers hides the colors below it
+            if transmit is None:
+                weights[:filled] = 0
+            else:
+                weights[:filled] *= transmit
+            for name, weight in added:
+                column = columns[tuple(scene.layers[index].params[name] for scene in scenes)]
+                weights[column] += weight * np.float32(1 / 255)
+                filled = max(filled, column + 1)
+
+            mode = out.mode
+            alpha = (np.asarray(out)[..., 3] if mode == 'RGBA'
+                     else np.full((canvas_size, canvas_size), 255, dtype=np.uint8))
+
+        if factor > 1:
+            weights, alpha = _reduce(weights, alpha, size, factor)
+    return CoverageMasks(size, weights, list(columns), alpha, mode, len(scenes))
+
+
+def render_variants(scenes, size, factor=1):
+    """Images of scenes that differ only in their colors, from one
+    geometry pass"""
+    masks = coverage_masks(scenes, size, factor)
+    return [masks.colorize(index) for index in range(masks.variants)]
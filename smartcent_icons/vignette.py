@@ -0,0 +1,62 @@
+"""
+Vignette Stage for SmartCent Icons
+Darkens the edges of an icon with a cached, precomputed falloff mask
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+
+@lru_cache(maxsize=32)
+def _distance_field(size):
+    """Distance of every pixel from the icon center (read-only, cached per size)"""
+    center = size // 2
+    offsets = (np.arange(size, dtype=np.int64) - center) ** 2
+    distance = np.sqrt(np.add.outer(offsets, offsets).astype(np.float64))
+    distance.flags.writeable = False
+    return distance
+
+
+@lru_cache(maxsize=32)
+def vignette_mask(size, inner_radius=0.7, strength=0.15, curve=1.0):
+    """Build the vignette alpha mask for a square icon
+
+    inner_radius is a fraction of the half-size where darkening starts,
+    strength is the alpha reached at the corners (0-1) and curve shapes
+    the falloff (1.0 is linear, larger values keep the middle clearer).
+    The returned image is shared between callers and must not be modified.
+    """
+    center = size // 2
+    max_distance = math.sqrt(2 * (center ** 2))
+    start = center * inner_radius
+    span = max_distance - start
+
+    distance = _distance_field(size)
+    if span > 0:
+        ratio = np.minimum((distance - start) / span, 1.0)
+    else:
+        ratio = np.zeros_like(distance)
+
+    ratio = np.where(distance > start, ratio, 0.0)
+    if curve != 1.0:
+        ratio = np.power(np.clip(ratio, 0.0, 1.0), curve)
+
+    alpha = (255 * strength * ratio).astype(np.uint8)
+    return Image.fromarray(alpha, 'L')
+
+
+@lru_cache(maxsize=32)
+def _vignette_overlay(size, inner_radius, strength, curve, color):
+    """Solid color overlay carrying the vignette mask as its alpha"""
+    overlay = Image.new('RGBA', (size, size), (*color, 0))
+    overlay.putalpha(vignette_mask(size, inner_radius, strength, curve))
+    return overlay
+
+
+def apply_vignette(image, inner_radius=0.7, strength=0.15, curve=1.0, color=(0, 0, 0)):
+    """Composite a vignette over a square RGBA image"""
+    overlay = _vignette_overlay(image.size[0], inner_radius, strength, curve, tuple(color))
+    return Image.alpha_composite(image, overlay)
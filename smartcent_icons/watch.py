@@ -0,0 +1,294 @@
+"""
+Watch Mode for SmartCent Icons
+Re-exports a target set whenever its source image, SVG or the target spec
+changes, touching only the outputs that depend on what changed
+
+Changes are picked up through inotify on Linux (via ctypes, watching the
+parent directories so editors that save by rename are seen too) and by
+polling file stats everywhere else. Bursts of events are debounced into
+one rebuild. Each set keeps its decoded source and resolution pyramid in
+memory, so a spec edit re-exports from the warm pyramid, and the build
+cache skips every output whose inputs did not change.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+from smartcent_icons.cache import BuildCache, fingerprint, hash_file, make_key
+from smartcent_icons.manifest import SPEC_PATH, PlannedOutput, execute, load_spec, load_targets, plan
+
+# Quiet period that ends a burst of change events (seconds)
+DEFAULT_DEBOUNCE = 0.15
+
+# Stat interval of the polling watcher (seconds)
+POLL_INTERVAL = 0.5
+
+# Encoder settings used with draft=True: fast zlib, no optimize pass
+DRAFT_PNG_OPTIONS = {'compress_level': 1}
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_ATTRIB | _IN_MODIFY
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+def _file_state(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class PollingWatcher:
+    """Reports files whose mtime or size changed, checked every interval"""
+
+    name = 'polling'
+
+    def __init__(self, paths, interval=POLL_INTERVAL):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.interval = interval
+        self.states = {path: _file_state(path) for path in self.paths}
+
+    def wait(self, timeout=None):
+        """Changed paths, waiting up to timeout seconds (None: until one changes)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in self.paths:
+                state = _file_state(path)
+                if state != self.states[path]:
+                    self.states[path] = state
+                    changed.add(path)
+            if changed:
+                return changed
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            delay = self.interval if deadline is None else min(self.interval, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify on the directories of the watched files"""
+
+    name = 'inotify'
+
+    def __init__(self, paths):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.paths = {os.path.abspath(path) for path in paths}
+        self.directories = {}
+        for directory in sorted({os.path.dirname(path) for path in self.paths}):
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                os.close(self.fd)
+                raise OSError(error, f"inotify_add_watch failed for {directory}")
+            self.directories[wd] = directory
+
+    def _read(self):
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                name = data[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b'\0')
+                offset += _EVENT_HEADER.size + length
+                directory = self.directories.get(wd)
+                if directory is not None and name:
+                    path = os.path.join(directory, os.fsdecode(name))
+                    if path in self.paths:
+                        changed.add(path)
+
+    def wait(self, timeout=None):
+        """Changed paths, waiting up to timeout seconds (None: until one changes)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return set()
+            changed = self._read()
+            if changed:
+                return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def make_watcher(paths, backend='auto'):
+    """An inotify watcher where available, otherwise a polling one"""
+    if backend in ('auto', 'inotify'):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError):
+            if backend == 'inotify':
+                raise
+    return PollingWatcher(paths)
+
+
+def changes(watcher, debounce=DEFAULT_DEBOUNCE):
+    """Yield sets of changed paths, one per debounced burst of events"""
+    while True:
+        changed = watcher.wait()
+        while True:
+            more = watcher.wait(debounce)
+            if not more:
+                break
+            changed |= more
+        yield changed
+
+
+class SessionCache(BuildCache):
+    """A BuildCache kept in memory for one watch session (used with no
+    on-disk cache, so spec edits still only re-export what changed)"""
+
+    def __init__(self):
+        self.path = None
+        self.enabled = True
+        self.entries = {}
+        self._dirty = False
+
+    def save(self):
+        pass
+
+
+class SetBuilder:
+    """Exports one target set from one source and keeps the source warm
+
+    The decoded master and its pyramid (or the SVG rasterizer) are only
+    rebuilt when the source file changes; the plan only when the spec
+    changes. draft=True writes PNGs with fast zlib settings for quick
+    previews; those outputs get their own cache keys, so a normal build
+    still rewrites them properly. Without a cache, a SessionCache remembers
+    what this builder wrote.
+    """
+
+    def __init__(self, set_name, source=None, path_vars=None, spec_path=None, workers=None, cache=None,
+                 draft=False, fit='crop', rasterizer=None, optimizer=None):
+        self.set_name = set_name
+        self.spec_path = os.path.abspath(spec_path or SPEC_PATH)
+        self.path_vars = path_vars or {}
+        self.workers = workers
+        self.cache = cache if cache is not None else SessionCache()
+        self.draft = draft
+        self.fit = fit
+        self.rasterizer_backend = rasterizer
+        self.optimizer = None if draft else optimizer
+
+        spec = load_spec(self.spec_path)
+        if set_name not in spec.get('sets', {}):
+            raise ValueError(f"Unknown target set: {set_name}")
+        source = source or spec['sets'][set_name].get('source')
+        if not source:
+            raise ValueError(f"Target set '{set_name}' has no default source")
+        if not os.path.isfile(source):
+            raise ValueError(f"Watch mode needs an image or SVG file as source: {source}")
+        self.source = os.path.abspath(source)
+        self.planned = None
+        self.pixels = None
+        self.base_key = None
+
+    @property
+    def inputs(self):
+        """Files whose changes this set depends on"""
+        return [self.source, self.spec_path]
+
+    def _plan(self):
+        try:
+            planned = plan(load_targets(self.set_name, load_spec(self.spec_path), **self.path_vars))
+        except KeyError as e:
+            raise ValueError(f"Target set '{self.set_name}' needs a value for {{{e.args[0]}}} in its paths")
+        if self.draft:
+            planned = [PlannedOutput(output.job._replace(options=DRAFT_PNG_OPTIONS), output.targets)
+                       if output.job.format == 'PNG' else output
+                       for output in planned]
+        return planned
+
+    def _load(self):
+        key = make_key(hash_file(self.source), self.fit, fingerprint(), draft=self.draft)
+        if self.source.lower().endswith('.svg'):
+            from smartcent_icons.rasterize import get_rasterizer
+            rasterizer = get_rasterizer(self.source, self.rasterizer_backend)
+            return {'rasterizer': rasterizer}, make_key(key, rasterizer.name)
+
+        from smartcent_icons.pixelcache import DecodedCache
+        from smartcent_icons.pyramid import ResolutionPyramid
+        from smartcent_icons.source import load_square
+        max_size = max(output.job.size for output in self.planned)
+        decoded = None if isinstance(self.cache, SessionCache) else DecodedCache(os.path.dirname(self.cache.path))
+        master = load_square(self.source, max_size=2 * max_size, fit=self.fit, cache=decoded)
+        return {'source': ResolutionPyramid(master)}, key
+
+    def build(self, changed=None):
+        """Export whatever the changed paths (default: everything) affect;
+        returns the ExportResults of the whole set"""
+        changed = None if changed is None else {os.path.abspath(path) for path in changed}
+        if self.planned is None or changed is None or self.spec_path in changed:
+            previous_max = max((output.job.size for output in self.planned), default=0) if self.planned else 0
+            self.planned = self._plan()
+            # A larger biggest target needs a larger master
+            if self.pixels is not None and max(output.job.size for output in self.planned) > previous_max:
+                self.pixels = None
+        if self.pixels is None or changed is None or self.source in changed:
+            self.pixels, self.base_key = self._load()
+
+        results = execute(self.planned, workers=self.workers, cache=self.cache, base_key=self.base_key,
+                          optimizer=self.optimizer, **self.pixels)
+        self.cache.save()
+        return results
+
+
+def watch(builders, on_build, debounce=DEFAULT_DEBOUNCE, backend='auto', on_error=None):
+    """Build every set once, then rebuild the sets affected by each burst
+    of changes until interrupted
+
+    on_build(builder, changed, results, seconds) is called after every
+    build; on_error(builder, exception) when one fails (default: raise).
+    """
+    def run(builder, changed):
+        start = time.perf_counter()
+        try:
+            results = builder.build(changed)
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(builder, e)
+            return
+        on_build(builder, changed, results, time.perf_counter() - start)
+
+    for builder in builders:
+        run(builder, None)
+
+    paths = sorted({path for builder in builders for path in builder.inputs})
+    watcher = make_watcher(paths, backend)
+    try:
+        for changed in changes(watcher, debounce):
+            for builder in builders:
+                affected = changed & set(builder.inputs)
+                if affected:
+                    run(builder, affected)
+    finally:
+        watcher.close()
@@ -0,0 +1,93 @@
+"""
+Tests for the batched Inkscape backend, run against a stub Inkscape
+that logs each invocation and writes a PNG for every export-filename
+"""
+
+import importlib.util
+import os
+import shutil
+import stat
+import sys
+
+import pytest
+from PIL import Image
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from smartcent_icons.adaptive import adaptive_outputs
+from smartcent_icons.inkscape import InkscapeBatch
+from smartcent_icons.manifest import load_targets, plan
+
+STUB = '''#!{python}
+import sys
+from PIL import Image
+
+with open({log!r}, 'a') as log:
+    log.write(' '.join(sys.argv[1:]) + '\\n')
+actions = [arg[len('--actions='):] for arg in sys.argv[1:] if arg.startswith('--actions=')]
+path = None
+for action in (actions[0].split(';') if actions else []):
+    name, _, value = action.partition(':')
+    if name == 'export-filename':
+        path = value
+    elif name == 'export-width':
+        Image.new('RGBA', (int(value), int(value)), (30, 60, 114, 255)).save(path)
+'''
+
+
+@pytest.fixture
+def inkscape(tmp_path, monkeypatch):
+    """Path of the invocation log of a stub Inkscape installed as INKSCAPE"""
+    log = tmp_path / 'inkscape.log'
+    script = tmp_path / 'inkscape'
+    script.write_text(STUB.format(python=sys.executable, log=str(log)))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv('INKSCAPE', str(script))
+    monkeypatch.setenv('SMARTCENT_RASTERIZER', 'inkscape')
+    monkeypatch.setenv('SMARTCENT_CACHE_DIR', str(tmp_path))
+    return log
+
+
+def invocations(log):
+    return log.read_text().splitlines() if log.exists() else []
+
+
+def test_batch_exports_each_size_once(inkscape, tmp_path):
+    batch = InkscapeBatch(os.path.join(ROOT, 'assets', 'icons', 'app_icon.svg'))
+    outputs = [(tmp_path / 'out' / f'{name}.png', size)
+               for name, size in (('a', 48), ('b', 48), ('c', 96), ('d', 20), ('e', 96))]
+    for path, size in outputs:
+        batch.add(str(path), size)
+
+    results = batch.run()
+
+    assert len(invocations(inkscape)) == 1
+    assert invocations(inkscape)[0].count('export-do') == 3
+    assert [result.ok for result in results] == [True] * len(outputs)
+    for path, size in outputs:
+        with Image.open(path) as image:
+            assert image.size == (size, size)
+    assert (tmp_path / 'out' / 'a.png').read_bytes() == (tmp_path / 'out' / 'b.png').read_bytes()
+
+
+def test_create_icons_runs_inkscape_once(inkscape, tmp_path, monkeypatch):
+    os.makedirs(tmp_path / 'assets' / 'icons')
+    shutil.copy(os.path.join(ROOT, 'assets', 'icons', 'app_icon.svg'), tmp_path / 'assets' / 'icons')
+    monkeypatch.chdir(tmp_path)
+    spec = importlib.util.spec_from_file_location(
+        'create_icons', os.path.join(ROOT, 'assets', 'icons', 'create_icons.py'))
+    create_icons = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(create_icons)
+
+    create_icons.main()
+
+    assert len(invocations(inkscape)) == 1
+    planned = plan(load_targets('platforms'))
+    sizes = [target.size for output in planned for target in output.targets]
+    assert len(sizes) > len(set(sizes))
+    for output in planned:
+        for target in output.targets:
+            assert os.path.exists(target.path), target.path
+    for path in adaptive_outputs('android/app/src/main/res'):
+        assert os.path.exists(path), path
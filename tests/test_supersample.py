@@ -0,0 +1,38 @@
+"""
+Tests for supersampled rendering of the designs' pixel floors
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from smartcent_icons.designs import windows_scene
+from smartcent_icons.supersample import render_supersampled
+
+# The basic palette's darkest red channel outside the white strokes
+DARK_RED = 59
+
+
+def white_ink(image):
+    """Approximate area, in pixels, of the white outline, cent and dots"""
+    red = np.asarray(image.convert('RGB'))[..., 0].astype(np.float64)
+    return np.clip(red - DARK_RED, 0, None).sum() / (255 - DARK_RED)
+
+
+@pytest.mark.parametrize('factor', [2, 4])
+def test_windows_floors_survive_supersampling(factor):
+    scene = windows_scene()
+    native = white_ink(render_supersampled(scene, 16, 1))
+    supersampled = white_ink(render_supersampled(scene, 16, factor))
+    assert supersampled >= 0.8 * native
+
+
+def test_windows_dots_survive_supersampling():
+    image = render_supersampled(windows_scene(), 32, 4)
+    # The dot at 0 degrees sits 35% of the size right of the center
+    red, _, _, _ = image.getpixel((16 + int(32 * 0.35), 16))
+    assert red > 150